@@ -0,0 +1,11 @@
+"""
+通用基础组件
+"""
+from .sqlite_cache import SqliteCache
+from .aio import run_coroutine, shared_async_client
+
+__all__ = [
+    "SqliteCache",
+    "run_coroutine",
+    "shared_async_client",
+]
@@ -0,0 +1,44 @@
+"""
+异步 I/O 公共设施
+
+    - 后台事件循环：同步代码（包括运行在 uvicorn 事件循环线程中的同步调用）统一经 run_coroutine 执行协程，
+      异步实现只需写一份，同步版本直接包装
+    - 按事件循环共享的 httpx.AsyncClient：httpx 连接池不可跨事件循环使用，每个循环各自复用 HTTP 连接
+"""
+import asyncio
+import threading
+import weakref
+from typing import Any, Coroutine, Optional
+
+import httpx
+
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=_loop.run_forever, name="aio-background-loop", daemon=True)
+            thread.start()
+        return _loop
+
+
+def shared_async_client() -> httpx.AsyncClient:
+    """当前事件循环的共享客户端，复用 HTTP 连接"""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = httpx.AsyncClient()
+        _clients[loop] = client
+    return client
+
+
+def run_coroutine(coro: Coroutine[Any, Any, Any]) -> Any:
+    """在后台事件循环中执行协程并阻塞等待结果"""
+    future = asyncio.run_coroutine_threadsafe(coro, _background_loop())
+    return future.result()
@@ -0,0 +1,71 @@
+"""
+向量化距离计算
+
+把高德 "lng,lat" 字符串一次性解析为 float 数组，用 NumPy 一次计算全部 POI × 参考点
+（或参考点两两之间）的 Haversine 距离矩阵，替代逐对解析字符串、逐对调用 math 的循环。
+无效坐标解析为 NaN，相关距离同样为 NaN。
+"""
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+EARTH_RADIUS = 6371000  # 地球半径（米）
+
+
+def parse_lnglat(lnglat: Optional[str]) -> Optional[Tuple[float, float]]:
+    """解析高德 "lng,lat" 字符串，格式错误时返回 None"""
+    if not lnglat:
+        return None
+    try:
+        lng, lat = map(float, lnglat.split(","))
+    except (AttributeError, ValueError):
+        return None
+    return lng, lat
+
+
+def parse_lnglats(lnglats: Iterable[Optional[str]]) -> np.ndarray:
+    """
+    解析 "lng,lat" 字符串列表
+
+    返回:
+        形状为 (n, 2) 的 float 数组，列依次为经度、纬度；无效坐标为 NaN
+    """
+    coords: List[List[float]] = []
+    for lnglat in lnglats:
+        try:
+            lng, lat = map(float, lnglat.split(","))
+        except (AttributeError, ValueError):
+            lng, lat = np.nan, np.nan
+        coords.append([lng, lat])
+    return np.array(coords, dtype=float).reshape(-1, 2)
+
+
+def haversine_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    a 中每个坐标到 b 中每个坐标的 Haversine 距离（单位：米）
+
+    参数:
+        a: (n, 2) 经纬度数组
+        b: (m, 2) 经纬度数组
+
+    返回:
+        (n, m) 距离矩阵
+    """
+    lng1, lat1 = np.radians(a[:, 0])[:, None], np.radians(a[:, 1])[:, None]
+    lng2, lat2 = np.radians(b[:, 0])[None, :], np.radians(b[:, 1])[None, :]
+    h = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return EARTH_RADIUS * 2 * np.arctan2(np.sqrt(h), np.sqrt(1 - h))
+
+
+def distance_matrix(sources: Iterable[Optional[str]], targets: Iterable[Optional[str]]) -> np.ndarray:
+    """两组 "lng,lat" 字符串之间的距离矩阵（单位：米）"""
+    return haversine_matrix(parse_lnglats(sources), parse_lnglats(targets))
+
+
+def max_pairwise_distance(lnglats: Iterable[Optional[str]]) -> float:
+    """一组坐标两两之间的最大距离（单位：米），有效坐标不足两个时为 0"""
+    coords = parse_lnglats(lnglats)
+    coords = coords[~np.isnan(coords).any(axis=1)]
+    if len(coords) < 2:
+        return 0.0
+    return float(haversine_matrix(coords, coords).max())
@@ -0,0 +1,67 @@
+"""
+Geohash 编解码
+
+用于把经纬度吸附到固定网格，使相邻的搜索中心共享同一个缓存条目。
+精度参考：5 位 ≈ 4.9km × 4.9km，6 位 ≈ 1.2km × 0.6km，7 位 ≈ 153m × 153m。
+"""
+from typing import Tuple
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_DECODE_MAP = {c: i for i, c in enumerate(_BASE32)}
+
+
+def encode(lat: float, lng: float, precision: int = 7) -> str:
+    """把纬度、经度编码为指定长度的 geohash"""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bit = 0
+    ch = 0
+    even = True  # geohash 从经度位开始交替编码
+    while len(chars) < precision:
+        rng, value = (lng_range, lng) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        if value >= mid:
+            ch = (ch << 1) | 1
+            rng[0] = mid
+        else:
+            ch = ch << 1
+            rng[1] = mid
+        even = not even
+        bit += 1
+        if bit == 5:
+            chars.append(_BASE32[ch])
+            bit = 0
+            ch = 0
+    return "".join(chars)
+
+
+def decode(geohash: str) -> Tuple[float, float]:
+    """把 geohash 解码为网格中心点 (lat, lng)"""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    even = True
+    for c in geohash:
+        bits = _DECODE_MAP[c]
+        for shift in range(4, -1, -1):
+            rng = lng_range if even else lat_range
+            mid = (rng[0] + rng[1]) / 2
+            if (bits >> shift) & 1:
+                rng[0] = mid
+            else:
+                rng[1] = mid
+            even = not even
+    return (lat_range[0] + lat_range[1]) / 2, (lng_range[0] + lng_range[1]) / 2
+
+
+def snap_lnglat(lnglat: str, precision: int = 7) -> Tuple[str, str]:
+    """
+    把高德 "lng,lat" 字符串吸附到 geohash 网格
+
+    返回:
+        (geohash, 网格中心点的 "lng,lat" 字符串)
+    """
+    lng, lat = map(float, lnglat.split(","))
+    cell = encode(lat, lng, precision)
+    center_lat, center_lng = decode(cell)
+    return cell, f"{center_lng:.6f},{center_lat:.6f}"
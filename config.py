@@ -17,9 +17,63 @@ print(ALIYUN_API_KEY)
 print(ALIYUN_BASE_URL)
 print(ALIYUN_MODEL)
 
+# LLM 客户端连接池：最大连接数、最大保活连接数、保活时间（秒）、请求超时（秒）
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "10"))
+LLM_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "60"))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))
+# 按节点覆盖模型，格式 "planner=qwen-max,parse_query=qwen-turbo"，未配置的节点使用 ALIYUN_MODEL
+LLM_NODE_MODELS = dict(
+    item.split("=", 1) for item in os.getenv("LLM_NODE_MODELS", "").replace(" ", "").split(",") if "=" in item
+)
+
 
 # Gaode API 配置
 GAODE_API_KEY = os.getenv("GAODE_API_KEY", "")
+# 高德 key 池：GAODE_API_KEYS 为逗号分隔的多个 key，未配置时仅使用 GAODE_API_KEY
+GAODE_API_KEYS = [k.strip() for k in os.getenv("GAODE_API_KEYS", "").split(",") if k.strip()] or (
+    [GAODE_API_KEY] if GAODE_API_KEY else []
+)
+# 单个 key 在单个接口上的日配额（0 表示不限制），以及 key 选择策略（least_loaded / round_robin）
+GAODE_KEY_DAILY_QUOTA = int(os.getenv("GAODE_KEY_DAILY_QUOTA", "5000"))
+GAODE_KEY_STRATEGY = os.getenv("GAODE_KEY_STRATEGY", "least_loaded")
+# 高德 Web 服务每秒请求数上限（个人开发者默认 3 QPS）
+GAODE_QPS = float(os.getenv("GAODE_QPS", "3"))
+# 单个高德接口的进程级总 QPS 上限（0 表示不限制，仅按 key 限流）
+GAODE_ENDPOINT_QPS = float(os.getenv("GAODE_ENDPOINT_QPS", "0"))
+
+# 本地缓存配置
+CACHE_DIR = os.getenv("CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache"))
+# 高德 POI 分页缓存：有效期（秒）、条目上限、搜索中心吸附的 geohash 精度（7 位 ≈ 150m 网格）
+POI_CACHE_ENABLED = os.getenv("POI_CACHE_ENABLED", "true").lower() == "true"
+POI_CACHE_TTL = int(os.getenv("POI_CACHE_TTL", str(6 * 3600)))
+POI_CACHE_MAX_ENTRIES = int(os.getenv("POI_CACHE_MAX_ENTRIES", "20000"))
+POI_CACHE_GEOHASH_PRECISION = int(os.getenv("POI_CACHE_GEOHASH_PRECISION", "7"))
+# 地理编码缓存：内存 LRU 条目上限、成功结果有效期、失败结果（负缓存）有效期、持久化条目上限
+GEOCODE_CACHE_ENABLED = os.getenv("GEOCODE_CACHE_ENABLED", "true").lower() == "true"
+GEOCODE_LRU_SIZE = int(os.getenv("GEOCODE_LRU_SIZE", "1024"))
+GEOCODE_CACHE_TTL = int(os.getenv("GEOCODE_CACHE_TTL", str(30 * 86400)))
+GEOCODE_NEGATIVE_TTL = int(os.getenv("GEOCODE_NEGATIVE_TTL", "300"))
+GEOCODE_CACHE_MAX_ENTRIES = int(os.getenv("GEOCODE_CACHE_MAX_ENTRIES", "50000"))
+# LLM 输出缓存：各节点 temperature=0，相同输入的输出可复用；内存 LRU 条目上限、有效期、持久化条目上限
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_LRU_SIZE = int(os.getenv("LLM_CACHE_LRU_SIZE", "1024"))
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", str(86400)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "20000"))
+# 离线地标库：是否从成功的地理编码结果中自动学习地名，以及学习数量上限
+GAZETTEER_LEARN_ENABLED = os.getenv("GAZETTEER_LEARN_ENABLED", "true").lower() == "true"
+GAZETTEER_MAX_LEARNED = int(os.getenv("GAZETTEER_MAX_LEARNED", "5000"))
+
+# 编排器：同一批次中可并行执行的计划步骤数上限
+PLAN_MAX_PARALLEL_STEPS = int(os.getenv("PLAN_MAX_PARALLEL_STEPS", "4"))
+# 条件筛选：规则提取的置信度不低于该阈值时直接使用，跳过 LLM 调用
+FILTER_RULE_CONFIDENCE_THRESHOLD = float(os.getenv("FILTER_RULE_CONFIDENCE_THRESHOLD", "0.8"))
+# 意图分类：启发式规则的使用方式
+#   on：规则有把握时直接采用，跳过 LLM；shadow：始终调用 LLM，只统计规则与 LLM 的一致率；off：不使用规则
+INTENT_HEURISTIC_MODE = os.getenv("INTENT_HEURISTIC_MODE", "on").lower()
+
+# 编排器：常规查询由本地计划编译器直接生成计划，跳过 planner LLM 调用
+PLAN_COMPILER_ENABLED = os.getenv("PLAN_COMPILER_ENABLED", "true").lower() == "true"
 
 # 默认位置配置
 DEFAULT_CITY = os.getenv("DEFAULT_CITY", "北京")
@@ -30,5 +84,5 @@ def _validate_api_keys():
     """验证 API Key 是否已配置"""
     if not ALIYUN_API_KEY or ALIYUN_API_KEY == "your-api-key-here":
         print("⚠️  警告: ALIYUN_API_KEY 未配置或使用默认值")
-    if not GAODE_API_KEY or GAODE_API_KEY == "your-gaode-api-key-here":
+    if not GAODE_API_KEYS or GAODE_API_KEYS == ["your-gaode-api-key-here"]:
         print("⚠️  警告: GAODE_API_KEY 未配置或使用默认值")
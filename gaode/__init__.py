@@ -0,0 +1,27 @@
+"""
+高德 Web 服务公共组件
+"""
+from .rate_limiter import TokenBucket, RateLimiter, gaode_rate_limiter
+from .key_pool import GaodeKeyPool, NoAvailableKeyError, gaode_key_pool
+from .poi_cache import PoiCache, gaode_poi_cache
+from .geocode_cache import GeocodeCache, gaode_geocode_cache
+from .gazetteer import Gazetteer, landmark_gazetteer
+from .city_index import CityInfo, CityIndex, city_index
+
+__all__ = [
+    "TokenBucket",
+    "RateLimiter",
+    "gaode_rate_limiter",
+    "GaodeKeyPool",
+    "NoAvailableKeyError",
+    "gaode_key_pool",
+    "PoiCache",
+    "gaode_poi_cache",
+    "GeocodeCache",
+    "gaode_geocode_cache",
+    "Gazetteer",
+    "landmark_gazetteer",
+    "CityInfo",
+    "CityIndex",
+    "city_index",
+]
@@ -0,0 +1,86 @@
+"""
+全国城市中心点索引
+
+收录全部地级及以上行政区（含直辖市、自治州、地区、盟及省直辖县级市）的 adcode 与中心点坐标（GCJ-02），
+支持按全称、简称、别名或 adcode 做 O(1) 查询。parse_query 在无法地理编码或用户只给出城市名时，
+直接使用这里的中心点，不再回退到北京坐标，也无需额外调用高德接口。
+
+数据文件 cities.tsv 每行格式：
+    adcode<TAB>全称<TAB>简称<TAB>lng,lat<TAB>别名（"|" 分隔）
+"""
+import os
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+
+class CityInfo(NamedTuple):
+    adcode: str
+    name: str
+    short_name: str
+    lnglat: str
+
+
+def _normalize(text: Optional[str]) -> str:
+    return "".join((text or "").lower().split())
+
+
+class CityIndex:
+    """城市名 / 别名 / adcode -> CityInfo 的哈希索引"""
+
+    def __init__(self):
+        self._by_key: Dict[str, CityInfo] = {}
+        self._cities: List[CityInfo] = []
+
+    def add(self, city: CityInfo, aliases: Optional[List[str]] = None) -> None:
+        self._cities.append(city)
+        for key in (city.adcode, city.name, city.short_name, *(aliases or [])):
+            key = _normalize(key)
+            # 别名冲突时保留先登记的城市
+            if key and key not in self._by_key:
+                self._by_key[key] = city
+
+    def get(self, city: Optional[str]) -> Optional[CityInfo]:
+        """按全称、简称、别名或 adcode 查询城市，未收录返回 None"""
+        key = _normalize(city)
+        if not key:
+            return None
+        info = self._by_key.get(key)
+        if info is None and len(key) > 2 and key.endswith("市"):
+            info = self._by_key.get(key[:-1])
+        return info
+
+    def lnglat(self, city: Optional[str]) -> Optional[str]:
+        info = self.get(city)
+        return info.lnglat if info else None
+
+    def __len__(self) -> int:
+        return len(self._cities)
+
+
+def _load_city_index() -> CityIndex:
+    """加载随代码发布的城市中心点表"""
+    start = time.perf_counter()
+    index = CityIndex()
+    cities_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cities.tsv")
+    try:
+        with open(cities_file, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.rstrip("\n")
+                if not line or line.startswith("#"):
+                    continue
+                fields = line.split("\t")
+                if len(fields) < 4:
+                    continue
+                adcode, name, short_name, lnglat = fields[:4]
+                aliases = [a for a in fields[4].split("|") if a] if len(fields) > 4 else []
+                index.add(CityInfo(adcode, name, short_name, lnglat), aliases)
+    except OSError as e:
+        print(f"警告：加载城市中心点表失败 {e}，将使用默认坐标")
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"✓ 成功加载城市中心点表，共 {len(index)} 个城市（{elapsed_ms:.1f} ms）")
+    return index
+
+
+# 进程级共享城市索引
+city_index = _load_city_index()
@@ -0,0 +1,184 @@
+"""
+离线地标库（gazetteer）
+
+把"城市 + 地标名/别名"映射到高德经纬度（GCJ-02），parse_query 在调用高德地理编码之前先查询本库，
+常见地标（天安门、望京、国贸、中关村……）无需任何网络请求即可解析。
+
+索引结构：以 "城市\\t地名" 为键的有序数组 + 二分查找，相比 dict 嵌套的字典树更省内存，
+同时支持前缀范围查询。数据来源：
+    - landmarks.json：随代码发布的预置地标，格式为 {城市: [[地名, "lng,lat", [别名, ...]], ...]}
+    - CACHE_DIR/gazetteer_learned.jsonl：地理编码成功后自动学习的地名，逐行追加
+"""
+import bisect
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from config import CACHE_DIR, GAZETTEER_LEARN_ENABLED, GAZETTEER_MAX_LEARNED
+from gaode.normalize import normalize_city
+
+
+# 查询时可忽略的泛化后缀，如 "望京附近" 视同 "望京"
+_GENERIC_SUFFIXES = ("附近", "周边", "周围", "旁边", "一带", "那边", "这边", "商圈", "地区")
+# 可学习的高德地理编码匹配级别：只有精确到兴趣点/道路的结果才代表该地名本身；
+# 省、市、区县等行政区级别多为模糊地名（如 "当前位置"）回退到的行政区中心，学习后会污染后续查询
+LEARNABLE_LEVELS = frozenset({
+    "兴趣点", "门牌号", "单元号", "道路", "道路交叉路口", "公交站台、地铁站", "热点商圈", "开发区",
+})
+
+
+def _normalize_name(text: Optional[str]) -> str:
+    return "".join((text or "").lower().split())
+
+
+class Gazetteer:
+    """
+    地标索引
+
+    参数:
+        learned_path: 自动学习地名的持久化文件，None 表示不持久化
+        max_learned: 自动学习地名的数量上限
+    """
+
+    def __init__(self, learned_path: Optional[str] = None, max_learned: int = 5000):
+        self._keys: List[str] = []
+        self._values: List[str] = []
+        self.learned_path = learned_path
+        self.max_learned = max_learned
+        self.learned = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(city: str, name: str) -> str:
+        return f"{city}\t{name}"
+
+    def _strip_city(self, name: str, city: str) -> str:
+        if city and name.startswith(city):
+            name = name[len(city):]
+            if name.startswith("市"):
+                name = name[1:]
+        return name
+
+    def _insert(self, city: Optional[str], name: Optional[str], lnglat: str) -> bool:
+        city = normalize_city(city)
+        name = self._strip_city(_normalize_name(name), city)
+        if not city or not name:
+            return False
+        key = self._key(city, name)
+        i = bisect.bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            self._values[i] = lnglat
+            return False
+        self._keys.insert(i, key)
+        self._values.insert(i, lnglat)
+        return True
+
+    def _find(self, key: str) -> Optional[str]:
+        i = bisect.bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            return self._values[i]
+        return None
+
+    def lookup(self, text: Optional[str], city: Optional[str]) -> Optional[str]:
+        """按城市查询地名（忽略城市前缀、空白与泛化后缀），未收录返回 None"""
+        city = normalize_city(city)
+        name = self._strip_city(_normalize_name(text), city)
+        if not city or not name:
+            return None
+        candidates = [name] + [name[:-len(s)] for s in _GENERIC_SUFFIXES if name.endswith(s) and len(name) > len(s)]
+        with self._lock:
+            for candidate in candidates:
+                lnglat = self._find(self._key(city, candidate))
+                if lnglat:
+                    self.hits += 1
+                    return lnglat
+            self.misses += 1
+        return None
+
+    def names_with_prefix(self, prefix: str, city: Optional[str], limit: int = 10) -> List[str]:
+        """返回某城市中以 prefix 开头的地名（有序数组上的前缀范围查询）"""
+        city = normalize_city(city)
+        start = self._key(city, _normalize_name(prefix))
+        with self._lock:
+            i = bisect.bisect_left(self._keys, start)
+            names = []
+            while i < len(self._keys) and self._keys[i].startswith(start) and len(names) < limit:
+                names.append(self._keys[i].split("\t", 1)[1])
+                i += 1
+        return names
+
+    def learn(self, text: Optional[str], city: Optional[str], lnglat: Optional[str],
+              level: Optional[str] = None) -> None:
+        """
+        记录一次成功的地理编码结果，并追加写入持久化文件
+
+        参数:
+            level: 高德地理编码返回的匹配级别，不在 LEARNABLE_LEVELS 中（含未知）时不学习
+        """
+        if not lnglat or level not in LEARNABLE_LEVELS:
+            return
+        with self._lock:
+            if self.learned >= self.max_learned or not self._insert(city, text, lnglat):
+                return
+            self.learned += 1
+            if self.learned_path:
+                try:
+                    os.makedirs(os.path.dirname(os.path.abspath(self.learned_path)), exist_ok=True)
+                    with open(self.learned_path, "a", encoding="utf-8") as f:
+                        f.write(json.dumps([normalize_city(city), text, lnglat], ensure_ascii=False) + "\n")
+                except OSError as e:
+                    print(f"警告：写入地标学习文件失败 {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._keys),
+                "learned": self.learned,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+def _load_gazetteer() -> Gazetteer:
+    """加载预置地标与自动学习的地名"""
+    start = time.perf_counter()
+    learned_path = os.path.join(CACHE_DIR, "gazetteer_learned.jsonl") if GAZETTEER_LEARN_ENABLED else None
+    gazetteer = Gazetteer(learned_path, GAZETTEER_MAX_LEARNED)
+
+    landmarks_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "landmarks.json")
+    try:
+        with open(landmarks_file, "r", encoding="utf-8") as f:
+            landmarks = json.load(f)
+        for city, entries in landmarks.items():
+            for name, lnglat, aliases in entries:
+                for alias in [name, *aliases]:
+                    gazetteer._insert(city, alias, lnglat)
+    except (OSError, ValueError) as e:
+        print(f"警告：加载地标库失败 {e}，将使用空地标库")
+
+    if learned_path and os.path.exists(learned_path):
+        try:
+            with open(learned_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        city, text, lnglat = json.loads(line)
+                    except ValueError:
+                        continue
+                    if gazetteer._insert(city, text, lnglat):
+                        gazetteer.learned += 1
+        except OSError as e:
+            print(f"警告：读取地标学习文件失败 {e}")
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"✓ 成功加载地标库，共 {len(gazetteer._keys)} 个地名（{elapsed_ms:.1f} ms）")
+    return gazetteer
+
+
+# 进程级共享地标库
+landmark_gazetteer = _load_gazetteer()
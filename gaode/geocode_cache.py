@@ -0,0 +1,144 @@
+"""
+高德地理编码结果缓存
+
+两级缓存：
+    - 进程内 LRU：热门地标直接命中内存
+    - SQLite 持久化：进程重启后依然有效
+
+缓存键为归一化后的 (location_text, city)。地理编码失败（无结果或高德业务错误）会以较短的
+TTL 做负缓存，避免同一个无法解析的地点在每次请求中都被重试。
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from common.sqlite_cache import SqliteCache
+from config import (
+    CACHE_DIR,
+    GEOCODE_CACHE_ENABLED,
+    GEOCODE_CACHE_TTL,
+    GEOCODE_NEGATIVE_TTL,
+    GEOCODE_CACHE_MAX_ENTRIES,
+    GEOCODE_LRU_SIZE,
+)
+from gaode.normalize import normalize_city, normalize_text
+
+
+class GeocodeCache:
+    """
+    地理编码两级缓存
+
+    参数:
+        store: SQLite 持久化存储，None 表示仅使用内存 LRU
+        lru_size: 内存 LRU 条目上限，0 表示禁用缓存
+        ttl: 成功结果的有效期（秒）
+        negative_ttl: 失败结果的有效期（秒）
+    """
+
+    def __init__(self, store: Optional[SqliteCache], lru_size: int = 1024,
+                 ttl: float = 30 * 86400, negative_ttl: float = 300):
+        self.store = store
+        self.lru_size = lru_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._lru: "OrderedDict[str, Tuple[float, Optional[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.store_hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(location_text: str, city: Optional[str]) -> str:
+        return f"{normalize_text(location_text)}@{normalize_city(city)}"
+
+    def _remember(self, key: str, expires_at: float, lnglat: Optional[str]) -> None:
+        with self._lock:
+            self._lru[key] = (expires_at, lnglat)
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.lru_size:
+                self._lru.popitem(last=False)
+
+    def get(self, location_text: str, city: Optional[str]) -> Tuple[bool, Optional[str]]:
+        """
+        查询缓存
+
+        返回:
+            (是否命中, 经纬度)。命中负缓存时返回 (True, None)
+        """
+        if self.lru_size <= 0:
+            return False, None
+        key = self.make_key(location_text, city)
+        now = time.time()
+
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is not None:
+                expires_at, lnglat = entry
+                if expires_at > now:
+                    self._lru.move_to_end(key)
+                    self.memory_hits += 1
+                    if lnglat is None:
+                        self.negative_hits += 1
+                    return True, lnglat
+                del self._lru[key]
+
+        if self.store is not None:
+            record = self.store.get(key)
+            if record is not None:
+                lnglat = record.get("lnglat")
+                self._remember(key, record.get("expires_at", now + self.negative_ttl), lnglat)
+                with self._lock:
+                    self.store_hits += 1
+                    if lnglat is None:
+                        self.negative_hits += 1
+                return True, lnglat
+
+        with self._lock:
+            self.misses += 1
+        return False, None
+
+    def set(self, location_text: str, city: Optional[str], lnglat: Optional[str]) -> None:
+        """写入缓存，lnglat 为 None 表示负缓存"""
+        if self.lru_size <= 0:
+            return
+        key = self.make_key(location_text, city)
+        ttl = self.ttl if lnglat else self.negative_ttl
+        expires_at = time.time() + ttl
+        self._remember(key, expires_at, lnglat)
+        if self.store is not None:
+            self.store.set(key, {"lnglat": lnglat, "expires_at": expires_at}, ttl=ttl)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.memory_hits + self.store_hits + self.misses
+            result = {
+                "enabled": self.lru_size > 0,
+                "lru_entries": len(self._lru),
+                "lru_size": self.lru_size,
+                "memory_hits": self.memory_hits,
+                "store_hits": self.store_hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.memory_hits + self.store_hits) / lookups, 4) if lookups else 0.0,
+            }
+        if self.store is not None:
+            result["store"] = self.store.stats()
+        return result
+
+
+# 进程级共享地理编码缓存
+gaode_geocode_cache = GeocodeCache(
+    SqliteCache(
+        os.path.join(CACHE_DIR, "gaode_cache.sqlite3"),
+        table="geocode",
+        max_entries=GEOCODE_CACHE_MAX_ENTRIES,
+        default_ttl=GEOCODE_CACHE_TTL,
+    ) if GEOCODE_CACHE_ENABLED else None,
+    lru_size=GEOCODE_LRU_SIZE if GEOCODE_CACHE_ENABLED else 0,
+    ttl=GEOCODE_CACHE_TTL,
+    negative_ttl=GEOCODE_NEGATIVE_TTL,
+)
@@ -0,0 +1,162 @@
+"""
+高德 API 多 key 池
+
+多个 key 分摊请求，突破单 key 的 QPS 与日配额上限：
+    - 选择策略：least_loaded（在途请求最少、当日用量最少优先）或 round_robin
+    - 按 (key, 接口) 统计当日用量，达到日配额后该 key 在该接口上暂停使用
+    - 高德返回配额耗尽 / key 无效的 infocode 时自动剔除该 key，直到配额重置（北京时间零点）
+"""
+import itertools
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+from config import GAODE_API_KEYS, GAODE_KEY_DAILY_QUOTA, GAODE_KEY_STRATEGY
+
+
+# 高德配额按北京时间自然日重置
+_QUOTA_TZ = timezone(timedelta(hours=8))
+
+# 需要剔除 key 直到配额重置的 infocode / info
+_EJECT_INFOCODES = {
+    "10001": "INVALID_USER_KEY",
+    "10003": "DAILY_QUERY_OVER_LIMIT",
+    "10044": "USER_DAILY_QUERY_OVER_LIMIT",
+    "10045": "USER_ABROAD_DAILY_QUERY_OVER_LIMIT",
+}
+
+
+class NoAvailableKeyError(ValueError):
+    """没有可用的高德 key（未配置或全部配额耗尽）"""
+
+
+class _KeyState:
+    def __init__(self, key: str):
+        self.key = key
+        self.in_flight = 0
+        self.usage: Dict[str, int] = {}  # 接口 -> 当日用量
+        self.ejected: Dict[str, str] = {}  # 接口 -> 剔除原因
+
+
+class GaodeKeyPool:
+    """
+    高德 key 池
+
+    参数:
+        keys: key 列表
+        daily_quota: 单个 key 在单个接口上的日配额，0 表示不限制
+        strategy: "least_loaded" 或 "round_robin"
+    """
+
+    def __init__(self, keys: List[str], daily_quota: int = 0, strategy: str = "least_loaded"):
+        self._states = [_KeyState(k) for k in dict.fromkeys(keys) if k]
+        self.daily_quota = daily_quota
+        self.strategy = strategy
+        self._rr = itertools.count()
+        self._day = self._quota_day()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _quota_day() -> str:
+        return datetime.now(_QUOTA_TZ).strftime("%Y-%m-%d")
+
+    def _rollover(self) -> None:
+        """跨过北京时间零点时重置当日用量与剔除状态"""
+        day = self._quota_day()
+        if day != self._day:
+            self._day = day
+            for state in self._states:
+                state.usage.clear()
+                state.ejected.clear()
+
+    def has_keys(self) -> bool:
+        return bool(self._states)
+
+    def _available(self, endpoint: str) -> List[_KeyState]:
+        return [
+            s for s in self._states
+            if endpoint not in s.ejected
+            and (self.daily_quota <= 0 or s.usage.get(endpoint, 0) < self.daily_quota)
+        ]
+
+    def acquire(self, endpoint: str) -> str:
+        """为一次接口调用选取 key，并计入在途请求与当日用量"""
+        with self._lock:
+            self._rollover()
+            candidates = self._available(endpoint)
+            if not candidates:
+                raise NoAvailableKeyError(f"高德API key 均不可用（未配置或 {endpoint} 配额已耗尽）")
+            if self.strategy == "round_robin":
+                state = candidates[next(self._rr) % len(candidates)]
+            else:
+                state = min(candidates, key=lambda s: (s.in_flight, s.usage.get(endpoint, 0)))
+            state.in_flight += 1
+            state.usage[endpoint] = state.usage.get(endpoint, 0) + 1
+            return state.key
+
+    def release(self, key: str) -> None:
+        with self._lock:
+            for state in self._states:
+                if state.key == key:
+                    state.in_flight -= 1
+                    return
+
+    @contextmanager
+    def lease(self, endpoint: str) -> Iterator[str]:
+        """with gaode_key_pool.lease(endpoint) as key: ..."""
+        key = self.acquire(endpoint)
+        try:
+            yield key
+        finally:
+            self.release(key)
+
+    def refund(self, key: str, endpoint: str) -> None:
+        """撤销一次当日用量：租用 key 后请求最终没有发出（页面已不需要或被取消）时调用"""
+        with self._lock:
+            for state in self._states:
+                if state.key == key and state.usage.get(endpoint, 0) > 0:
+                    state.usage[endpoint] -= 1
+                    return
+
+    def report_failure(self, key: str, endpoint: str, infocode: Optional[str], info: Optional[str]) -> bool:
+        """
+        上报高德业务错误
+
+        返回:
+            True 表示该错误由 key 本身导致（配额耗尽 / key 无效），已剔除该 key，调用方可换 key 重试
+        """
+        reason = _EJECT_INFOCODES.get(str(infocode)) if infocode else None
+        if reason is None and info in _EJECT_INFOCODES.values():
+            reason = info
+        if reason is None:
+            return False
+        with self._lock:
+            self._rollover()
+            for state in self._states:
+                if state.key == key:
+                    state.ejected[endpoint] = reason
+                    print(f"  ! 高德 key ***{key[-4:]} 在 {endpoint} 上被剔除至配额重置: {reason}")
+                    return True
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._rollover()
+            return {
+                "day": self._day,
+                "strategy": self.strategy,
+                "daily_quota": self.daily_quota,
+                "keys": {
+                    f"***{s.key[-4:]}": {
+                        "in_flight": s.in_flight,
+                        "usage": dict(s.usage),
+                        "ejected": dict(s.ejected),
+                    }
+                    for s in self._states
+                },
+            }
+
+
+# 进程级共享 key 池
+gaode_key_pool = GaodeKeyPool(GAODE_API_KEYS, GAODE_KEY_DAILY_QUOTA, GAODE_KEY_STRATEGY)
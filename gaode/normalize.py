@@ -0,0 +1,20 @@
+"""
+高德请求参数归一化，用于构造缓存键
+"""
+from typing import Optional
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """去除首尾空白、合并连续空白并转小写"""
+    return " ".join((text or "").lower().split())
+
+
+def normalize_types(types: Optional[str]) -> str:
+    """"|" 分隔的类型码去空白后排序"""
+    return "|".join(sorted(t.strip() for t in (types or "").split("|") if t.strip()))
+
+
+def normalize_city(city: Optional[str]) -> str:
+    """去掉城市名末尾的"市"，使"北京市"与"北京"一致"""
+    city = (city or "").strip()
+    return city[:-1] if len(city) > 2 and city.endswith("市") else city
@@ -0,0 +1,96 @@
+"""
+高德 POI 分页结果的持久化地理网格缓存
+
+缓存键由以下字段归一化后组成：
+    keywords、types、city、radius、offset、page，以及搜索中心吸附到 geohash 网格后的编号
+
+搜索中心会被吸附到网格中心后再请求高德，因此同一网格内的不同中心点共享完全一致的缓存条目，
+热门地点（天安门、望京等）的重复搜索可直接从本地 SQLite 返回。
+"""
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+from common.geohash import snap_lnglat
+from common.sqlite_cache import SqliteCache
+from gaode.normalize import normalize_city, normalize_text, normalize_types
+from config import (
+    CACHE_DIR,
+    POI_CACHE_ENABLED,
+    POI_CACHE_TTL,
+    POI_CACHE_MAX_ENTRIES,
+    POI_CACHE_GEOHASH_PRECISION,
+)
+
+
+class PoiCache:
+    """
+    POI 分页缓存
+
+    参数:
+        store: 底层持久化存储，None 表示禁用缓存
+        precision: geohash 精度
+    """
+
+    def __init__(self, store: Optional[SqliteCache], precision: int = 7):
+        self.store = store
+        self.precision = precision
+
+    @property
+    def enabled(self) -> bool:
+        return self.store is not None
+
+    def prepare(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """把请求参数中的搜索中心吸附到 geohash 网格中心，并记录网格编号"""
+        if not self.enabled or not params.get("location"):
+            return params
+        try:
+            cell, snapped = snap_lnglat(params["location"], self.precision)
+        except ValueError:
+            return params
+        prepared = dict(params)
+        prepared["location"] = snapped
+        prepared["_geohash"] = cell
+        return prepared
+
+    @staticmethod
+    def make_key(params: Dict[str, Any], page: int) -> str:
+        parts = {
+            "keywords": normalize_text(params.get("keywords")),
+            "types": normalize_types(params.get("types")),
+            "city": normalize_city(params.get("city")),
+            "radius": str(params.get("radius") or ""),
+            "offset": str(params.get("offset") or ""),
+            "extensions": params.get("extensions") or "",
+            "cell": params.get("_geohash") or params.get("location") or "",
+            "page": page,
+        }
+        raw = json.dumps(parts, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def get(self, params: Dict[str, Any], page: int) -> Optional[List[Dict[str, Any]]]:
+        if not self.enabled:
+            return None
+        return self.store.get(self.make_key(params, page))
+
+    def set(self, params: Dict[str, Any], page: int, pois: List[Dict[str, Any]]) -> None:
+        if self.enabled:
+            self.store.set(self.make_key(params, page), pois)
+
+    def stats(self) -> Dict[str, Any]:
+        if not self.enabled:
+            return {"enabled": False}
+        return {"enabled": True, "geohash_precision": self.precision, **self.store.stats()}
+
+
+# 进程级共享 POI 缓存
+gaode_poi_cache = PoiCache(
+    SqliteCache(
+        os.path.join(CACHE_DIR, "gaode_cache.sqlite3"),
+        table="poi_pages",
+        max_entries=POI_CACHE_MAX_ENTRIES,
+        default_ttl=POI_CACHE_TTL,
+    ) if POI_CACHE_ENABLED else None,
+    precision=POI_CACHE_GEOHASH_PRECISION,
+)
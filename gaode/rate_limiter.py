@@ -0,0 +1,143 @@
+"""
+高德 API 进程级令牌桶限流器
+
+所有高德接口调用（POI 搜索、地理编码、工具脚本）共享同一个限流器：
+    - 每个 (接口, key) 一个令牌桶，速率为该 key 在该接口上的 QPS 配额
+    - 可选的每接口令牌桶，限制整个进程对某接口的总速率
+    - 同时支持同步调用（time.sleep）与 asyncio 调用（asyncio.sleep）
+    - 提供排队深度、累计/最大等待时间等统计信息
+"""
+import asyncio
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from config import GAODE_QPS, GAODE_ENDPOINT_QPS
+
+
+class TokenBucket:
+    """
+    线程安全的令牌桶
+
+    令牌余额允许为负：每次 reserve 立即扣减令牌并返回需要等待的时间，
+    多个调用方按预约顺序依次放行，等待在锁外进行，不阻塞其他调用方预约。
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+        self.waiting = 0  # 当前正在等待令牌的调用方数量（排队深度）
+        self.acquired = 0  # 累计放行次数
+        self.total_wait = 0.0  # 累计等待时间（秒）
+        self.max_wait = 0.0  # 单次最大等待时间（秒）
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """预约令牌，返回需要等待的秒数"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            self.acquired += 1
+            if self._tokens >= 0:
+                return 0.0
+            wait = -self._tokens / self.rate
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            return wait
+
+    def track_waiting(self, delta: int) -> None:
+        with self._lock:
+            self.waiting += delta
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "rate": self.rate,
+                "capacity": self.capacity,
+                "queue_depth": self.waiting,
+                "acquired": self.acquired,
+                "total_wait_seconds": round(self.total_wait, 3),
+                "max_wait_seconds": round(self.max_wait, 3),
+                "avg_wait_seconds": round(self.total_wait / self.acquired, 4) if self.acquired else 0.0,
+            }
+
+
+class RateLimiter:
+    """
+    按接口、按 key 划分令牌桶的限流器
+
+    参数:
+        qps: 单个 key 在单个接口上的 QPS 配额
+        endpoint_qps: 每个接口的进程级总 QPS 上限，0 表示不限制
+        burst: 令牌桶容量（允许的瞬时突发请求数），缺省为对应的 QPS
+    """
+
+    def __init__(self, qps: float, endpoint_qps: float = 0.0, burst: Optional[float] = None):
+        self.qps = qps
+        self.endpoint_qps = endpoint_qps
+        self.burst = burst
+        self._buckets: Dict[Tuple[str, Optional[str]], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, endpoint: str, key: Optional[str], rate: float) -> Optional[TokenBucket]:
+        if rate <= 0:
+            return None
+        with self._lock:
+            bucket = self._buckets.get((endpoint, key))
+            if bucket is None:
+                bucket = TokenBucket(rate, self.burst)
+                self._buckets[(endpoint, key)] = bucket
+            return bucket
+
+    def _reserve(self, endpoint: str, key: Optional[str]) -> Tuple[float, list]:
+        buckets = [self._bucket(endpoint, None, self.endpoint_qps)]
+        if key is not None:
+            buckets.append(self._bucket(endpoint, key, self.qps))
+        buckets = [b for b in buckets if b is not None]
+        wait = max((b.reserve() for b in buckets), default=0.0)
+        return wait, buckets
+
+    def acquire(self, endpoint: str, key: Optional[str] = None) -> float:
+        """同步获取令牌，必要时阻塞当前线程，返回实际等待的秒数"""
+        wait, buckets = self._reserve(endpoint, key)
+        if wait > 0:
+            for b in buckets:
+                b.track_waiting(1)
+            try:
+                time.sleep(wait)
+            finally:
+                for b in buckets:
+                    b.track_waiting(-1)
+        return wait
+
+    async def acquire_async(self, endpoint: str, key: Optional[str] = None) -> float:
+        """异步获取令牌，等待期间让出事件循环，返回实际等待的秒数"""
+        wait, buckets = self._reserve(endpoint, key)
+        if wait > 0:
+            for b in buckets:
+                b.track_waiting(1)
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                for b in buckets:
+                    b.track_waiting(-1)
+        return wait
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """各令牌桶的统计信息，key 只保留末 4 位"""
+        with self._lock:
+            items = list(self._buckets.items())
+        result = {}
+        for (endpoint, key), bucket in items:
+            name = endpoint if key is None else f"{endpoint}@***{key[-4:]}"
+            result[name] = bucket.stats()
+        return result
+
+
+# 进程级共享限流器
+gaode_rate_limiter = RateLimiter(GAODE_QPS, GAODE_ENDPOINT_QPS)
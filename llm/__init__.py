@@ -0,0 +1,13 @@
+"""
+LLM 公共组件
+"""
+from .registry import LLMClientRegistry, llm_registry, get_llm
+from .output_cache import LLMOutputCache, llm_output_cache
+
+__all__ = [
+    "LLMClientRegistry",
+    "llm_registry",
+    "get_llm",
+    "LLMOutputCache",
+    "llm_output_cache",
+]
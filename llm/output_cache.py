@@ -0,0 +1,163 @@
+"""
+LLM 输出缓存
+
+各节点以 temperature=0 调用 LLM，相同输入的输出是确定的，可直接缓存：
+    - 缓存键：节点名 + 模型 + 提示词版本（system 提示词的哈希）+ 归一化后的 user 输入
+    - 两级存储：进程内 LRU + SQLite 持久化（TTL 过期、条目数上限按 LRU 淘汰）
+    - 只缓存解析成功的输出，格式错误的响应不会被反复复用
+    - 按节点统计命中率
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from common.sqlite_cache import SqliteCache
+from config import (
+    CACHE_DIR,
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_LRU_SIZE,
+    LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_TTL,
+)
+from gaode.normalize import normalize_text
+
+
+def prompt_version(messages: List[dict]) -> str:
+    """system 提示词的哈希，提示词修改后旧缓存自动失效"""
+    system = "\n".join(m.get("content", "") for m in messages if m.get("role") == "system")
+    return hashlib.sha1(system.encode("utf-8")).hexdigest()[:12]
+
+
+class LLMOutputCache:
+    """
+    LLM 输出两级缓存
+
+    参数:
+        store: SQLite 持久化存储，None 表示仅使用内存 LRU
+        lru_size: 内存 LRU 条目上限，0 表示禁用缓存
+        ttl: 缓存有效期（秒）
+    """
+
+    def __init__(self, store: Optional[SqliteCache], lru_size: int = 1024, ttl: float = 86400):
+        self.store = store
+        self.lru_size = lru_size
+        self.ttl = ttl
+        self._lru: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._node_stats: Dict[str, Dict[str, int]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.lru_size > 0
+
+    @staticmethod
+    def make_key(node: str, model: str, messages: List[dict]) -> str:
+        parts = {
+            "node": node,
+            "model": model,
+            "prompt_version": prompt_version(messages),
+            "inputs": [normalize_text(m.get("content")) for m in messages if m.get("role") != "system"],
+        }
+        raw = json.dumps(parts, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _record(self, node: str, field: str) -> None:
+        with self._lock:
+            stats = self._node_stats.setdefault(node, {"hits": 0, "misses": 0})
+            stats[field] += 1
+
+    def _remember(self, key: str, expires_at: float, text: str) -> None:
+        with self._lock:
+            self._lru[key] = (expires_at, text)
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.lru_size:
+                self._lru.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is not None:
+                expires_at, text = entry
+                if expires_at > now:
+                    self._lru.move_to_end(key)
+                    return text
+                del self._lru[key]
+
+        if self.store is not None:
+            record = self.store.get(key)
+            if record is not None:
+                self._remember(key, record.get("expires_at", now + self.ttl), record["text"])
+                return record["text"]
+        return None
+
+    def set(self, key: str, text: str) -> None:
+        expires_at = time.time() + self.ttl
+        self._remember(key, expires_at, text)
+        if self.store is not None:
+            self.store.set(key, {"text": text, "expires_at": expires_at}, ttl=self.ttl)
+
+    async def ainvoke(self, node: str, llm: Any, messages: List[dict],
+                      parse: Callable[[str], Any] = json.loads) -> Any:
+        """
+        带缓存的 LLM 调用
+
+        参数:
+            node: 节点名称，用于缓存键与命中率统计
+            llm: ChatOpenAI 实例
+            messages: 消息列表
+            parse: 输出解析函数；解析失败时抛出异常且不写入缓存
+
+        返回:
+            parse(输出文本)
+        """
+        if not self.enabled:
+            response = await llm.ainvoke(messages)
+            return parse(response.content.strip())
+
+        key = self.make_key(node, str(getattr(llm, "model_name", "")), messages)
+        text = self.get(key)
+        if text is not None:
+            self._record(node, "hits")
+            print(f"  < [{node}] 命中 LLM 输出缓存")
+            return parse(text)
+
+        self._record(node, "misses")
+        response = await llm.ainvoke(messages)
+        text = response.content.strip()
+        result = parse(text)
+        self.set(key, text)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            nodes = {
+                node: {**counts, "hit_rate": round(counts["hits"] / (counts["hits"] + counts["misses"]), 4)}
+                for node, counts in self._node_stats.items()
+            }
+            result = {
+                "enabled": self.enabled,
+                "lru_entries": len(self._lru),
+                "lru_size": self.lru_size,
+                "nodes": nodes,
+            }
+        if self.store is not None:
+            result["store"] = self.store.stats()
+        return result
+
+
+# 进程级共享 LLM 输出缓存
+llm_output_cache = LLMOutputCache(
+    SqliteCache(
+        os.path.join(CACHE_DIR, "llm_cache.sqlite3"),
+        table="llm_outputs",
+        max_entries=LLM_CACHE_MAX_ENTRIES,
+        default_ttl=LLM_CACHE_TTL,
+    ) if LLM_CACHE_ENABLED else None,
+    lru_size=LLM_CACHE_LRU_SIZE if LLM_CACHE_ENABLED else 0,
+    ttl=LLM_CACHE_TTL,
+)
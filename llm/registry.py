@@ -0,0 +1,186 @@
+"""
+进程级 LLM 客户端注册表
+
+各节点不再每次调用都新建 ChatOpenAI，而是通过 get_llm(node) 取得按节点缓存的实例：
+    - 所有节点共享同一个 httpx 连接池（keep-alive），复用 TCP 连接与 TLS 会话
+    - 连接池上限、保活时间、超时可通过配置调整
+    - 支持按节点覆盖模型（LLM_NODE_MODELS）
+    - 通过 httpcore trace 统计新建连接 / TLS 握手次数，得出连接复用率
+"""
+import asyncio
+import threading
+import weakref
+from typing import Any, Dict, Optional
+
+import httpx
+from langchain_openai import ChatOpenAI
+
+from config import (
+    ALIYUN_API_KEY,
+    ALIYUN_BASE_URL,
+    ALIYUN_MODEL,
+    LLM_KEEPALIVE_EXPIRY,
+    LLM_MAX_CONNECTIONS,
+    LLM_MAX_KEEPALIVE_CONNECTIONS,
+    LLM_NODE_MODELS,
+    LLM_TIMEOUT,
+)
+
+
+class LLMClientRegistry:
+    """
+    LLM 客户端注册表
+
+    参数:
+        api_key / base_url: OpenAI 兼容接口配置
+        default_model: 未单独配置的节点使用的模型
+        node_models: 节点名 -> 模型名
+        limits: httpx 连接池上限
+        timeout: 请求超时（秒）
+    """
+
+    def __init__(self, api_key: str, base_url: str, default_model: str,
+                 node_models: Optional[Dict[str, str]] = None,
+                 limits: Optional[httpx.Limits] = None, timeout: float = 60.0):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.default_model = default_model
+        self.node_models = dict(node_models or {})
+        self.limits = limits or httpx.Limits()
+        self.timeout = timeout
+
+        self._lock = threading.Lock()
+        self._http_client: Optional[httpx.Client] = None
+        self._clients: Dict[str, ChatOpenAI] = {}
+        # AsyncClient 绑定事件循环，按循环分别缓存
+        self._async_http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._loop_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, ChatOpenAI]]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+        self.node_calls: Dict[str, int] = {}
+        self.clients_created = 0
+        self.requests = 0
+        self.connections_opened = 0
+        self.tls_handshakes = 0
+
+    def model_for(self, node: str) -> str:
+        return self.node_models.get(node) or self.default_model
+
+    # ---- 连接统计 ----
+
+    def _on_trace_event(self, event_name: str) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            with self._lock:
+                self.connections_opened += 1
+        elif event_name == "connection.start_tls.complete":
+            with self._lock:
+                self.tls_handshakes += 1
+
+    def _trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        self._on_trace_event(event_name)
+
+    async def _atrace(self, event_name: str, info: Dict[str, Any]) -> None:
+        self._on_trace_event(event_name)
+
+    def _on_request(self, request: httpx.Request) -> None:
+        request.extensions["trace"] = self._trace
+        with self._lock:
+            self.requests += 1
+
+    async def _aon_request(self, request: httpx.Request) -> None:
+        request.extensions["trace"] = self._atrace
+        with self._lock:
+            self.requests += 1
+
+    # ---- 共享 HTTP 客户端 ----
+
+    def http_client(self) -> httpx.Client:
+        if self._http_client is None:
+            self._http_client = httpx.Client(
+                limits=self.limits,
+                timeout=self.timeout,
+                event_hooks={"request": [self._on_request]},
+            )
+        return self._http_client
+
+    def _async_http_client(self, loop: asyncio.AbstractEventLoop) -> httpx.AsyncClient:
+        client = self._async_http_clients.get(loop)
+        if client is None:
+            client = httpx.AsyncClient(
+                limits=self.limits,
+                timeout=self.timeout,
+                event_hooks={"request": [self._aon_request]},
+            )
+            self._async_http_clients[loop] = client
+        return client
+
+    # ---- ChatOpenAI 实例 ----
+
+    def get(self, node: str) -> ChatOpenAI:
+        """取得节点对应的 ChatOpenAI，同一节点（同一事件循环内）始终复用同一实例"""
+        try:
+            loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        with self._lock:
+            self.node_calls[node] = self.node_calls.get(node, 0) + 1
+            clients = self._clients if loop is None else self._loop_clients.setdefault(loop, {})
+            llm = clients.get(node)
+            if llm is None:
+                llm = ChatOpenAI(
+                    api_key=self.api_key,
+                    base_url=self.base_url,
+                    model=self.model_for(node),
+                    temperature=0,
+                    timeout=self.timeout,
+                    http_client=self.http_client(),
+                    http_async_client=self._async_http_client(loop) if loop is not None else None,
+                )
+                clients[node] = llm
+                self.clients_created += 1
+        return llm
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            reused = max(self.requests - self.connections_opened, 0)
+            return {
+                "clients_created": self.clients_created,
+                "node_calls": dict(self.node_calls),
+                "models": {node: self.model_for(node) for node in self.node_calls},
+                "limits": {
+                    "max_connections": self.limits.max_connections,
+                    "max_keepalive_connections": self.limits.max_keepalive_connections,
+                    "keepalive_expiry": self.limits.keepalive_expiry,
+                },
+                "http": {
+                    "requests": self.requests,
+                    "connections_opened": self.connections_opened,
+                    "tls_handshakes": self.tls_handshakes,
+                    "reused_connections": reused,
+                    "reuse_rate": round(reused / self.requests, 4) if self.requests else 0.0,
+                },
+            }
+
+
+# 进程级共享注册表
+llm_registry = LLMClientRegistry(
+    ALIYUN_API_KEY,
+    ALIYUN_BASE_URL,
+    ALIYUN_MODEL,
+    node_models=LLM_NODE_MODELS,
+    limits=httpx.Limits(
+        max_connections=LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=LLM_KEEPALIVE_EXPIRY,
+    ),
+    timeout=LLM_TIMEOUT,
+)
+
+
+def get_llm(node: str) -> ChatOpenAI:
+    """取得节点共享的 LLM 客户端"""
+    return llm_registry.get(node)
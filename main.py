@@ -13,6 +13,15 @@ from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 
 from plann_and_execute.agent import graph
+from gaode.gazetteer import landmark_gazetteer
+from gaode.geocode_cache import gaode_geocode_cache
+from gaode.key_pool import gaode_key_pool
+from gaode.poi_cache import gaode_poi_cache
+from gaode.rate_limiter import gaode_rate_limiter
+from llm import llm_output_cache, llm_registry
+from plann_and_execute.plan_compiler import plan_compiler_stats
+from plann_and_execute.scheduler import plan_scheduler_stats
+from sub_agents.intent_classifier.heuristics import intent_heuristic_stats
 
 # 初始化 FastAPI 应用
 app = FastAPI(
@@ -48,6 +57,7 @@ class RecommendRequest(BaseModel):
 # 响应模型
 class Restaurant(BaseModel):
     """餐厅信息"""
+    id: Optional[str] = None  # 高德 POI id
     name: Optional[str] = None
     address: Optional[str] = None
     location: Optional[str] = None
@@ -148,8 +158,8 @@ async def recommend_restaurants(request: RecommendRequest):
         
         # 调用 Agent
         logger.info("开始执行 Agent...")
-        # 注意: 这里的 graph.invoke 依赖您的 plann_and_execute 模块，假设它是可用的
-        final_state = graph.invoke(initial_state)
+        # 异步执行：等待 LLM / 高德接口时让出事件循环，单个 worker 可同时处理多个请求
+        final_state = await graph.ainvoke(initial_state)
         
         # 解析结果
         final_result_str = final_state.get("final_result", "{}")
@@ -210,6 +220,37 @@ async def get_info():
     }
 
 
+@app.get("/api/metrics")
+async def get_metrics():
+    """
+    获取运行时指标
+
+    返回:
+        - gaode_rate_limiter: 各高德接口/key 令牌桶的排队深度与等待时间
+        - gaode_key_pool: 各高德 key 的在途请求、当日用量与剔除状态
+        - gaode_poi_cache: POI 缓存条目数与命中率
+        - gaode_geocode_cache: 地理编码缓存（含负缓存）命中率
+        - landmark_gazetteer: 离线地标库条目数与命中率
+        - llm_clients: 各节点 LLM 调用次数、模型与 HTTP 连接复用率
+        - llm_output_cache: 各节点 LLM 输出缓存命中率
+        - plan_scheduler: 计划 DAG 调度的平均关键路径长度与并行加速比
+        - plan_compiler: 本地计划编译（跳过 planner LLM）的快速路径命中率
+        - intent_heuristics: 启发式意图判定的命中率与 shadow 模式下与 LLM 的一致率
+    """
+    return {
+        "gaode_rate_limiter": gaode_rate_limiter.stats(),
+        "gaode_key_pool": gaode_key_pool.stats(),
+        "gaode_poi_cache": gaode_poi_cache.stats(),
+        "gaode_geocode_cache": gaode_geocode_cache.stats(),
+        "landmark_gazetteer": landmark_gazetteer.stats(),
+        "llm_clients": llm_registry.stats(),
+        "llm_output_cache": llm_output_cache.stats(),
+        "plan_scheduler": plan_scheduler_stats.stats(),
+        "plan_compiler": plan_compiler_stats.stats(),
+        "intent_heuristics": intent_heuristic_stats.stats(),
+    }
+
+
 # 挂载静态文件目录
 if FRONTEND_DIR.exists():
     app.mount("/assets", StaticFiles(directory=FRONTEND_DIR / "assets"), name="static-assets")
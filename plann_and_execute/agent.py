@@ -1,6 +1,14 @@
 from plann_and_execute.state import OrchestratorState
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, START, END
-from plann_and_execute.node import planner_node, executor_node, subgraph_node, formatter_node
+from plann_and_execute.node import (
+    planner_node,
+    aplanner_node,
+    executor_node,
+    subgraph_node,
+    asubgraph_node,
+    formatter_node,
+)
 
 def route_after_subgraph_execution(state: OrchestratorState) -> str:
     """
@@ -50,9 +58,8 @@ def route_after_subgraph_execution(state: OrchestratorState) -> str:
             print(f"不可恢复的错误类型: {error_info.get('error_type')}")
             return "error"
         
-        # 其他错误进行重规划
+        # 其他错误进行重规划（重规划次数由 planner 节点累加）
         print(f"触发重规划")
-        state["replan_count"] = replan_count + 1
         return "replan"
     
     # 检查是否所有步骤都已完成
@@ -66,8 +73,9 @@ def route_after_subgraph_execution(state: OrchestratorState) -> str:
     
 workflow = StateGraph(OrchestratorState)
 
-workflow.add_node("planner", planner_node)
-workflow.add_node("subgraph", subgraph_node)
+# graph.invoke 走同步实现，graph.ainvoke 走异步实现（不阻塞调用方的事件循环）
+workflow.add_node("planner", RunnableLambda(planner_node, afunc=aplanner_node))
+workflow.add_node("subgraph", RunnableLambda(subgraph_node, afunc=asubgraph_node))
 workflow.add_node("executor", executor_node)
 workflow.add_node("formatter", formatter_node)
 
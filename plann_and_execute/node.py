@@ -1,8 +1,14 @@
+import asyncio
+import hashlib
+import inspect
 import json
 import re
-from typing import Optional, List, Callable, Dict, Any
-from langchain_openai import ChatOpenAI
-from config import ALIYUN_API_KEY, ALIYUN_BASE_URL, ALIYUN_MODEL
+from typing import Optional, List, Callable, Dict, Any, Set
+from common.aio import run_coroutine
+from config import PLAN_COMPILER_ENABLED, PLAN_MAX_PARALLEL_STEPS
+from llm import get_llm, llm_output_cache
+from plann_and_execute.plan_compiler import compile_plan, plan_compiler_stats
+from plann_and_execute.scheduler import PlanDAG, arun_plan, plan_scheduler_stats, run_plan
 from plann_and_execute.state import OrchestratorState, Plan, PlanStep
 from prompt.planner import (
     PLANNER_SYSTEM_PROMPT,
@@ -14,9 +20,10 @@ from sub_agents.parse_query.parse_query import parse_query_agent
 from sub_agents.food_search.food_search import food_search_agent
 from sub_agents.filter_criteria import filter_criteria_agent, apply_filters, apply_balance_filter
 from sub_agents.intent_classifier import intent_classifier_agent
+from sub_agents.understand_query import understand_query_agent
 
 
-def planner_node(state: OrchestratorState) -> OrchestratorState:
+async def aplanner_node(state: OrchestratorState) -> OrchestratorState:
     '''
     计划节点：根据用户查询生成执行计划
     
@@ -27,24 +34,42 @@ def planner_node(state: OrchestratorState) -> OrchestratorState:
             - error_info: 前一次执行的错误信息（重规划时使用）
             - past_plans: 之前失败的计划列表
     
+    常规查询（非重规划）先由本地计划编译器生成规范计划，不调用 LLM；编译器无法处理时再调用 LLM。
+    重规划时保留新旧计划中未受失败影响的前缀步骤结果，只重新执行失败步骤及其下游。
+    
     输出:
         state: OrchestratorState
             - plan: Plan 对象，包含 List[PlanStep]
             - current_step: 初始化为1
-            - step_results: 初始化为空字典
+            - step_results: 初始规划时为空字典，重规划时为仍然有效的前缀步骤结果
             - past_plans: 更新后的计划历史（重规划时）
+            - plan_source: 计划来源（compiler / llm）
     '''
     
-    # 初始化LLM
-    llm = ChatOpenAI(
-        api_key=ALIYUN_API_KEY,
-        base_url=ALIYUN_BASE_URL,
-        model=ALIYUN_MODEL,
-        temperature=0
-    )
-    
-    # 判断是否是重规划
+    # 判断是否是重规划：上一轮执行留下 error_info 时由路由转回 planner，在此累加重规划次数
+    # （条件边的路由函数对 state 的修改不会被保存）
+    if state.get("error_info") is not None and state.get("plan") is not None:
+        state["replan_count"] = state.get("replan_count", 0) + 1
     is_replan = state.get("replan_count", 0) > 0
+    previous_plan: Optional[Plan] = state.get("plan")
+    previous_results: Dict[int, Any] = state.get("step_results") or {}
+
+    if PLAN_COMPILER_ENABLED and not is_replan:
+        shape, compiled_plan = compile_plan(state.get("query", ""))
+        plan_compiler_stats.record(shape)
+        if compiled_plan is not None:
+            state["plan"] = compiled_plan
+            state["plan_source"] = "compiler"
+            state["current_step"] = 0
+            state["step_results"] = {}
+            print(f"--- 规划完成（本地编译: {shape}） ---")
+            print(f"计划步骤数: {len(compiled_plan.steps)}")
+            for step in compiled_plan.steps:
+                print(f"  Step {step.step_id}: {step.subgraph_name} - {step.description}")
+            return state
+
+    # 初始化LLM
+    llm = get_llm("planner")
     
     available_subgraphs_text = _format_subgraph_catalog()
 
@@ -76,11 +101,8 @@ def planner_node(state: OrchestratorState) -> OrchestratorState:
         {"role": "user", "content": user_prompt}
     ]
     
-    response = llm.invoke(messages)
-    response_text = response.content.strip()
-    
-    # 解析JSON响应
-    plan_dict = _parse_plan_response(response_text)
+    # 解析JSON响应（相同的规划请求命中输出缓存）
+    plan_dict = await llm_output_cache.ainvoke("planner", llm, messages, parse=_parse_plan_response)
     
     # 构建规范的 PlanStep 列表
     plan_steps: List[PlanStep] = [
@@ -98,11 +120,17 @@ def planner_node(state: OrchestratorState) -> OrchestratorState:
     
     # 更新state
     state["plan"] = plan
+    state["plan_source"] = "llm"
     state["current_step"] = 0
     state["step_results"] = {}
     
-    # 如果是重规划，记录新的计划
+    # 如果是重规划，记录新的计划，并保留未受失败影响的步骤结果
     if is_replan:
+        state["step_results"] = _carry_over_step_results(
+            previous_plan, plan, previous_results, state.get("error_info")
+        )
+        if state["step_results"]:
+            print(f"重规划保留已完成步骤: {sorted(state['step_results'].keys())}")
         past_plans_list = state.get("past_plans", [])
         past_plans_list.append(json.dumps(plan_dict, ensure_ascii=False))
         state["past_plans"] = past_plans_list
@@ -115,6 +143,54 @@ def planner_node(state: OrchestratorState) -> OrchestratorState:
     return state
 
 
+def planner_node(state: OrchestratorState) -> OrchestratorState:
+    """aplanner_node 的同步版本，在后台事件循环中执行"""
+    return run_coroutine(aplanner_node(state))
+
+
+def _carry_over_step_results(
+    old_plan: Optional[Plan],
+    new_plan: Plan,
+    step_results: Dict[int, Any],
+    error_info: Optional[Dict[str, Any]],
+) -> Dict[int, Any]:
+    """
+    重规划时仍然有效的前缀步骤结果
+
+    新计划中与旧计划相同（序号、子图、input_mapping 均一致）、已成功执行、且依赖的步骤同样被保留的步骤，
+    其结果可直接沿用；失败步骤、在 error_messages 中记录了错误的步骤（如地理编码网络错误）及其下游不保留，
+    在新计划中重新执行。
+    """
+    if old_plan is None or not step_results:
+        return {}
+    old_steps = {step.step_id: step for step in old_plan.steps}
+    failed_step = (error_info or {}).get("step")
+    dag = PlanDAG(new_plan, _SUBGRAPH_OUTPUTS)
+
+    kept: Dict[int, Any] = {}
+    for level in dag.levels():
+        for step_id in level:
+            step, old_step = dag.steps[step_id], old_steps.get(step_id)
+            if (step_id != failed_step and step_id in step_results and _is_clean_result(step_results[step_id])
+                    and old_step is not None
+                    and old_step.subgraph_name == step.subgraph_name
+                    and old_step.input_mapping == step.input_mapping
+                    and dag.dependencies[step_id] <= kept.keys()):
+                kept[step_id] = step_results[step_id]
+    return kept
+
+
+def _is_clean_result(step_result: Any) -> bool:
+    """步骤结果是否没有记录错误；子图会把网络超时等暂时性错误写入 error_messages 而不抛出，这类结果不可复用"""
+    return not (isinstance(step_result, dict) and step_result.get("error_messages"))
+
+
+def _step_memo_key(subgraph_name: str, step_input: dict) -> str:
+    """步骤记忆化的键：子图名称 + 步骤输入"""
+    raw = json.dumps({"subgraph": subgraph_name, "input": step_input}, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
 def _parse_plan_response(response_text: str) -> dict:
     """
     解析LLM的JSON响应
@@ -137,65 +213,116 @@ def _parse_plan_response(response_text: str) -> dict:
 
 def executor_node(state: OrchestratorState) -> OrchestratorState:
     '''
-    执行器节点：递增当前步骤计数
+    执行器节点：根据 input_mapping 构建步骤依赖图，确定待执行的步骤
     
     职责:
-        1. 递增 current_step 指向下一步
+        1. 由 PlanStep.input_mapping 构建依赖图，输出分层结构与关键路径长度
+        2. 将所有尚未执行的步骤交给 subgraph_node，由 DAG 调度器按依赖并发执行
+        3. 所有步骤完成后将 current_step 置为总步数 + 1，标记计划完成
     
     输入:
         state: OrchestratorState
-            - current_step: 当前步骤序号
+            - plan: 完整的计划
+            - step_results: 已完成步骤的执行结果
     
     输出:
         state: OrchestratorState
-            - current_step: 递增后的步骤序号
+            - current_batch: 待执行的步骤序号
+            - current_step: 第一个待执行的步骤序号（计划完成时为总步数 + 1）
     '''
     
-    current_step_index: int = state["current_step"]
     plan: Plan = state.get("plan")
+    step_results: dict = state.get("step_results", {}) or {}
+    steps = plan.steps if plan else []
+
+    print(f"\n--- 执行器调度步骤 ---")
+    print(f"已完成步骤: {sorted(step_results.keys())}")
+    print(f"计划总步数: {len(steps)}")
+
+    pending = [step.step_id for step in steps if step.step_id not in step_results]
+    if not pending:
+        state["current_batch"] = []
+        state["current_step"] = len(steps) + 1
+        print(f"所有步骤已执行（标记完成）")
+        return state
 
-    print(f"\n--- 执行器递增步骤 ---")
-    print(f"当前步骤: {current_step_index}")
-    print(f"计划总步数: {len(plan.steps) if plan else 0}")
+    dag = PlanDAG(plan, _SUBGRAPH_OUTPUTS)
+    critical_path = dag.critical_path()
+    print(f"依赖分层: {dag.levels()}")
+    print(f"关键路径: {critical_path}（长度 {len(critical_path)}）")
 
-    # 如果当前步骤小于总步数，则递增到下一步
-    if plan and current_step_index < len(plan.steps):
-        state["current_step"] = current_step_index + 1
-        print(f"下一步骤: {state['current_step']}")
-    else:
-        print(f"已是最后一步，不再递增（标记完成）")
+    state["current_batch"] = pending
+    state["current_step"] = pending[0]
 
     return state
 
 
 def subgraph_node(state: OrchestratorState) -> OrchestratorState:
     '''
-    子图执行节点：根据current_step从plan中获取步骤并执行
+    子图执行节点：由 DAG 调度器按依赖关系并发执行 current_batch 中的步骤
     
     职责:
-        1. 读取 current_step
+        1. 读取 current_batch（缺省时退化为 current_step 单步）
         2. 从 plan 中获取对应的 PlanStep
-        3. 根据 input_mapping 准备输入参数
-        4. 调用对应的子图执行
-        5. 将执行结果存储到 step_results
+        3. 依赖均已完成的步骤立即启动，根据 input_mapping 准备输入参数
+        4. 在线程池中调用对应的子图执行，一个步骤完成后马上调度其就绪的后继步骤
+           （asubgraph_node 以协程并发执行，不占用线程）
+        5. 将执行结果存储到 step_results，调度报告（含关键路径）存储到 schedule_report
     
     输入:
         state: OrchestratorState
             - plan: 完整的计划（Plan对象）
-            - current_step: 当前步骤序号
+            - current_batch / current_step: 待执行的步骤序号
             - step_results: 之前步骤的执行结果
             - query: 用户原始查询
     
     输出:
         state: OrchestratorState
-            - step_results: 添加当前步骤的执行结果
-            - error_info: 执行过程中的错误信息（如果有）
+            - step_results: 添加已执行步骤的结果
+            - schedule_report: 关键路径、耗时、并行度等调度信息
+            - current_step: 全部完成时为总步数 + 1，失败时为失败步骤序号
+            - error_info: 执行过程中的错误信息（如果有，取序号最小的失败步骤）
     '''
     
+    batch = _select_batch(state)
+    if batch is None:
+        return state
+
+    prepare_input, execute = _step_callbacks(state, _execute_subgraph)
+    report = run_plan(
+        PlanDAG(state["plan"], _SUBGRAPH_OUTPUTS),
+        [step.step_id for step in batch],
+        state["step_results"],
+        prepare_input,
+        execute,
+        max_workers=PLAN_MAX_PARALLEL_STEPS,
+    )
+    return _apply_schedule_report(state, report)
+
+
+async def asubgraph_node(state: OrchestratorState) -> OrchestratorState:
+    """subgraph_node 的异步版本：各步骤在当前事件循环中以协程并发执行"""
+    batch = _select_batch(state)
+    if batch is None:
+        return state
+
+    prepare_input, execute = _step_callbacks(state, _aexecute_subgraph)
+    report = await arun_plan(
+        PlanDAG(state["plan"], _SUBGRAPH_OUTPUTS),
+        [step.step_id for step in batch],
+        state["step_results"],
+        prepare_input,
+        execute,
+        max_concurrency=PLAN_MAX_PARALLEL_STEPS,
+    )
+    return _apply_schedule_report(state, report)
+
+
+def _select_batch(state: OrchestratorState) -> Optional[List[PlanStep]]:
+    """读取待执行的步骤；current_step 超出计划范围时写入 error_info 并返回 None"""
     plan: Plan = state["plan"]
     current_step_index: int = state["current_step"]
-    step_results: dict = state.get("step_results", {})
-    original_query: str = state.get("query", "")
+    state["step_results"] = state.get("step_results", {}) or {}
     
     # 检查当前步骤是否超出计划范围
     if current_step_index > len(plan.steps):
@@ -206,47 +333,90 @@ def subgraph_node(state: OrchestratorState) -> OrchestratorState:
             "message": f"步骤 {current_step_index} 超出计划范围",
             "step": current_step_index
         }
-        return state
+        return None
     
-    # 从plan中获取当前步骤（current_step是1-indexed）
-    current_plan_step: PlanStep = plan.steps[current_step_index - 1]
+    # 从plan中获取待执行的步骤（step_id 是 1-indexed）
+    batch_ids = state.get("current_batch") or [current_step_index]
+    steps_by_id = {step.step_id: step for step in plan.steps}
+    batch: List[PlanStep] = [steps_by_id[step_id] for step_id in batch_ids if step_id in steps_by_id]
     
     print(f"\n--- 子图执行 ---")
-    print(f"当前步骤: {current_step_index}/{len(plan.steps)}")
-    print(f"子图名称: {current_plan_step.subgraph_name}")
-    print(f"步骤描述: {current_plan_step.description}")
-    
-    # 准备该步骤的输入参数
-    step_input: dict = _prepare_step_input(
-        current_plan_step,
-        step_results,
-        original_query
-    )
-    
-    print(f"步骤输入: {step_input}")
-    
-    # 调用子图执行
-    try:
-        step_result: dict = _execute_subgraph(
-            current_plan_step.subgraph_name,
-            step_input
-        )
-        
-        print(f"步骤结果: {step_result}")
-        
-        # 将结果存储到step_results
-        step_results[current_plan_step.step_id] = step_result
-        state["step_results"] = step_results
-        state["error_info"] = None
-            
-    except Exception as e:
-        print(f"错误: 子图执行失败: {e}")
+    print(f"待执行步骤: {batch_ids}（共 {len(plan.steps)} 步）")
+    return batch
+
+
+def _step_callbacks(state: OrchestratorState, execute_subgraph: Callable):
+    """
+    构造调度器使用的输入准备与步骤执行回调（execute_subgraph 可为同步或异步函数）
+
+    成功的步骤结果按 (子图名称, 步骤输入) 记忆在 step_memo 中，同一请求内重规划后输入相同的步骤直接复用结果，
+    不再重复地理编码或调用 LLM。error_messages 非空的结果不记忆，重规划时重新执行。
+    """
+    original_query: str = state.get("query", "")
+    step_memo: Dict[str, Any] = state.get("step_memo") or {}
+    state["step_memo"] = step_memo
+
+    # 按依赖关系并发执行：某步骤完成后立即调度因此就绪的后继步骤
+    def prepare_input(plan_step: PlanStep, results: Dict[int, Any]) -> dict:
+        step_input = _prepare_step_input(plan_step, results, original_query)
+        print(f"启动步骤 {plan_step.step_id}: {plan_step.subgraph_name} - {plan_step.description}")
+        print(f"步骤输入: {step_input}")
+        return step_input
+
+    def memoized(plan_step: PlanStep, step_input: dict):
+        key = _step_memo_key(plan_step.subgraph_name, step_input)
+        if key in step_memo:
+            print(f"步骤 {plan_step.step_id} 输入未变化，复用之前的执行结果")
+        return key, step_memo.get(key)
+
+    if inspect.iscoroutinefunction(execute_subgraph):
+        async def execute(plan_step: PlanStep, step_input: dict) -> dict:
+            key, step_result = memoized(plan_step, step_input)
+            if step_result is None:
+                step_result = await execute_subgraph(plan_step.subgraph_name, step_input)
+                if _is_clean_result(step_result):
+                    step_memo[key] = step_result
+            print(f"步骤 {plan_step.step_id} 结果: {step_result}")
+            return step_result
+    else:
+        def execute(plan_step: PlanStep, step_input: dict) -> dict:
+            key, step_result = memoized(plan_step, step_input)
+            if step_result is None:
+                step_result = execute_subgraph(plan_step.subgraph_name, step_input)
+                if _is_clean_result(step_result):
+                    step_memo[key] = step_result
+            print(f"步骤 {plan_step.step_id} 结果: {step_result}")
+            return step_result
+
+    return prepare_input, execute
+
+
+def _apply_schedule_report(state: OrchestratorState, report: Dict[str, Any]) -> OrchestratorState:
+    """记录调度统计，并根据调度报告更新 error_info 与 current_step"""
+    plan: Plan = state["plan"]
+    step_results: dict = state["step_results"]
+    plan_scheduler_stats.record(report)
+
+    print(f"调度完成: 关键路径 {report['critical_path']}（长度 {report['critical_path_length']}）, "
+          f"耗时 {report['wall_seconds']:.2f}s, 串行合计 {report['serial_seconds']:.2f}s, "
+          f"最大并行度 {report['max_parallelism']}")
+
+    error = report.pop("error")
+    state["schedule_report"] = report
+    if error is not None:
+        failed_step: PlanStep = next(step for step in plan.steps if step.step_id == report["failed_step"])
+        print(f"错误: 子图执行失败: {error}")
         state["error_info"] = {
             "error_type": "EXECUTION_ERROR",
-            "message": str(e),
-            "step": current_plan_step.step_id,
-            "subgraph_name": current_plan_step.subgraph_name
+            "message": str(error),
+            "step": failed_step.step_id,
+            "subgraph_name": failed_step.subgraph_name
         }
+        state["current_step"] = failed_step.step_id
+    else:
+        state["error_info"] = None
+        if all(step.step_id in step_results for step in plan.steps):
+            state["current_step"] = len(plan.steps) + 1
 
     return state
 
@@ -255,26 +425,38 @@ def _execute_subgraph(subgraph_name: str, step_input: dict) -> dict:
     executor = _SUBGRAPH_EXECUTORS.get(subgraph_name)
     if executor is None:
         raise ValueError(f"未注册的子图: {subgraph_name}")
+    if inspect.iscoroutinefunction(executor):
+        return run_coroutine(executor(step_input))
     return executor(step_input)
 
 
-def _run_scenario_classifier(step_input: dict) -> dict:
+async def _aexecute_subgraph(subgraph_name: str, step_input: dict) -> dict:
+    executor = _SUBGRAPH_EXECUTORS.get(subgraph_name)
+    if executor is None:
+        raise ValueError(f"未注册的子图: {subgraph_name}")
+    if inspect.iscoroutinefunction(executor):
+        return await executor(step_input)
+    # 同步执行器放到线程中运行，避免阻塞事件循环
+    return await asyncio.to_thread(executor, step_input)
+
+
+async def _run_scenario_classifier(step_input: dict) -> dict:
     scenario_state = {
         "query": step_input.get("query", ""),
         "scenario": None,
-        "restaurant_type": None,
+        "types": None,
         "confidence": None,
         "error_messages": [],
     }
-    result = scenario_classifier_agent.invoke(scenario_state)
+    result = await scenario_classifier_agent.ainvoke(scenario_state)
     return {
         "scenario": result.get("scenario"),
-        "types": result.get("restaurant_type"),
+        "types": result.get("types"),
         "error_messages": result.get("error_messages", []),
     }
 
 
-def _run_parse_query(step_input: dict) -> dict:
+async def _run_parse_query(step_input: dict) -> dict:
     parse_state = {
         "query": step_input.get("query", ""),
         "city": None,
@@ -287,7 +469,7 @@ def _run_parse_query(step_input: dict) -> dict:
         "location_count": 0,
         "error_messages": [],
     }
-    result = parse_query_agent.invoke(parse_state)
+    result = await parse_query_agent.ainvoke(parse_state)
     return {
         "city": result.get("city"),
         "location": result.get("location"),
@@ -297,7 +479,7 @@ def _run_parse_query(step_input: dict) -> dict:
     }
 
 
-def _run_food_search(step_input: dict) -> dict:
+async def _run_food_search(step_input: dict) -> dict:
     keywords = step_input.get("keywords") or step_input.get("query") or "美食"
     location = step_input.get("location") or step_input.get("city")
     types = step_input.get("types") or "050000"
@@ -326,7 +508,7 @@ def _run_food_search(step_input: dict) -> dict:
         "error_messages": [],
     }
 
-    result = food_search_agent.invoke(food_state)
+    result = await food_search_agent.ainvoke(food_state)
     return {
         "search_results": result.get("search_results", []),
         "fallback": result.get("fallback"),
@@ -334,14 +516,14 @@ def _run_food_search(step_input: dict) -> dict:
     }
 
 
-def _run_filter_criteria(step_input: dict) -> dict:
+async def _run_filter_criteria(step_input: dict) -> dict:
     filter_state = {
         "query": step_input.get("query", ""),
         "filters": None,
         "confidence": None,
         "error_messages": [],
     }
-    result = filter_criteria_agent.invoke(filter_state)
+    result = await filter_criteria_agent.ainvoke(filter_state)
     return {
         "filters": result.get("filters"),
         "confidence": result.get("confidence"),
@@ -349,7 +531,7 @@ def _run_filter_criteria(step_input: dict) -> dict:
     }
 
 
-def _run_intent_classifier(step_input: dict) -> dict:
+async def _run_intent_classifier(step_input: dict) -> dict:
     intent_state = {
         "query": step_input.get("query", ""),
         "location_count": step_input.get("location_count", 1),
@@ -358,7 +540,48 @@ def _run_intent_classifier(step_input: dict) -> dict:
         "confidence": None,
         "error_messages": [],
     }
-    result = intent_classifier_agent.invoke(intent_state)
+    result = _fallback_unsupported_search_mode(await intent_classifier_agent.ainvoke(intent_state))
+    return {
+        "intent": result.get("intent"),
+        "search_mode": result.get("search_mode", "single"),
+        "confidence": result.get("confidence"),
+        "error_messages": result.get("error_messages", []),
+    }
+
+
+async def _run_understand_query(step_input: dict) -> dict:
+    understand_state = {
+        "query": step_input.get("query", ""),
+        "city": None,
+        "location": None,
+        "locations": [],
+        "location_count": 0,
+        "intent": None,
+        "search_mode": None,
+        "scenario": None,
+        "types": None,
+        "filters": None,
+        "confidence": None,
+        "error_messages": [],
+    }
+    result = _fallback_unsupported_search_mode(await understand_query_agent.ainvoke(understand_state))
+    return {
+        "city": result.get("city"),
+        "location": result.get("location"),
+        "locations": result.get("locations", []),
+        "location_count": result.get("location_count", 1),
+        "intent": result.get("intent"),
+        "search_mode": result.get("search_mode", "single"),
+        "scenario": result.get("scenario"),
+        "types": result.get("types"),
+        "filters": result.get("filters"),
+        "confidence": result.get("confidence"),
+        "error_messages": result.get("error_messages", []),
+    }
+
+
+def _fallback_unsupported_search_mode(result: dict) -> dict:
+    """along_route / union 尚未实现，回退为 single"""
     search_mode = result.get("search_mode", "single")
     if search_mode in ("along_route", "union"):
         print(f"  ! 警告: search_mode '{search_mode}' 尚未实现，回退为 single")
@@ -366,20 +589,17 @@ def _run_intent_classifier(step_input: dict) -> dict:
         result["error_messages"].append(
             f"'{search_mode}' 模式尚未实现，已回退为 single"
         )
-    return {
-        "intent": result.get("intent"),
-        "search_mode": result.get("search_mode", "single"),
-        "confidence": result.get("confidence"),
-        "error_messages": result.get("error_messages", []),
-    }
+    return result
 
 
-_SUBGRAPH_EXECUTORS: Dict[str, Callable[[Dict[str, Any]], dict]] = {
+# 子图执行器为协程函数；同步函数（如测试替身）同样受支持
+_SUBGRAPH_EXECUTORS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
     "scenario_classifier": _run_scenario_classifier,
     "parse_query": _run_parse_query,
     "food_search": _run_food_search,
     "filter_criteria": _run_filter_criteria,
     "intent_classifier": _run_intent_classifier,
+    "understand_query": _run_understand_query,
 }
 
 _SUBGRAPH_CATALOG: Dict[str, str] = {
@@ -388,6 +608,19 @@ _SUBGRAPH_CATALOG: Dict[str, str] = {
     "filter_criteria": "从用户query中提取价格、评分、距离等筛选条件",
     "food_search": "调用高德美食搜索接口，返回清洗后的餐厅列表",
     "intent_classifier": "根据query和地点数量识别搜索意图，输出search_mode（single/intersection/along_route/union）",
+    "understand_query": "一次调用完成查询理解，同时输出 parse_query、intent_classifier、scenario_classifier、filter_criteria 的全部字段",
+}
+
+
+# 各子图的输出字段，用于判断 input_mapping 是否构成真实的数据依赖
+_SUBGRAPH_OUTPUTS: Dict[str, Set[str]] = {
+    "scenario_classifier": {"scenario", "types"},
+    "parse_query": {"city", "location", "locations", "location_count"},
+    "food_search": {"search_results", "fallback"},
+    "filter_criteria": {"filters", "confidence"},
+    "intent_classifier": {"intent", "search_mode", "confidence"},
+    "understand_query": {"city", "location", "locations", "location_count", "intent", "search_mode",
+                         "scenario", "types", "filters", "confidence"},
 }
 
 
@@ -420,17 +653,9 @@ def _prepare_step_input(
     if step.input_mapping is None:
         step_input["query"] = query
         return step_input
-
-    print("调试************")
-    print(step_results)
-    print("调试结束************")
     
     # 根据input_mapping提取输入
     for param_name, source_path in step.input_mapping.items():
-        print("调试************")
-        print(param_name)
-        print(source_path)
-        print("调试结束************")
         # 解析source_path: "step_X.field_name"
         if source_path.startswith("step_"):
             parts = source_path.split(".")
@@ -0,0 +1,161 @@
+"""
+确定性计划编译器
+
+大多数查询的计划都是 prompt/planner.py 中列出的几种固定形态之一。编译器根据 query 的关键词特征
+（是否多地点会面、是否提到菜系/场景/具体食物、是否带筛选条件）直接实例化对应的规范计划，不调用 LLM；
+沿途、对比、过长等非常规查询返回 None，由 planner LLM 规划。
+
+地点数量只有 parse_query 执行后才知道（"我在国贸，朋友在望京" 没有任何会面关键词），因此每个编译计划都包含
+intent_classifier 步骤，search_mode 始终取自它的输出：单地点时由启发式规则直接判定，不调用 LLM。
+"""
+import re
+import threading
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from plann_and_execute.state import Plan, PlanStep
+from sub_agents.scenario_classifier import match_scenario
+
+
+# 超过该长度的 query 往往包含多重需求，交给 LLM 规划
+MAX_COMPILED_QUERY_LENGTH = 50
+
+MEETING_KEYWORDS = ("中间", "折中", "差不多远", "都方便", "等距", "公平", "之间")
+# 沿途、对比等意图尚无专门的计划形态
+UNUSUAL_KEYWORDS = ("路上", "沿途", "顺路", "途经", "经过", "分别", "各自", "对比")
+# 菜系/餐厅类型词由 match_scenario 识别，这里补充没有对应高德类型的场景词
+SCENARIO_KEYWORDS = (
+    "烧烤", "烤肉", "烤串", "撸串", "面馆", "小吃", "自助",
+    "约会", "聚餐", "聚会", "商务", "请客", "宴请", "家庭", "生日", "早餐", "夜宵", "下午茶",
+)
+FILTER_PATTERN = re.compile(
+    r"\d+\s*(元|块|公里|千米|米|km|分|星)|人均|以内|以下|以上|便宜|实惠|性价比|高档|评分|口碑|好评|"
+    r"最近|营业|24小时|通宵|排序|优先",
+    re.IGNORECASE,
+)
+# "想吃麻辣烫" 中的食物词：match_scenario 不认识时交给 scenario_classifier（LLM）识别，避免退化为 "美食"
+FOOD_TERM_PATTERN = re.compile(
+    r"(?:想吃|要吃|吃|来点|来份|来碗)(?:一?[点个些顿碗份])?(?P<term>[\u4e00-\u9fff]{1,6}?)"
+    r"(?=的|吧|呢|啊|呀|了|去|[，,。.!！?？\s]|$)"
+)
+GENERIC_FOOD_TERMS = ("什么", "啥", "饭", "东西", "好", "点", "的", "早饭", "午饭", "晚饭", "正餐")
+
+
+class QueryFeatures(NamedTuple):
+    """编译计划所需的 query 特征"""
+
+    meeting: bool
+    scenario: bool
+    filters: bool
+    unusual: bool
+
+
+def _mentions_food_term(query: str) -> bool:
+    """query 是否提到具体的食物（"想吃麻辣烫"），"吃什么"、"吃饭" 等泛指不算"""
+    return any(not match.group("term").startswith(GENERIC_FOOD_TERMS)
+               for match in FOOD_TERM_PATTERN.finditer(query))
+
+
+def extract_features(query: str) -> QueryFeatures:
+    query = (query or "").strip()
+    return QueryFeatures(
+        meeting=any(kw in query for kw in MEETING_KEYWORDS),
+        scenario=(any(kw in query for kw in SCENARIO_KEYWORDS) or match_scenario(query) is not None
+                  or _mentions_food_term(query)),
+        filters=FILTER_PATTERN.search(query) is not None,
+        unusual=not query or len(query) > MAX_COMPILED_QUERY_LENGTH or any(kw in query for kw in UNUSUAL_KEYWORDS),
+    )
+
+
+def plan_shape(features: QueryFeatures) -> Optional[str]:
+    """规范计划形态名称；非常规查询返回 None"""
+    if features.unusual:
+        return None
+    if features.meeting:
+        return "multi_location"
+    if features.scenario and features.filters:
+        return "scenario_filter"
+    if features.scenario:
+        return "scenario"
+    if features.filters:
+        return "filter"
+    return "direct"
+
+
+def _build_plan(shape: str) -> Plan:
+    steps: List[PlanStep] = [
+        PlanStep(step_id=1, subgraph_name="parse_query", description="解析用户查询中的城市和位置信息",
+                 input_mapping=None),
+    ]
+
+    def add(subgraph_name: str, description: str, input_mapping: Optional[Dict[str, str]]) -> str:
+        step_id = len(steps) + 1
+        steps.append(PlanStep(step_id=step_id, subgraph_name=subgraph_name, description=description,
+                              input_mapping=input_mapping))
+        return f"step_{step_id}"
+
+    # 地点数量在 parse_query 之后才确定，search_mode 一律由 intent_classifier 给出
+    intent = add("intent_classifier", "识别搜索意图",
+                 {"query": "step_1.query", "location_count": "step_1.location_count"})
+
+    keywords, types = "美食", "050000"
+    if shape in ("scenario", "scenario_filter", "multi_location"):
+        scenario = add("scenario_classifier", "识别用餐场景并映射为高德API类型", {"query": "step_1.query"})
+        keywords, types = f"{scenario}.scenario", f"{scenario}.types"
+
+    if shape in ("filter", "scenario_filter", "multi_location"):
+        add("filter_criteria", "提取价格、评分、距离等筛选条件", {"query": "step_1.query"})
+
+    add("food_search", "调用高德美食搜索接口", {
+        "keywords": keywords,
+        "city": "step_1.city",
+        "location": "step_1.location",
+        "types": types,
+        "search_mode": f"{intent}.search_mode",
+        "locations": "step_1.locations",
+    })
+    return Plan(steps=steps)
+
+
+def compile_plan(query: str) -> Tuple[Optional[str], Optional[Plan]]:
+    """
+    根据 query 特征编译规范计划
+
+    返回:
+        (计划形态, 计划)；非常规查询返回 (None, None)
+    """
+    shape = plan_shape(extract_features(query))
+    if shape is None:
+        return None, None
+    return shape, _build_plan(shape)
+
+
+class PlanCompilerStats:
+    """进程级计划编译统计：快速路径命中率与各形态计数"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.compiled = 0
+        self.llm_planned = 0
+        self.shapes: Dict[str, int] = {}
+
+    def record(self, shape: Optional[str]) -> None:
+        with self._lock:
+            if shape is None:
+                self.llm_planned += 1
+            else:
+                self.compiled += 1
+                self.shapes[shape] = self.shapes.get(shape, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.compiled + self.llm_planned
+            return {
+                "compiled": self.compiled,
+                "llm_planned": self.llm_planned,
+                "fast_path_rate": round(self.compiled / total, 4) if total else 0.0,
+                "shapes": dict(self.shapes),
+            }
+
+
+# 进程级共享编译统计
+plan_compiler_stats = PlanCompilerStats()
@@ -0,0 +1,299 @@
+"""
+计划 DAG 调度器
+
+根据 PlanStep.input_mapping 构建步骤依赖图：
+    - 依赖均已完成的步骤立即提交到线程池（run_plan）或作为协程任务启动（arun_plan）；
+      任一步骤完成后马上调度因此就绪的后继步骤，不按批次等待
+    - 整个计划在一次 subgraph 节点执行内跑完，不再每一步都经过一次路由节点
+    - 计算关键路径（最长依赖链），报告其步数与实际耗时，以及计划的并行加速比
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from plann_and_execute.state import Plan, PlanStep
+
+
+def step_dependencies(step: PlanStep, plan: Plan, outputs: Dict[str, Set[str]]) -> Set[int]:
+    """
+    解析步骤依赖的前序步骤序号
+
+    "step_X.field" 只有在 field 是第 X 步子图的输出字段时才构成依赖；
+    例如 "query": "step_1.query" 在执行时会回退为原始 query，并不需要等待第 1 步。
+    outputs 中未登记的子图，其映射一律视为依赖。
+    """
+    subgraph_by_id = {s.step_id: s.subgraph_name for s in plan.steps}
+    dependencies: Set[int] = set()
+    for source_path in (step.input_mapping or {}).values():
+        if not isinstance(source_path, str) or not source_path.startswith("step_"):
+            continue
+        parts = source_path.split(".")
+        if len(parts) != 2:
+            continue
+        try:
+            source_step_id = int(parts[0].replace("step_", ""))
+        except ValueError:
+            continue
+        if source_step_id == step.step_id or source_step_id not in subgraph_by_id:
+            continue
+        source_outputs = outputs.get(subgraph_by_id[source_step_id])
+        if source_outputs is None or parts[1] in source_outputs:
+            dependencies.add(source_step_id)
+    return dependencies
+
+
+class PlanDAG:
+    """
+    计划步骤依赖图
+
+    参数:
+        plan: 计划
+        outputs: 子图名称 -> 输出字段集合
+    """
+
+    def __init__(self, plan: Plan, outputs: Dict[str, Set[str]]):
+        self.steps: Dict[int, PlanStep] = {step.step_id: step for step in plan.steps}
+        self.order: List[int] = [step.step_id for step in plan.steps]
+        self.dependencies: Dict[int, Set[int]] = {
+            step.step_id: step_dependencies(step, plan, outputs) for step in plan.steps
+        }
+
+    def levels(self) -> List[List[int]]:
+        """按依赖深度分层；成环的步骤无法分层，按计划顺序各自单独成层"""
+        placed: Set[int] = set()
+        levels: List[List[int]] = []
+        remaining = list(self.order)
+        while remaining:
+            level = [sid for sid in remaining if self.dependencies[sid] <= placed]
+            if not level:
+                level = remaining[:1]
+            levels.append(level)
+            placed.update(level)
+            remaining = [sid for sid in remaining if sid not in placed]
+        return levels
+
+    def critical_path(self, durations: Optional[Dict[int, float]] = None) -> List[int]:
+        """
+        关键路径：权重之和最大的依赖链
+
+        durations 缺省时每步权重为 1，即依赖链的步数
+        """
+        def weight(sid: int) -> float:
+            return durations.get(sid, 0.0) if durations is not None else 1.0
+
+        best: Dict[int, float] = {}
+        previous: Dict[int, Optional[int]] = {}
+        for level in self.levels():
+            for sid in level:
+                # 只考虑已排好序的前驱，成环的依赖被忽略
+                parents = [dep for dep in self.dependencies[sid] if dep in best]
+                parent = max(parents, key=lambda dep: best[dep], default=None)
+                best[sid] = (best[parent] if parent is not None else 0.0) + weight(sid)
+                previous[sid] = parent
+        if not best:
+            return []
+        sid: Optional[int] = max(self.order, key=lambda s: best[s])
+        path: List[int] = []
+        while sid is not None:
+            path.append(sid)
+            sid = previous[sid]
+        return path[::-1]
+
+
+def run_plan(
+    dag: PlanDAG,
+    step_ids: List[int],
+    step_results: Dict[int, Any],
+    prepare_input: Callable[[PlanStep, Dict[int, Any]], dict],
+    execute: Callable[[PlanStep, dict], dict],
+    max_workers: int = 4,
+) -> Dict[str, Any]:
+    """
+    按依赖关系并发执行计划步骤，结果直接写入 step_results
+
+    任一步骤失败后不再提交新步骤，已在执行中的步骤仍会完成并保留结果。
+
+    返回:
+        调度报告：completed、failed_step、error、durations、wall_seconds、serial_seconds、
+        critical_path、critical_path_length、critical_path_seconds、max_parallelism
+    """
+    completed: Set[int] = set(step_results.keys())
+    pending = [sid for sid in step_ids if sid not in completed]
+    started: Set[int] = set()
+    durations: Dict[int, float] = {}
+    failures: Dict[int, Exception] = {}
+    running: Dict[Future, int] = {}
+    max_parallelism = 0
+
+    def timed(step: PlanStep, step_input: dict):
+        """返回 (结果, 异常, 耗时)"""
+        start = time.perf_counter()
+        try:
+            return execute(step, step_input), None, time.perf_counter() - start
+        except Exception as e:
+            return None, e, time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="plan-step") as pool:
+        while True:
+            if not failures:
+                ready = [
+                    sid for sid in pending
+                    if sid not in started and dag.dependencies[sid] <= completed
+                ]
+                if not ready and not running:
+                    # 依赖无法满足（成环或引用缺失），按计划顺序执行第一个未开始的步骤
+                    ready = [sid for sid in pending if sid not in started][:1]
+                for sid in ready:
+                    step = dag.steps[sid]
+                    # 输入在主线程中准备，子图线程只读取自己的输入
+                    step_input = prepare_input(step, step_results)
+                    running[pool.submit(timed, step, step_input)] = sid
+                    started.add(sid)
+                max_parallelism = max(max_parallelism, len(running))
+
+            if not running:
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                sid = running.pop(future)
+                result, error, duration = future.result()
+                durations[sid] = duration
+                if error is not None:
+                    failures[sid] = error
+                    continue
+                step_results[sid] = result
+                completed.add(sid)
+
+    return _build_report(dag, completed, failures, durations, time.perf_counter() - start, max_parallelism)
+
+
+async def arun_plan(
+    dag: PlanDAG,
+    step_ids: List[int],
+    step_results: Dict[int, Any],
+    prepare_input: Callable[[PlanStep, Dict[int, Any]], dict],
+    execute: Callable[[PlanStep, dict], Awaitable[dict]],
+    max_concurrency: int = 4,
+) -> Dict[str, Any]:
+    """
+    run_plan 的异步版本：就绪的步骤作为协程任务在当前事件循环中并发执行，不占用线程
+
+    同时执行的步骤数受 max_concurrency 限制，失败处理与调度报告与 run_plan 一致。
+    """
+    completed: Set[int] = set(step_results.keys())
+    pending = [sid for sid in step_ids if sid not in completed]
+    started: Set[int] = set()
+    durations: Dict[int, float] = {}
+    failures: Dict[int, Exception] = {}
+    running: Dict[asyncio.Task, int] = {}
+    max_parallelism = 0
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def timed(step: PlanStep, step_input: dict):
+        """返回 (结果, 异常, 耗时)"""
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                return await execute(step, step_input), None, time.perf_counter() - start
+            except Exception as e:
+                return None, e, time.perf_counter() - start
+
+    start = time.perf_counter()
+    while True:
+        if not failures:
+            ready = [
+                sid for sid in pending
+                if sid not in started and dag.dependencies[sid] <= completed
+            ]
+            if not ready and not running:
+                ready = [sid for sid in pending if sid not in started][:1]
+            for sid in ready:
+                step = dag.steps[sid]
+                step_input = prepare_input(step, step_results)
+                running[asyncio.ensure_future(timed(step, step_input))] = sid
+                started.add(sid)
+            max_parallelism = max(max_parallelism, len(running))
+
+        if not running:
+            break
+
+        done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            sid = running.pop(task)
+            result, error, duration = task.result()
+            durations[sid] = duration
+            if error is not None:
+                failures[sid] = error
+                continue
+            step_results[sid] = result
+            completed.add(sid)
+
+    return _build_report(dag, completed, failures, durations, time.perf_counter() - start, max_parallelism)
+
+
+def _build_report(
+    dag: PlanDAG,
+    completed: Set[int],
+    failures: Dict[int, Exception],
+    durations: Dict[int, float],
+    wall_seconds: float,
+    max_parallelism: int,
+) -> Dict[str, Any]:
+    failed_step = min(failures) if failures else None
+    critical_path = dag.critical_path()
+    return {
+        "completed": [sid for sid in dag.order if sid in completed and sid in durations],
+        "failed_step": failed_step,
+        "error": failures[failed_step] if failed_step is not None else None,
+        "durations": durations,
+        "wall_seconds": wall_seconds,
+        "serial_seconds": sum(durations.values()),
+        "critical_path": critical_path,
+        "critical_path_length": len(critical_path),
+        "critical_path_seconds": sum(durations.get(sid, 0.0) for sid in dag.critical_path(durations)),
+        "max_parallelism": max_parallelism,
+    }
+
+
+class SchedulerStats:
+    """进程级调度统计：计划数、平均关键路径长度、并行加速比"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.plans = 0
+        self.steps = 0
+        self.failed_plans = 0
+        self.critical_path_steps = 0
+        self.wall_seconds = 0.0
+        self.serial_seconds = 0.0
+        self.max_parallelism = 0
+
+    def record(self, report: Dict[str, Any]) -> None:
+        with self._lock:
+            self.plans += 1
+            self.steps += len(report["durations"])
+            self.failed_plans += 1 if report["failed_step"] is not None else 0
+            self.critical_path_steps += report["critical_path_length"]
+            self.wall_seconds += report["wall_seconds"]
+            self.serial_seconds += report["serial_seconds"]
+            self.max_parallelism = max(self.max_parallelism, report["max_parallelism"])
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "plans": self.plans,
+                "steps": self.steps,
+                "failed_plans": self.failed_plans,
+                "avg_critical_path_length": round(self.critical_path_steps / self.plans, 2) if self.plans else 0.0,
+                "avg_wall_seconds": round(self.wall_seconds / self.plans, 3) if self.plans else 0.0,
+                "parallel_speedup": round(self.serial_seconds / self.wall_seconds, 2) if self.wall_seconds else 0.0,
+                "max_parallelism": self.max_parallelism,
+            }
+
+
+# 进程级共享调度统计
+plan_scheduler_stats = SchedulerStats()
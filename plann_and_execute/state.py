@@ -22,9 +22,13 @@ class OrchestratorState(TypedDict, total=False):
     '''编排器状态'''
     query: str  # 用户查询
     plan: Plan  # 生成的计划
+    plan_source: str  # 计划来源：compiler（本地编译）或 llm
     past_plans: List[str]  # 之前失败的计划
     current_step: int  # 当前执行到的计划步骤序号
+    current_batch: List[int]  # 待执行的计划步骤序号（由 DAG 调度器按依赖并发执行）
     step_results: Dict[int, str]  # 计划步骤序号到结果映射
+    step_memo: Dict[str, Any]  # (子图名称, 步骤输入) 到结果的映射，重规划后相同输入的步骤直接复用
+    schedule_report: Dict[str, Any]  # 调度报告（关键路径、耗时、并行度）
     error_info: Optional[Dict[str, Any]]  # 错误信息
     replan_count: int  # 重试次数
     final_result: str  # 最终结果
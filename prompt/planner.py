@@ -35,11 +35,13 @@ PLANNER_SYSTEM_PROMPT = """你是一个美食推荐规划专家。你的职责
   3. "scenario_classifier" —— 【可选】识别场景，输出 scenario、types
   4. "filter_criteria" —— 【可选】提取筛选条件，输出 filters、confidence
   5. "food_search" —— 调用高德美食搜索，输入需要 city、location(经纬度)、types、locations、search_mode
+  6. "understand_query" —— 【推荐】一次调用同时输出 parse_query、intent_classifier、scenario_classifier、filter_criteria 的全部字段（city、location、locations、location_count、search_mode、scenario、types、filters），可替代这四个子图
 - description 应该简洁明了
 - input_mapping 用于定义数据流：
   - 格式为 "step_X.output_field" 表示来自第X步的输出字段
   - 如果是第一步，通常不需要 input_mapping
 - 确保步骤顺序合理（根据 query 内容灵活组合）：
+  - **推荐（最快）**：understand_query -> food_search，food_search 的输入全部映射自 step_1
   - 最简单：parse_query -> food_search（直接搜索）
   - 有场景需求：parse_query -> scenario_classifier -> food_search（按餐厅类型搜索）
   - 有筛选条件：parse_query -> scenario_classifier -> filter_criteria -> food_search（按类型和条件搜索）
@@ -99,7 +101,35 @@ PLANNER_SYSTEM_PROMPT = """你是一个美食推荐规划专家。你的职责
     ]
 }
 
-## 示例2：多地点等距搜索
+## 示例2：使用 understand_query 一步完成查询理解
+用户请求："国贸附近人均100以内的日料"
+
+正确的计划示例：
+{
+    "steps": [
+        {
+            "step_id": 1,
+            "subgraph_name": "understand_query",
+            "description": "一次性解析地点、意图、场景和筛选条件",
+            "input_mapping": null
+        },
+        {
+            "step_id": 2,
+            "subgraph_name": "food_search",
+            "description": "按解析结果调用高德美食搜索",
+            "input_mapping": {
+                "keywords": "step_1.scenario",
+                "city": "step_1.city",
+                "location": "step_1.location",
+                "types": "step_1.types",
+                "search_mode": "step_1.search_mode",
+                "locations": "step_1.locations"
+            }
+        }
+    ]
+}
+
+## 示例3：多地点等距搜索
 用户请求："我和朋友分别在天安门和望京，找个中间位置的火锅"
 
 正确的计划示例：
@@ -1,9 +1,12 @@
 """
 应用筛选条件到搜索结果
 """
-import math
 from typing import List, Dict, Any, Optional
 
+import numpy as np
+
+from sub_agents.food_search.poi import as_dict, poi_cost, poi_rating
+
 
 def apply_filters(
     results: List[Dict[str, Any]],
@@ -38,18 +41,14 @@ def apply_filters(
         price_max = price_range.get("max")
         
         def price_filter(poi: Dict[str, Any]) -> bool:
-            cost = poi.get("cost")
-            if cost is None:
-                return True  # 没有价格信息的保留
-            try:
-                cost_val = float(cost)
-                if cost_val < price_min:
-                    return False
-                if price_max is not None and cost_val > price_max:
-                    return False
-                return True
-            except (ValueError, TypeError):
-                return True
+            cost_val = poi_cost(poi)
+            if cost_val is None:
+                return True  # 没有（或无法解析的）价格信息的保留
+            if cost_val < price_min:
+                return False
+            if price_max is not None and cost_val > price_max:
+                return False
+            return True
         
         filtered_results = [r for r in filtered_results if price_filter(r)]
         print(f"  > 价格筛选后: {len(filtered_results)} 条结果")
@@ -59,14 +58,10 @@ def apply_filters(
         rating_min = filters["rating_min"]
         
         def rating_filter(poi: Dict[str, Any]) -> bool:
-            rating = poi.get("rating")
-            if rating is None:
-                return True  # 没有评分信息的保留
-            try:
-                rating_val = float(rating)
-                return rating_val >= rating_min
-            except (ValueError, TypeError):
-                return True
+            rating_val = poi_rating(poi)
+            if rating_val is None:
+                return True  # 没有（或无法解析的）评分信息的保留
+            return rating_val >= rating_min
         
         filtered_results = [r for r in filtered_results if rating_filter(r)]
         print(f"  > 评分筛选后: {len(filtered_results)} 条结果")
@@ -74,17 +69,18 @@ def apply_filters(
     # 3. 距离筛选
     if "distance_max" in filters:
         distance_max = filters["distance_max"]
-        
-        def distance_filter(poi: Dict[str, Any]) -> bool:
-            # 注意：这里需要计算实际距离，但高德API返回的是相对位置
-            # 简化处理：假设结果已按距离排序，保留前N个
-            # 实际应用中需要计算两点间距离
-            return True
-        
-        # 由于高德API已按距离排序，这里只保留前distance_max/1000个结果
-        # 这是一个简化的处理方式
-        max_count = max(1, distance_max // 1000)
-        filtered_results = filtered_results[:max_count]
+        matrix = _distance_array(filtered_results)
+
+        if matrix.size and not np.isnan(matrix).all():
+            # 使用搜索阶段算好的 distances：到每个参考点的距离都不超过 distance_max，
+            # 没有有效距离的结果保留
+            farthest = np.where(np.isnan(matrix), -np.inf, matrix).max(axis=1)
+            keep = farthest <= distance_max
+            filtered_results = [r for r, kept in zip(filtered_results, keep.tolist()) if kept]
+        else:
+            # 没有距离信息时：高德API已按距离排序，只保留前distance_max/1000个结果
+            max_count = max(1, distance_max // 1000)
+            filtered_results = filtered_results[:max_count]
         print(f"  > 距离筛选后: {len(filtered_results)} 条结果")
     
     # 4. 排序
@@ -93,10 +89,7 @@ def apply_filters(
     
     if sort_by == "rating":
         def get_rating(poi):
-            try:
-                return float(poi.get("rating", 0))
-            except (ValueError, TypeError):
-                return 0
+            return poi_rating(poi) or 0
         
         filtered_results.sort(
             key=get_rating,
@@ -106,10 +99,7 @@ def apply_filters(
     
     elif sort_by == "price":
         def get_price(poi):
-            try:
-                return float(poi.get("cost", 0))
-            except (ValueError, TypeError):
-                return 0
+            return poi_cost(poi) or 0
         
         filtered_results.sort(
             key=get_price,
@@ -129,13 +119,15 @@ def apply_filters(
     return filtered_results
 
 
-def _calc_balance_score(distances: List[float]) -> float:
-    """计算均衡度评分：使用标准差，越小越均衡。支持 N >= 2。"""
-    if len(distances) <= 1:
-        return 0.0
-    mean = sum(distances) / len(distances)
-    variance = sum((d - mean) ** 2 for d in distances) / len(distances)
-    return math.sqrt(variance)
+def _distance_array(results: List[Dict[str, Any]]) -> np.ndarray:
+    """把各结果的 distances 字段（-1 表示无效）整理为 (结果数, 参考点数) 矩阵，无效或缺失的距离为 NaN"""
+    width = max((len(r.get("distances") or []) for r in results), default=0)
+    matrix = np.full((len(results), width), np.nan)
+    for row, r in enumerate(results):
+        distances = r.get("distances") or []
+        matrix[row, :len(distances)] = distances
+    matrix[matrix < 0] = np.nan
+    return matrix
 
 
 def apply_balance_filter(
@@ -157,27 +149,26 @@ def apply_balance_filter(
     if not results:
         return []
 
-    # 为每个结果计算 balance_score
-    scored = []
-    for r in results:
-        distances = r.get("distances", [])
-        valid_d = [d for d in distances if d >= 0]
-        if not valid_d:
-            balance = 0.0
-        elif len(valid_d) == 1:
-            balance = 0.0  # 单地点：退化为 0
-        else:
-            balance = _calc_balance_score(valid_d)
-        scored.append({**r, "_balance_score": round(balance, 1)})
+    # 为每个结果计算 balance_score：对距离矩阵按行求标准差（忽略无效距离），有效距离不足两个时退化为 0
+    matrix = _distance_array(results)
+    valid_counts = (~np.isnan(matrix)).sum(axis=1)
+    balances = np.zeros(len(results))
+    multi = valid_counts >= 2
+    if multi.any():
+        balances[multi] = np.nanstd(matrix[multi], axis=1)
+    scored = [{**as_dict(r), "_balance_score": round(balance, 1)} for r, balance in zip(results, balances.tolist())]
+    # 评分只取一次（Poi 直接用预解析值），与 scored 一一对应，排序与加权时复用
+    ratings = [poi_rating(r) or 0 for r in results]
 
     if mode == "hard":
         # 阈值过滤：balance_score < threshold
-        filtered = [r for r in scored if r["_balance_score"] < threshold]
+        kept = [(r, rating) for r, rating in zip(scored, ratings) if r["_balance_score"] < threshold]
         # 按评分降序
-        filtered.sort(
-            key=lambda r: float(r.get("rating") or 0),
+        kept.sort(
+            key=lambda pair: pair[1],
             reverse=True,
         )
+        filtered = [r for r, _ in kept]
         print(f"  > [hard] 均衡度过滤: {len(scored)} → {len(filtered)} (阈值 {threshold}m)")
         return filtered
 
@@ -186,14 +177,13 @@ def apply_balance_filter(
             return []
 
         # 归一化：rating (0-5 → 0-1)，balance_score (0-bound)
-        ratings = [float(r.get("rating") or 0) for r in scored]
         balances = [r["_balance_score"] for r in scored]
 
         max_rating = max(ratings) if max(ratings) > 0 else 5.0
         max_balance = max(balances) if max(balances) > 0 else 2000.0
 
-        for r in scored:
-            rating_norm = float(r.get("rating") or 0) / max_rating
+        for r, rating in zip(scored, ratings):
+            rating_norm = rating / max_rating
             balance_norm = r["_balance_score"] / max_balance if max_balance > 0 else 0
             r["_composite_score"] = rating_norm * 0.6 + (1 - balance_norm) * 0.4
 
@@ -3,14 +3,17 @@
 """
 import json
 from typing import TypedDict, Dict, Any, List, Optional
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, END
-from langchain_openai import ChatOpenAI
 
-from config import ALIYUN_API_KEY, ALIYUN_BASE_URL, ALIYUN_MODEL
+from common.aio import run_coroutine
+from config import FILTER_RULE_CONFIDENCE_THRESHOLD
+from llm import get_llm, llm_output_cache
 from prompt.filter_criteria import (
     FILTER_CRITERIA_SYSTEM_PROMPT,
     FILTER_CRITERIA_USER_PROMPT_TEMPLATE,
 )
+from sub_agents.filter_criteria.rule_extractor import extract_filters
 
 
 class FilterCriteriaState(TypedDict):
@@ -21,7 +24,7 @@ class FilterCriteriaState(TypedDict):
     error_messages: List[str]  # 错误信息
 
 
-def filter_criteria_node(state: FilterCriteriaState) -> FilterCriteriaState:
+async def afilter_criteria_node(state: FilterCriteriaState) -> FilterCriteriaState:
     """
     条件筛选节点：从用户查询中提取筛选条件
     
@@ -49,14 +52,17 @@ def filter_criteria_node(state: FilterCriteriaState) -> FilterCriteriaState:
         print(f"  < {error_msg}")
         state['error_messages'].append(error_msg)
         return state
+
+    # 规则引擎能完整识别时直接使用，只有规则不确定时才调用 LLM
+    extraction = extract_filters(query)
+    if extraction.confidence >= FILTER_RULE_CONFIDENCE_THRESHOLD:
+        print(f"  < 规则识别筛选条件: {extraction.filters} (规则置信度: {extraction.confidence})")
+        state['filters'] = extraction.filters
+        state['confidence'] = extraction.confidence if extraction.filters else 0.0
+        return state
     
     # 初始化LLM
-    llm = ChatOpenAI(
-        api_key=ALIYUN_API_KEY,
-        base_url=ALIYUN_BASE_URL,
-        model=ALIYUN_MODEL,
-        temperature=0
-    )
+    llm = get_llm("filter_criteria")
     
     # 构建提示词
     system_prompt = FILTER_CRITERIA_SYSTEM_PROMPT
@@ -70,11 +76,8 @@ def filter_criteria_node(state: FilterCriteriaState) -> FilterCriteriaState:
             {"role": "user", "content": user_prompt}
         ]
         
-        response = llm.invoke(messages)
-        response_text = response.content.strip()
-        
-        # 解析JSON响应
-        result = json.loads(response_text)
+        # 调用LLM并解析JSON响应（相同输入命中输出缓存）
+        result = await llm_output_cache.ainvoke("filter_criteria", llm, messages)
         
         filters = result.get("filters")
         confidence = result.get("confidence", 0.0)
@@ -100,9 +103,14 @@ def filter_criteria_node(state: FilterCriteriaState) -> FilterCriteriaState:
     return state
 
 
+def filter_criteria_node(state: FilterCriteriaState) -> FilterCriteriaState:
+    """afilter_criteria_node 的同步版本，在后台事件循环中执行"""
+    return run_coroutine(afilter_criteria_node(state))
+
+
 # 构建条件筛选Agent
 filter_criteria_builder = StateGraph(FilterCriteriaState)
-filter_criteria_builder.add_node("filter", filter_criteria_node)
+filter_criteria_builder.add_node("filter", RunnableLambda(filter_criteria_node, afunc=afilter_criteria_node))
 filter_criteria_builder.set_entry_point("filter")
 filter_criteria_builder.add_edge("filter", END)
 filter_criteria_agent = filter_criteria_builder.compile()
@@ -0,0 +1,170 @@
+"""
+基于规则的筛选条件提取
+
+常见的价格、评分、距离、排序、营业状态表述（"100元以下"、"人均200左右"、"4.5分以上"、"1公里内"、
+"按评分排序"，支持中文数字）用预编译的正则直接识别，输出与 LLM 相同结构的 filters 字典。
+
+置信度：
+    - 识别出的条件完整覆盖了 query 中的筛选线索 → 高置信度，可直接使用
+    - 仍有未识别的线索（如"便宜点"、"性价比高"、无单位的数字）→ 低置信度，交给 LLM
+"""
+import re
+from typing import Any, Dict, List, NamedTuple, Tuple
+
+
+_DIGITS = {"零": 0, "〇": 0, "一": 1, "二": 2, "两": 2, "三": 3, "四": 4, "五": 5, "六": 6, "七": 7, "八": 8, "九": 9}
+_UNITS = {"十": 10, "百": 100, "千": 1000, "万": 10000}
+# 阿拉伯数字后的数量级后缀："1k"、"1千"、"2万"、"2w"
+_MAGNITUDES = {"k": 1000, "K": 1000, "千": 1000, "w": 10000, "W": 10000, "万": 10000}
+
+NUM = r"(\d+(?:\.\d+)?[kK千wW万]?|[零〇一二两三四五六七八九十百千万]+(?:点[零〇一二三四五六七八九]+)?|半)"
+PRICE_UNIT = r"(?:元|块钱|块|rmb|RMB)"
+
+HIGH_CONFIDENCE = 0.95
+NO_FILTER_CONFIDENCE = 0.9
+LOW_CONFIDENCE = 0.4
+
+
+def _parse_chinese_int(text: str) -> int:
+    total, section, digit = 0, 0, 0
+    last_unit = 1
+    for ch in text:
+        if ch in _DIGITS:
+            digit = _DIGITS[ch]
+        elif ch == "万":
+            total += (section + digit) * 10000
+            section, digit, last_unit = 0, 0, 10000
+        else:
+            last_unit = _UNITS[ch]
+            section += (digit or 1) * last_unit
+            digit = 0
+    # 口语省略末位单位："一百五" = 150，"两千五" = 2500
+    if digit and last_unit >= 100 and text[-1] in _DIGITS and text[-2:-1] in _UNITS:
+        digit *= last_unit // 10
+    return total + section + digit
+
+
+def parse_number(text: str) -> float:
+    """解析阿拉伯数字或中文数字，如 "4.5"、"1k"、"2万"、"四点五"、"一百五"、"两千"、"半" """
+    text = text.strip()
+    if text == "半":
+        return 0.5
+    if re.fullmatch(r"\d+(?:\.\d+)?", text):
+        return float(text)
+    if re.fullmatch(r"\d+(?:\.\d+)?[kK千wW万]", text):
+        return float(text[:-1]) * _MAGNITUDES[text[-1]]
+    if "点" in text:
+        integer, fraction = text.split("点", 1)
+        return _parse_chinese_int(integer or "零") + float("0." + "".join(str(_DIGITS[c]) for c in fraction))
+    return float(_parse_chinese_int(text))
+
+
+def _int(value: float):
+    return int(value) if float(value).is_integer() else value
+
+
+_PRICE_RANGE = re.compile(
+    rf"(人均|价格|预算|消费)?\s*{NUM}\s*{PRICE_UNIT}?\s*(?:-|~|～|到|至)\s*{NUM}\s*({PRICE_UNIT})?"
+)
+_PRICE_BOUND = re.compile(
+    rf"(人均|价格|预算|消费)?\s*(?:在)?\s*{NUM}\s*({PRICE_UNIT})?\s*(以下|以内|之内|内|以上|起|左右|上下)?"
+)
+_RATING = re.compile(
+    rf"(评分|评价|口碑|星级)?\s*(?:在)?\s*{NUM}\s*(分|星)?\s*(?:及)?(以上|往上|起)"
+)
+_DISTANCE = re.compile(
+    rf"(方圆|距离|离我)?\s*{NUM}\s*(公里|千米|km|KM|米)\s*(?:以内|之内|范围内|内|以下)?"
+)
+_KEYWORD_RULES: List[Tuple["re.Pattern[str]", Dict[str, Any]]] = [
+    (re.compile(r"按评分排序|按评分|评分最高|评分高的优先|评分从高到低|评分高的排前面"),
+     {"sort_by": "rating", "sort_order": "desc"}),
+    (re.compile(r"口碑最好"), {"rating_min": 4.0, "sort_by": "rating", "sort_order": "desc"}),
+    (re.compile(r"评价不错|好评如潮|好评多"), {"rating_min": 3.5}),
+    (re.compile(r"按距离排序|按距离|距离最近|离我最近|最近的优先|近的优先"), {"sort_by": "distance", "sort_order": "asc"}),
+    (re.compile(r"按价格排序|按价格|价格最低|最便宜|便宜的优先|价格从低到高"), {"sort_by": "price", "sort_order": "asc"}),
+    (re.compile(r"最贵|价格最高|价格从高到低"), {"sort_by": "price", "sort_order": "desc"}),
+    (re.compile(r"现在还开着|还开着|正在营业|营业中|现在营业|24小时营业|24小时|通宵"), {"open_now": True}),
+]
+# 规则未能消化的筛选线索：出现时说明规则可能漏掉了条件，需要 LLM 兜底
+_RESIDUAL_CUES = re.compile(
+    rf"{NUM}\s*(?:{PRICE_UNIT}|分|星|公里|千米|km|米|以上|以下|以内|之内|左右)|"
+    r"便宜|实惠|性价比|贵|高档|档次|评分|口碑|距离|价格|预算|人均|排序|优先|营业"
+)
+
+
+class RuleExtraction(NamedTuple):
+    """规则提取结果"""
+
+    filters: Dict[str, Any]
+    confidence: float
+
+
+def extract_filters(query: str) -> RuleExtraction:
+    """
+    用规则从 query 中提取筛选条件
+
+    返回:
+        RuleExtraction(filters, confidence)，filters 的结构与 apply_filters 的输入一致
+    """
+    text = query or ""
+    filters: Dict[str, Any] = {}
+    consumed: List[Tuple[int, int]] = []
+
+    def free(match: "re.Match[str]") -> bool:
+        return all(match.end() <= start or match.start() >= end for start, end in consumed)
+
+    # 评分与距离的单位明确，先于价格匹配，避免 "4.5分以上" 被当作价格
+    for match in _RATING.finditer(text):
+        prefix, number, unit, _ = match.groups()
+        value = parse_number(number)
+        if not (prefix or unit) or value > 5 or not free(match):
+            continue
+        filters["rating_min"] = value
+        consumed.append(match.span())
+
+    for match in _DISTANCE.finditer(text):
+        _, number, unit = match.groups()
+        if not free(match):
+            continue
+        value = parse_number(number)
+        filters["distance_max"] = _int(value * 1000 if unit in ("公里", "千米", "km", "KM") else value)
+        consumed.append(match.span())
+
+    for match in _PRICE_RANGE.finditer(text):
+        prefix, low, high, unit = match.groups()
+        if not (prefix or unit) or not free(match):
+            continue
+        low, high = sorted((parse_number(low), parse_number(high)))
+        filters["price_range"] = {"min": _int(low), "max": _int(high)}
+        consumed.append(match.span())
+
+    for match in _PRICE_BOUND.finditer(text):
+        prefix, number, unit, bound = match.groups()
+        # 只有 "人均200" 这类带前缀的表述才能省略上下限，"100块" 单独出现时含义不明确
+        if not free(match) or not (prefix or unit) or not (bound or prefix):
+            continue
+        value = parse_number(number)
+        if bound in ("以下", "以内", "之内", "内") or (prefix == "预算" and bound is None):
+            # "预算一百五" 是上限，与 "150以内" 同义
+            price_range = {"min": 0, "max": _int(value)}
+        elif bound in ("以上", "起"):
+            price_range = {"min": _int(value), "max": None}
+        else:
+            # "左右"、"上下"或仅有 "人均200"：取 ±20%
+            price_range = {"min": _int(round(value * 0.8)), "max": _int(round(value * 1.2))}
+        filters["price_range"] = price_range
+        consumed.append(match.span())
+
+    for pattern, rule_filters in _KEYWORD_RULES:
+        for match in pattern.finditer(text):
+            if free(match):
+                for key, value in rule_filters.items():
+                    filters.setdefault(key, value)
+                consumed.append(match.span())
+
+    residual = text
+    for start, end in sorted(consumed, reverse=True):
+        residual = residual[:start] + " " + residual[end:]
+    if _RESIDUAL_CUES.search(residual):
+        return RuleExtraction(filters, LOW_CONFIDENCE)
+    return RuleExtraction(filters, HIGH_CONFIDENCE if filters else NO_FILTER_CONFIDENCE)
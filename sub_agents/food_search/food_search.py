@@ -1,15 +1,19 @@
-import math
-import os
-import time
-import requests
+import asyncio
+import httpx
+import numpy as np
+from functools import lru_cache
 from typing import TypedDict, Dict, Any, List, Optional
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, END
-from config import GAODE_API_KEY
+from common.aio import run_coroutine
+from common.distance import haversine_matrix, max_pairwise_distance, parse_lnglats
+from gaode.key_pool import gaode_key_pool
+from sub_agents.food_search.poi import Poi, poi_coords, poi_lnglat
+from sub_agents.food_search.poi_fetcher import afetch_poi_pages
+from sub_agents.food_search.spatial_index import PoiGridIndex
 
-
-# 高德 API 调用频率限制（秒）
-_GAODE_API_CALL_INTERVAL = 1.0
-_last_gaode_api_call_time = 0.0
+# 同一家餐厅在不同搜索结果中的坐标偏差上限（米）
+POI_MATCH_RADIUS = 100
 
 
 class FoodSearchState(TypedDict):
@@ -21,124 +25,82 @@ class FoodSearchState(TypedDict):
     error_messages: List[str]
 
 
-def haversine_distance(lnglat1: str, lnglat2: str) -> float:
-    """计算两个经纬度坐标之间的 Haversine 距离（单位：米）"""
-    lng1, lat1 = map(float, lnglat1.split(","))
-    lng2, lat2 = map(float, lnglat2.split(","))
-    R = 6371000  # 地球半径（米）
-    phi1, phi2 = math.radians(lat1), math.radians(lat2)
-    dphi = math.radians(lat2 - lat1)
-    dlambda = math.radians(lng2 - lng1)
-    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
-    return R * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-
-
-def _fetch_pois_from_gaode(keywords: str, location: str, types: str, city: str,
-                           radius: Optional[int] = None, offset: int = 20, pages: int = 5) -> List[Dict[str, Any]]:
-    """从高德 API 获取 POI 列表的通用函数"""
-    global _last_gaode_api_call_time
-
-    api_url = "https://restapi.amap.com/v3/place/around"
-    all_results: List[Dict[str, Any]] = []
-
-    for page in range(1, pages + 1):
-        # 频率限制：确保每次调用间隔至少 _GAODE_API_CALL_INTERVAL 秒
-        current_time = time.time()
-        elapsed = current_time - _last_gaode_api_call_time
-        if elapsed < _GAODE_API_CALL_INTERVAL:
-            sleep_time = _GAODE_API_CALL_INTERVAL - elapsed
-            time.sleep(sleep_time)
-
-        params = {
-            "key": GAODE_API_KEY,
-            "keywords": keywords,
-            "location": location,
-            "types": types,
-            "city": city or "",
-            "citylimit": "true",
-            "offset": str(offset),
-            "page": str(page),
-            "extensions": "all",
-        }
-        if radius is not None:
-            params["radius"] = str(radius)
-
-        try:
-            response = requests.get(api_url, params=params, timeout=10)
-            _last_gaode_api_call_time = time.time()
-            response.raise_for_status()
-            data = response.json()
-
-            if data.get("status") != "1":
-                error_info = data.get("info", "未知的高德API业务错误")
-                raise ValueError(f"高德API业务错误: {error_info}")
-
-            raw_pois = data.get("pois", [])
-            for poi in raw_pois:
-                biz_ext = poi.get("biz_ext", {})
-                all_results.append({
-                    "name": poi.get("name"),
-                    "address": poi.get("address"),
-                    "location": poi.get("location"),
-                    "telephone": poi.get("tel"),
-                    "type": poi.get("type"),
-                    "rating": biz_ext.get("rating"),
-                    "cost": biz_ext.get("cost"),
-                })
-
-            if len(raw_pois) < offset:
-                break
-        except Exception:
-            raise
-        finally:
-            # 每次调用后固定 sleep 0.5 秒
-            time.sleep(0.5)
+async def _afetch_pois_from_gaode(keywords: str, location: str, types: str, city: str,
+                                  radius: Optional[int] = None, offset: int = 20, pages: int = 5) -> List[Poi]:
+    """
+    从高德 API 获取 POI 列表的通用函数（多页并发抓取，受 QPS 限流约束）
+
+    每个 POI 在这里构建一次 Poi 记录，坐标、评分、人均消费随之解析，后续筛选与距离计算直接使用。
+    """
+    params = {
+        "keywords": keywords,
+        "location": location,
+        "types": types,
+        "city": city or "",
+        "citylimit": "true",
+        "offset": str(offset),
+        "extensions": "all",
+    }
+    if radius is not None:
+        params["radius"] = str(radius)
+
+    all_results: List[Poi] = []
+    seen = set()
+    for raw_pois in await afetch_poi_pages(params, pages, offset):
+        for poi in raw_pois:
+            # 翻页结果可能重叠：按高德 POI id 去重，没有 id 时按名称 + 坐标去重
+            identity = poi.get("id") or (poi.get("name"), poi.get("location"))
+            if identity in seen:
+                continue
+            seen.add(identity)
+            all_results.append(Poi.from_gaode(poi))
 
     return all_results
 
 
-def _match_poi(poi_a: Dict[str, Any], poi_b: Dict[str, Any]) -> bool:
-    """判断两个 POI 是否为同一家餐厅：名称包含/编辑距离 + 坐标 < 100m"""
-    name_a = poi_a.get("name", "")
-    name_b = poi_b.get("name", "")
-    loc_a = poi_a.get("location", "")
-    loc_b = poi_b.get("location", "")
-
-    if not name_a or not name_b or not loc_a or not loc_b:
+def _match_name(name_a: str, name_b: str) -> bool:
+    """名称匹配：包含关系或编辑距离 < 3"""
+    if not name_a or not name_b:
         return False
+    return name_a in name_b or name_b in name_a or _bounded_edit_distance(name_a, name_b, 2) <= 2
 
-    # 名称匹配：包含关系
-    name_match = (name_a in name_b or name_b in name_a)
-    if not name_match:
-        # 编辑距离 < 3
-        edit_dist = _edit_distance(name_a, name_b)
-        name_match = edit_dist < 3
-
-    # 坐标匹配：Haversine < 100m
-    coord_match = haversine_distance(loc_a, loc_b) < 100
-
-    return name_match and coord_match
 
+@lru_cache(maxsize=8192)
+def _bounded_edit_distance(s1: str, s2: str, limit: int) -> int:
+    """
+    带上限的 Levenshtein 编辑距离：距离超过 limit 时提前返回 limit + 1
 
-def _edit_distance(s1: str, s2: str) -> int:
-    """Levenshtein 编辑距离"""
+    只计算 |i - j| <= limit 的对角带，某一行的最小值超过 limit 时立即终止；
+    同一对名称在翻页、多地点匹配中反复出现，结果用 LRU 表记忆。
+    """
     if len(s1) < len(s2):
-        return _edit_distance(s2, s1)
-    if len(s2) == 0:
-        return len(s1)
-    prev_row = list(range(len(s2) + 1))
-    for i, c1 in enumerate(s1):
-        curr_row = [i + 1]
-        for j, c2 in enumerate(s2):
-            insert = prev_row[j + 1] + 1
-            delete = curr_row[j] + 1
-            replace = prev_row[j] + (c1 != c2)
-            curr_row.append(min(insert, delete, replace))
-        prev_row = curr_row
-    return prev_row[-1]
-
-
-def _search_single(step_input: dict) -> List[Dict[str, Any]]:
+        s1, s2 = s2, s1
+    n, m = len(s1), len(s2)
+    exceeded = limit + 1
+    if n - m > limit:
+        return exceeded
+    if m == 0:
+        return n
+
+    prev = [j if j <= limit else exceeded for j in range(m + 1)]
+    for i in range(1, n + 1):
+        curr = [exceeded] * (m + 1)
+        if i <= limit:
+            curr[0] = i
+        row_min = curr[0]
+        c1 = s1[i - 1]
+        for j in range(max(1, i - limit), min(m, i + limit) + 1):
+            value = min(prev[j] + 1, curr[j - 1] + 1, prev[j - 1] + (c1 != s2[j - 1]), exceeded)
+            curr[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > limit:
+            return exceeded
+        prev = curr
+    return prev[m]
+
+
+async def _asearch_single(step_input: dict) -> List[Dict[str, Any]]:
     """单点搜索：封装现有逻辑，以 location 为中心搜索"""
     keywords = step_input.get("keywords") or "美食"
     location = step_input.get("location")
@@ -150,44 +112,72 @@ def _search_single(step_input: dict) -> List[Dict[str, Any]]:
         print(f"  > 检测到位置词汇，使用默认关键词'美食'代替'{keywords}'")
         keywords = "美食"
 
-    return _fetch_pois_from_gaode(keywords, location, types, city)
+    return await _afetch_pois_from_gaode(keywords, location, types, city)
 
 
-def _search_intersection(step_input: dict, locations: List[dict]) -> List[Dict[str, Any]]:
+async def _asearch_intersection(step_input: dict, locations: List[dict]) -> List[Dict[str, Any]]:
     """多点搜索：分别搜索 → POI 模糊匹配 → 严格交集"""
     keywords = step_input.get("keywords") or "美食"
     types = step_input.get("types") or "050000"
     city = step_input.get("city", "")
 
-    # 1. 各地点独立搜索
-    all_poi_sets = []
+    # 1. 各地点独立搜索（并发请求，结果顺序与地点顺序一致）
+    valid_locations = []
     for loc in locations:
         lnglat = loc.get("lnglat")
         if not lnglat:
             print(f"  ! 地点 '{loc.get('name')}' 无有效经纬度，跳过")
             continue
         print(f"  > 搜索地点 '{loc.get('name')}' ({lnglat})")
-        pois = _fetch_pois_from_gaode(keywords, lnglat, types, city)
-        all_poi_sets.append(pois)
-        print(f"    结果数: {len(pois)}")
+        valid_locations.append(loc)
+    all_poi_sets = await asyncio.gather(*(
+        _afetch_pois_from_gaode(keywords, loc["lnglat"], types, city) for loc in valid_locations
+    ))
+    for loc, pois in zip(valid_locations, all_poi_sets):
+        print(f"    '{loc.get('name')}' 结果数: {len(pois)}")
 
     if not all_poi_sets:
         return []
 
     # 2. 严格交集
-    intersection = list(all_poi_sets[0])
-    for poi_set in all_poi_sets[1:]:
+    intersection = _intersect_poi_sets(all_poi_sets)
+
+    print(f"  < 严格交集中: {len(intersection)} 家餐厅")
+    return intersection
+
+
+def _intersect_poi_sets(poi_sets: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    严格交集：保留第一个地点结果中、在其余每个地点结果里都能匹配到同一家餐厅的 POI
+
+    高德 POI id 在不同搜索之间稳定，两侧都有 id 时直接按 id 做哈希连接，线性时间完成；
+    缺少 id 的 POI 才回退到模糊匹配：对候选建网格索引，只对 100m 内的候选比较名称。
+    """
+    if not poi_sets:
+        return []
+    intersection = list(poi_sets[0])
+    for poi_set in poi_sets[1:]:
+        ids = {candidate["id"] for candidate in poi_set if candidate.get("id")}
+        # 网格索引按需构建：有 id 的 POI 只需与没有 id 的候选模糊匹配，没有 id 的 POI 与全部候选匹配
+        indexes: Dict[bool, PoiGridIndex] = {}
         matched = []
         for p in intersection:
-            if any(_match_poi(p, candidate) for candidate in poi_set):
+            has_id = bool(p.get("id"))
+            if has_id and p["id"] in ids:
+                matched.append(p)
+                continue
+            if has_id not in indexes:
+                candidates = [c for c in poi_set if not c.get("id")] if has_id else poi_set
+                indexes[has_id] = PoiGridIndex(candidates, radius=POI_MATCH_RADIUS)
+            coord = poi_lnglat(p)
+            if coord and any(_match_name(p.get("name"), candidate.get("name"))
+                             for candidate, _ in indexes[has_id].nearby_point(*coord)):
                 matched.append(p)
         intersection = matched
-
-    print(f"  < 严格交集中: {len(intersection)} 家餐厅")
     return intersection
 
 
-def _fallback_midpoint_search(step_input: dict, locations: List[dict]) -> List[Dict[str, Any]]:
+async def _afallback_midpoint_search(step_input: dict, locations: List[dict]) -> List[Dict[str, Any]]:
     """降级策略：计算几何中点 → 扩大半径搜索"""
     keywords = step_input.get("keywords") or "美食"
     types = step_input.get("types") or "050000"
@@ -198,39 +188,28 @@ def _fallback_midpoint_search(step_input: dict, locations: List[dict]) -> List[D
         return []
 
     # 计算几何中点
-    lngs = []
-    lats = []
-    for loc in valid_locations:
-        lng, lat = loc["lnglat"].split(",")
-        lngs.append(float(lng))
-        lats.append(float(lat))
-    mid_lng = sum(lngs) / len(lngs)
-    mid_lat = sum(lats) / len(lats)
+    lnglats = [loc["lnglat"] for loc in valid_locations]
+    mid_lng, mid_lat = parse_lnglats(lnglats).mean(axis=0)
     midpoint = f"{mid_lng:.6f},{mid_lat:.6f}"
 
     # 计算最大地点间距离
-    max_dist = 0
-    for i in range(len(valid_locations)):
-        for j in range(i + 1, len(valid_locations)):
-            d = haversine_distance(valid_locations[i]["lnglat"], valid_locations[j]["lnglat"])
-            if d > max_dist:
-                max_dist = d
+    max_dist = max_pairwise_distance(lnglats)
 
     radius = int(max_dist / 2 + 2000)
     print(f"  > 降级：中点 {midpoint}，半径 {radius}m")
 
-    results = _fetch_pois_from_gaode(keywords, midpoint, types, city, radius=radius)
+    results = await _afetch_pois_from_gaode(keywords, midpoint, types, city, radius=radius)
     for r in results:
         r["_fallback"] = True
     return results
 
 
-def gaode_poi_search_node(state: FoodSearchState) -> FoodSearchState:
+async def agaode_poi_search_node(state: FoodSearchState) -> FoodSearchState:
     """高德地图POI搜索节点，根据 search_mode 路由到不同搜索分支"""
 
     print("--- [Agent] 进入 高德美食搜索Agent ---")
 
-    if not GAODE_API_KEY:
+    if not gaode_key_pool.has_keys():
         raise EnvironmentError("错误：GAODE_API_KEY 未设置。")
 
     criteria = state.get("search_criteria") or {}
@@ -250,15 +229,15 @@ def gaode_poi_search_node(state: FoodSearchState) -> FoodSearchState:
     try:
         if search_mode == "single":
             print(f"  > 单点搜索模式")
-            results = _search_single(step_input)
+            results = await _asearch_single(step_input)
 
         elif search_mode == "intersection":
             print(f"  > 多点等距搜索模式，地点数: {len(locations)}")
-            results = _search_intersection(step_input, locations)
+            results = await _asearch_intersection(step_input, locations)
 
             if not results and len(locations) >= 2:
                 print(f"  > 严格交集为空，触发降级中点搜索")
-                results = _fallback_midpoint_search(step_input, locations)
+                results = await _afallback_midpoint_search(step_input, locations)
                 state["fallback"] = "midpoint"
 
         elif search_mode in ("along_route", "union"):
@@ -274,25 +253,19 @@ def gaode_poi_search_node(state: FoodSearchState) -> FoodSearchState:
             state["search_results"] = []
             return state
 
-        # 为每个结果计算到各参考点的距离
+        # 为每个结果计算到各参考点的距离（一次计算完整的 POI × 参考点距离矩阵，无效坐标记为 -1）
         valid_locations = [loc for loc in locations if loc.get("lnglat")]
-        for poi in results:
-            distances = []
-            for loc in valid_locations:
-                try:
-                    d = haversine_distance(poi["location"], loc["lnglat"])
-                    distances.append(round(d, 1))
-                except (ValueError, KeyError):
-                    distances.append(-1)
+        matrix = haversine_matrix(poi_coords(results), parse_lnglats(loc["lnglat"] for loc in valid_locations))
+        for poi, distances in zip(results, np.where(np.isnan(matrix), -1, np.round(matrix, 1)).tolist()):
             poi["distances"] = distances
 
         print(f"  < 成功获取 {len(results)} 条餐厅信息")
         state["search_results"] = results
 
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         error_msg = "网络错误：请求高德API超时。"
         state["error_messages"].append(error_msg)
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         error_msg = f"网络错误：请求高德API失败。详情: {e}"
         state["error_messages"].append(error_msg)
     except ValueError as e:
@@ -305,8 +278,13 @@ def gaode_poi_search_node(state: FoodSearchState) -> FoodSearchState:
     return state
 
 
+def gaode_poi_search_node(state: FoodSearchState) -> FoodSearchState:
+    """agaode_poi_search_node 的同步版本，在后台事件循环中执行"""
+    return run_coroutine(agaode_poi_search_node(state))
+
+
 food_search_builder = StateGraph(FoodSearchState)
-food_search_builder.add_node("gaode_search", gaode_poi_search_node)
+food_search_builder.add_node("gaode_search", RunnableLambda(gaode_poi_search_node, afunc=agaode_poi_search_node))
 food_search_builder.set_entry_point("gaode_search")
 food_search_builder.add_edge("gaode_search", END)
 food_search_agent = food_search_builder.compile()
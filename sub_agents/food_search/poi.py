@@ -0,0 +1,180 @@
+"""
+紧凑的 POI 记录
+
+高德返回的 POI 在抓取时构建一次 Poi：
+    - 经纬度、评分、人均消费预先解析为 float，筛选、排序、距离计算不再反复 float()/split()
+    - type 字符串驻留（sys.intern），同类餐厅共享同一个字符串对象
+    - __slots__ 存储固定字段，后续流程追加的字段（distances、_fallback 等）放在按需创建的 extras 中
+
+Poi 实现 MutableMapping 接口，按键读写、items()、dict(poi) 得到的仍是原有 JSON 结构，
+原有以 dict 处理 POI 的代码无需区分两种类型。
+"""
+import sys
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+
+from common.distance import parse_lnglat
+
+# 对外的 JSON 字段（顺序即序列化顺序）
+FIELDS = ("id", "name", "address", "location", "telephone", "type", "rating", "cost")
+_FIELD_SET = frozenset(FIELDS)
+
+
+def _to_float(value: Any) -> Optional[float]:
+    """解析数值字段；高德缺失字段可能是 None、"" 或 []，均返回 None"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class Poi(MutableMapping):
+    """
+    高德 POI 记录
+
+    原始字符串字段按原样保留用于序列化，解析后的数值存于 lng、lat、rating_value、cost_value（无效时为 None）。
+    """
+
+    __slots__ = FIELDS + ("lng", "lat", "rating_value", "cost_value", "extras")
+
+    def __init__(self, id=None, name=None, address=None, location=None, telephone=None,
+                 type=None, rating=None, cost=None):
+        self.id = id
+        self.name = name
+        self.address = address
+        self.telephone = telephone
+        self.type = sys.intern(type) if isinstance(type, str) else type
+        self.extras: Optional[Dict[str, Any]] = None
+        self._set_location(location)
+        self._set_rating(rating)
+        self._set_cost(cost)
+
+    @classmethod
+    def from_gaode(cls, raw: Dict[str, Any]) -> "Poi":
+        """由高德 place/text 返回的单个 POI 构建"""
+        biz_ext = raw.get("biz_ext") or {}
+        return cls(
+            id=raw.get("id") or None,
+            name=raw.get("name"),
+            address=raw.get("address"),
+            location=raw.get("location"),
+            telephone=raw.get("tel"),
+            type=raw.get("type"),
+            rating=biz_ext.get("rating"),
+            cost=biz_ext.get("cost"),
+        )
+
+    def _set_location(self, location: Any) -> None:
+        self.location = location
+        coord = parse_lnglat(location)
+        self.lng, self.lat = coord if coord else (None, None)
+
+    def _set_rating(self, rating: Any) -> None:
+        self.rating = rating
+        self.rating_value = _to_float(rating)
+
+    def _set_cost(self, cost: Any) -> None:
+        self.cost = cost
+        self.cost_value = _to_float(cost)
+
+    @property
+    def lnglat(self) -> Optional[Tuple[float, float]]:
+        """解析后的 (经度, 纬度)，坐标无效时为 None"""
+        return None if self.lng is None else (self.lng, self.lat)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        # 绕开 Mapping.get 的 try/except，筛选与距离计算中高频调用
+        if key in _FIELD_SET:
+            return getattr(self, key)
+        return self.extras.get(key, default) if self.extras else default
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _FIELD_SET:
+            return getattr(self, key)
+        if self.extras is None:
+            raise KeyError(key)
+        return self.extras[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key == "location":
+            self._set_location(value)
+        elif key == "rating":
+            self._set_rating(value)
+        elif key == "cost":
+            self._set_cost(value)
+        elif key == "type":
+            self.type = sys.intern(value) if isinstance(value, str) else value
+        elif key in _FIELD_SET:
+            setattr(self, key, value)
+        else:
+            if self.extras is None:
+                self.extras = {}
+            self.extras[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in _FIELD_SET:
+            raise KeyError(f"POI 固定字段不可删除: {key}")
+        if self.extras is None:
+            raise KeyError(key)
+        del self.extras[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from FIELDS
+        if self.extras:
+            yield from self.extras
+
+    def __len__(self) -> int:
+        return len(FIELDS) + (len(self.extras) if self.extras else 0)
+
+    def __repr__(self) -> str:
+        return f"Poi({self.to_dict()!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """序列化为原有的 JSON 结构"""
+        data = {
+            "id": self.id,
+            "name": self.name,
+            "address": self.address,
+            "location": self.location,
+            "telephone": self.telephone,
+            "type": self.type,
+            "rating": self.rating,
+            "cost": self.cost,
+        }
+        if self.extras:
+            data.update(self.extras)
+        return data
+
+
+def as_dict(poi: Dict[str, Any]) -> Dict[str, Any]:
+    """POI 的普通 dict 形式；Poi 走 to_dict 快速路径，dict 原样返回"""
+    return poi.to_dict() if isinstance(poi, Poi) else poi
+
+
+def poi_rating(poi: Dict[str, Any]) -> Optional[float]:
+    """POI 评分；Poi 直接取预解析值，普通 dict 现场解析"""
+    if isinstance(poi, Poi):
+        return poi.rating_value
+    return _to_float(poi.get("rating"))
+
+
+def poi_cost(poi: Dict[str, Any]) -> Optional[float]:
+    """POI 人均消费；Poi 直接取预解析值，普通 dict 现场解析"""
+    if isinstance(poi, Poi):
+        return poi.cost_value
+    return _to_float(poi.get("cost"))
+
+
+def poi_lnglat(poi: Dict[str, Any]) -> Optional[Tuple[float, float]]:
+    """POI 坐标 (经度, 纬度)；Poi 直接取预解析值，普通 dict 解析 location 字段"""
+    if isinstance(poi, Poi):
+        return poi.lnglat
+    return parse_lnglat(poi.get("location"))
+
+
+def poi_coords(pois: Iterable[Dict[str, Any]]) -> np.ndarray:
+    """POI 坐标数组，形状为 (n, 2)，无效坐标为 NaN（与 common.distance.parse_lnglats 一致）"""
+    coords = [poi_lnglat(poi) or (np.nan, np.nan) for poi in pois]
+    return np.array(coords, dtype=float).reshape(-1, 2)
@@ -0,0 +1,129 @@
+"""
+高德 POI 并发抓取引擎
+
+基于 httpx 异步客户端并发请求多页 POI：
+    - 所有页面请求经进程级令牌桶限流器（gaode.rate_limiter）发起，无需固定 sleep
+    - 每次请求从 key 池（gaode.key_pool）选取 key，配额耗尽的 key 自动剔除并换 key 重试
+    - 每页结果写入地理网格缓存（gaode.poi_cache），命中时不发起网络请求
+    - 某一页返回数量不足 offset 时，不再发起后续页，并取消仍在途的请求
+    - 同步调用方通过后台事件循环（common.aio）执行，可在任意线程（包括已有事件循环的线程）中调用
+"""
+import asyncio
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from common.aio import run_coroutine, shared_async_client
+from gaode.key_pool import gaode_key_pool
+from gaode.poi_cache import gaode_poi_cache
+from gaode.rate_limiter import gaode_rate_limiter
+
+
+GAODE_PLACE_AROUND_URL = "https://restapi.amap.com/v3/place/around"
+GAODE_PLACE_AROUND_ENDPOINT = "place/around"
+_REQUEST_TIMEOUT = 10.0
+
+
+async def _fetch_page(client: httpx.AsyncClient, params: Dict[str, Any], page: int,
+                      is_needed) -> Optional[List[Dict[str, Any]]]:
+    """
+    请求单页 POI；若该页已不需要（之前的页已是最后一页），则不再发起请求并返回 None
+
+    优先读取 POI 缓存；未命中时从 key 池中选取 key 请求，若该 key 配额耗尽被剔除，则换下一个 key 重试。
+    租用 key 与预约限流令牌之前先确认该页仍然需要；等待限流期间变为不需要或被取消时，撤销该 key 的当日用量，
+    只有真正发出的请求计入配额。
+    """
+    cached = gaode_poi_cache.get(params, page)
+    if cached is not None:
+        return cached
+
+    page_params = {k: v for k, v in params.items() if not k.startswith("_")}
+    page_params["page"] = str(page)
+
+    while True:
+        if not is_needed(page):
+            return None
+        with gaode_key_pool.lease(GAODE_PLACE_AROUND_ENDPOINT) as key:
+            sent = False
+            try:
+                await gaode_rate_limiter.acquire_async(GAODE_PLACE_AROUND_ENDPOINT, key)
+                if not is_needed(page):
+                    return None
+                page_params["key"] = key
+                sent = True
+                response = await client.get(GAODE_PLACE_AROUND_URL, params=page_params, timeout=_REQUEST_TIMEOUT)
+            finally:
+                if not sent:
+                    gaode_key_pool.refund(key, GAODE_PLACE_AROUND_ENDPOINT)
+            response.raise_for_status()
+            data = response.json()
+
+        if data.get("status") != "1":
+            error_info = data.get("info", "未知的高德API业务错误")
+            if gaode_key_pool.report_failure(key, GAODE_PLACE_AROUND_ENDPOINT, data.get("infocode"), error_info):
+                continue
+            raise ValueError(f"高德API业务错误: {error_info}")
+
+        pois = data.get("pois", [])
+        gaode_poi_cache.set(params, page, pois)
+        return pois
+
+
+async def afetch_poi_pages(params: Dict[str, Any], pages: int, offset: int,
+                           client: Optional[httpx.AsyncClient] = None) -> List[List[Dict[str, Any]]]:
+    """
+    并发抓取第 1..pages 页 POI
+
+    参数:
+        params: 不含 key、page 的高德 place/around 请求参数
+        pages: 最多抓取的页数
+        offset: 每页条数，某页返回不足 offset 条即视为最后一页
+        client: 可选的 httpx.AsyncClient，缺省时使用共享客户端
+
+    返回:
+        按页码顺序排列的原始 POI 列表（截止到最后一页）
+    """
+    client = client or shared_async_client()
+    params = gaode_poi_cache.prepare(params)
+    last_page = pages
+
+    def is_needed(page: int) -> bool:
+        return page <= last_page
+
+    tasks = {
+        asyncio.create_task(_fetch_page(client, params, page, is_needed)): page
+        for page in range(1, pages + 1)
+    }
+    results: Dict[int, List[Dict[str, Any]]] = {}
+    pending = set(tasks)
+
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                page = tasks[task]
+                if page > last_page:
+                    continue
+                raw_pois = task.result()
+                if raw_pois is None:
+                    continue
+                results[page] = raw_pois
+                if len(raw_pois) < offset and page < last_page:
+                    # 已到最后一页：取消之后页码的在途请求
+                    last_page = page
+                    for other in pending:
+                        if tasks[other] > last_page:
+                            other.cancel()
+    finally:
+        for task in pending:
+            task.cancel()
+        # 等待取消完成，并回收其余页面的异常，避免 "Task exception was never retrieved"
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    return [results[page] for page in sorted(results) if page <= last_page]
+
+
+def fetch_poi_pages(params: Dict[str, Any], pages: int, offset: int) -> List[List[Dict[str, Any]]]:
+    """afetch_poi_pages 的同步版本，在后台事件循环中执行"""
+    return run_coroutine(afetch_poi_pages(params, pages, offset))
+
@@ -0,0 +1,72 @@
+"""
+POI 坐标网格索引
+
+把 POI 坐标按边长不小于匹配半径的网格分桶，查询某个坐标半径内的 POI 时只需检查其所在网格及相邻的
+3×3 个网格，而不是遍历全部 POI。Poi 记录直接使用抓取时解析好的坐标，普通 dict 在建索引时解析一次。
+"""
+import math
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from common.distance import parse_lnglat
+from sub_agents.food_search.poi import poi_lnglat
+
+EARTH_RADIUS = 6371000  # 地球半径（米）
+# 与 haversine 使用同一地球半径，保证网格边长换算与距离计算一致
+METERS_PER_DEGREE_LAT = EARTH_RADIUS * math.pi / 180
+
+
+def haversine(lng1: float, lat1: float, lng2: float, lat2: float) -> float:
+    """两个经纬度坐标之间的 Haversine 距离（单位：米）"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = math.radians(lat2 - lat1)
+    dlambda = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return EARTH_RADIUS * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+class PoiGridIndex:
+    """
+    POI 网格索引
+
+    参数:
+        pois: POI 列表（Poi 或 dict），坐标取预解析值或 poi["location"]（"lng,lat"），无有效坐标的 POI 不入索引
+        radius: 查询半径（米），网格边长不小于该值
+    """
+
+    def __init__(self, pois: Iterable[Dict[str, Any]], radius: float = 100.0):
+        self.radius = radius
+        points = [(poi, poi_lnglat(poi)) for poi in pois]
+        points = [(poi, coord) for poi, coord in points if coord is not None]
+
+        # 经度方向的网格宽度按纬度最高处（再外扩一格，覆盖索引外的查询点）计算，
+        # 保证任意位置的网格东西向宽度都不小于 radius
+        self.cell_lat = radius / METERS_PER_DEGREE_LAT
+        max_lat = min(max((abs(lat) for _, (_, lat) in points), default=0.0) + self.cell_lat, 89.0)
+        self.cell_lng = radius / (METERS_PER_DEGREE_LAT * math.cos(math.radians(max_lat)))
+
+        self._cells: Dict[Tuple[int, int], List[Tuple[Dict[str, Any], float, float]]] = {}
+        for poi, (lng, lat) in points:
+            self._cells.setdefault(self._cell(lng, lat), []).append((poi, lng, lat))
+        self.size = len(points)
+
+    def _cell(self, lng: float, lat: float) -> Tuple[int, int]:
+        return math.floor(lng / self.cell_lng), math.floor(lat / self.cell_lat)
+
+    def nearby(self, lnglat: Optional[str]) -> List[Tuple[Dict[str, Any], float]]:
+        """坐标 radius 以内（不含边界）的 POI，返回 [(poi, 距离米), ...]"""
+        coord = parse_lnglat(lnglat)
+        if coord is None:
+            return []
+        return self.nearby_point(*coord)
+
+    def nearby_point(self, lng: float, lat: float) -> List[Tuple[Dict[str, Any], float]]:
+        """同 nearby，参数为已解析的经纬度"""
+        cx, cy = self._cell(lng, lat)
+        results = []
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for poi, poi_lng, poi_lat in self._cells.get((cx + dx, cy + dy), ()):
+                    distance = haversine(lng, lat, poi_lng, poi_lat)
+                    if distance < self.radius:
+                        results.append((poi, distance))
+        return results
@@ -0,0 +1,111 @@
+"""
+启发式意图判定
+
+搜索意图在多数情况下由结构直接决定，无需 LLM：
+    - location_count <= 1：没有沿途线索时只能是 single
+    - 命中且仅命中一类词汇线索（中间/之间 → 会面，沿途/路上 → 沿途，对比/分别 → 对比）
+其余情况（多地点但没有线索、多类线索冲突）返回 None，交给 LLM 判断。
+
+shadow 模式下规则只做判定不生效，与 LLM 结果对比后记录一致率，用于评估规则能否上线。
+"""
+import threading
+from typing import Any, Dict, NamedTuple, Optional
+
+
+MEETING_CUES = ("中间", "之间", "折中", "差不多远", "都方便", "等距", "公平")
+ALONG_ROUTE_CUES = ("沿途", "路上", "顺路", "途经", "经过")
+COMPARE_CUES = ("对比", "分别", "各自", "各去各的")
+
+SINGLE_CONFIDENCE = 0.95
+CUE_CONFIDENCE = 0.9
+
+
+class IntentDecision(NamedTuple):
+    """启发式判定结果"""
+
+    intent: str
+    search_mode: str
+    confidence: float
+    reason: str
+
+
+def decide_intent(query: str, location_count: int) -> Optional[IntentDecision]:
+    """
+    根据地点数量与词汇线索判定意图
+
+    返回:
+        IntentDecision；规则没有把握时返回 None
+    """
+    query = query or ""
+    cues = {
+        intent: next((cue for cue in words if cue in query), None)
+        for intent, words in (
+            ("equidistant_meeting", MEETING_CUES),
+            ("along_route", ALONG_ROUTE_CUES),
+            ("compare_locations", COMPARE_CUES),
+        )
+    }
+    matched = {intent: cue for intent, cue in cues.items() if cue}
+
+    if location_count <= 1:
+        # 单地点时只有"沿途"有意义，其余线索（如"两个商场之间"）不改变结论
+        if "along_route" in matched:
+            return IntentDecision("along_route", "along_route", CUE_CONFIDENCE,
+                                  f"单地点且包含沿途线索 \"{matched['along_route']}\"")
+        return IntentDecision("single_location", "single", SINGLE_CONFIDENCE, "只有一个地点")
+
+    if len(matched) != 1:
+        return None
+    intent, cue = next(iter(matched.items()))
+    search_mode = {"equidistant_meeting": "intersection", "along_route": "along_route",
+                   "compare_locations": "union"}[intent]
+    return IntentDecision(intent, search_mode, CUE_CONFIDENCE, f"{location_count} 个地点且包含线索 \"{cue}\"")
+
+
+class IntentHeuristicStats:
+    """进程级启发式意图统计：规则直接判定次数，以及 shadow 模式下与 LLM 的一致率"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.decided = 0
+        self.deferred = 0
+        self.shadow_compared = 0
+        self.shadow_agreed = 0
+        self.disagreements: Dict[str, int] = {}
+
+    def record_decision(self, decision: Optional[IntentDecision]) -> None:
+        with self._lock:
+            if decision is None:
+                self.deferred += 1
+            else:
+                self.decided += 1
+
+    def record_shadow(self, decision: Optional[IntentDecision], llm_intent: Optional[str]) -> None:
+        """记录 shadow 模式下规则判定与 LLM 判定的对比（规则弃权时不计入）"""
+        if decision is None:
+            return
+        with self._lock:
+            self.shadow_compared += 1
+            if decision.intent == llm_intent:
+                self.shadow_agreed += 1
+            else:
+                pair = f"{decision.intent}->{llm_intent}"
+                self.disagreements[pair] = self.disagreements.get(pair, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.decided + self.deferred
+            return {
+                "decided": self.decided,
+                "deferred": self.deferred,
+                "decided_rate": round(self.decided / total, 4) if total else 0.0,
+                "shadow_compared": self.shadow_compared,
+                "shadow_agreement_rate": (
+                    round(self.shadow_agreed / self.shadow_compared, 4) if self.shadow_compared else 0.0
+                ),
+                "disagreements": dict(self.disagreements),
+            }
+
+
+# 进程级共享统计
+intent_heuristic_stats = IntentHeuristicStats()
@@ -1,14 +1,17 @@
 import json
 from typing import List, Optional, TypedDict
 
-from langchain_openai import ChatOpenAI
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import END, StateGraph
 
-from config import ALIYUN_API_KEY, ALIYUN_BASE_URL, ALIYUN_MODEL
+from common.aio import run_coroutine
+from config import INTENT_HEURISTIC_MODE
+from llm import get_llm, llm_output_cache
 from prompt.intent_classifier import (
     INTENT_CLASSIFIER_SYSTEM_PROMPT,
     INTENT_CLASSIFIER_USER_PROMPT_TEMPLATE,
 )
+from sub_agents.intent_classifier.heuristics import decide_intent, intent_heuristic_stats
 
 INTENT_MODE_MAP = {
     "single_location": "single",
@@ -27,7 +30,7 @@ class IntentClassifierState(TypedDict):
     error_messages: List[str]
 
 
-def intent_classifier_node(state: IntentClassifierState) -> IntentClassifierState:
+async def aintent_classifier_node(state: IntentClassifierState) -> IntentClassifierState:
     """根据用户 query 和地点数量识别搜索意图并输出 search_mode"""
 
     print("--- [Agent] 进入 意图分类Agent ---")
@@ -43,12 +46,18 @@ def intent_classifier_node(state: IntentClassifierState) -> IntentClassifierStat
         state["error_messages"].append("输入错误：query 为空，默认 single")
         return state
 
-    llm = ChatOpenAI(
-        api_key=ALIYUN_API_KEY,
-        base_url=ALIYUN_BASE_URL,
-        model=ALIYUN_MODEL,
-        temperature=0,
-    )
+    # 启发式判定：结构上已确定的意图无需调用 LLM；shadow 模式只记录与 LLM 的对比
+    decision = decide_intent(query, location_count) if INTENT_HEURISTIC_MODE in ("on", "shadow") else None
+    if INTENT_HEURISTIC_MODE == "on":
+        intent_heuristic_stats.record_decision(decision)
+        if decision is not None:
+            state["intent"] = decision.intent
+            state["search_mode"] = decision.search_mode
+            state["confidence"] = decision.confidence
+            print(f"  < 规则判定意图: {decision.intent}, search_mode: {decision.search_mode} ({decision.reason})")
+            return state
+
+    llm = get_llm("intent_classifier")
 
     messages = [
         {"role": "system", "content": INTENT_CLASSIFIER_SYSTEM_PROMPT},
@@ -60,9 +69,7 @@ def intent_classifier_node(state: IntentClassifierState) -> IntentClassifierStat
 
     try:
         print(f"  > 正在分类意图: query={query[:50]}..., location_count={location_count}")
-        response = llm.invoke(messages)
-        response_text = response.content.strip()
-        result = json.loads(response_text)
+        result = await llm_output_cache.ainvoke("intent_classifier", llm, messages)
 
         intent = result.get("intent", "single_location")
         search_mode = result.get("search_mode") or INTENT_MODE_MAP.get(intent, "single")
@@ -80,6 +87,8 @@ def intent_classifier_node(state: IntentClassifierState) -> IntentClassifierStat
         state["search_mode"] = search_mode
         state["confidence"] = confidence
         print(f"  < 意图: {intent}, search_mode: {search_mode}, 置信度: {confidence}")
+        if INTENT_HEURISTIC_MODE == "shadow":
+            intent_heuristic_stats.record_shadow(decision, intent)
 
     except json.JSONDecodeError as exc:
         error_msg = f"意图分类JSON解析失败: {exc}"
@@ -99,8 +108,13 @@ def intent_classifier_node(state: IntentClassifierState) -> IntentClassifierStat
     return state
 
 
+def intent_classifier_node(state: IntentClassifierState) -> IntentClassifierState:
+    """aintent_classifier_node 的同步版本，在后台事件循环中执行"""
+    return run_coroutine(aintent_classifier_node(state))
+
+
 intent_classifier_builder = StateGraph(IntentClassifierState)
-intent_classifier_builder.add_node("classify", intent_classifier_node)
+intent_classifier_builder.add_node("classify", RunnableLambda(intent_classifier_node, afunc=aintent_classifier_node))
 intent_classifier_builder.set_entry_point("classify")
 intent_classifier_builder.add_edge("classify", END)
 intent_classifier_agent = intent_classifier_builder.compile()
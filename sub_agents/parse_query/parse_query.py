@@ -1,30 +1,32 @@
 import json
 import os
-from typing import List, Optional, TypedDict
+from typing import Dict, List, Optional, TypedDict
 
-import requests
-
-from langchain_openai import ChatOpenAI
+import httpx
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import END, StateGraph
 
-from config import ALIYUN_API_KEY, ALIYUN_BASE_URL, ALIYUN_MODEL, GAODE_API_KEY
+from common.aio import run_coroutine, shared_async_client
+
+from gaode.city_index import city_index
+from gaode.gazetteer import landmark_gazetteer
+from gaode.geocode_cache import gaode_geocode_cache
+from gaode.key_pool import gaode_key_pool, NoAvailableKeyError
+from gaode.rate_limiter import gaode_rate_limiter
+from llm import get_llm, llm_output_cache
 from prompt.parse_query import (
     PARSE_QUERY_SYSTEM_PROMPT,
     PARSE_QUERY_USER_PROMPT_TEMPLATE,
 )
 
 
+GAODE_GEOCODE_URL = "https://restapi.amap.com/v3/geocode/geo"
+GAODE_GEOCODE_ENDPOINT = "geocode/geo"
+GAODE_GEOCODE_BATCH_SIZE = 10  # batch=true 时单次最多 10 个地址
+
 DEFAULT_CITY = os.getenv("DEFAULT_CITY", "北京")
 DEFAULT_LOCATION = os.getenv("DEFAULT_LOCATION", "116.397128,39.916527")
 
-CITY_LOCATION_MAP = {
-    "北京": "116.397128,39.916527",
-    "上海": "121.473701,31.230416",
-    "广州": "113.264385,23.129112",
-    "深圳": "114.057868,22.543099",
-    "杭州": "120.15507,30.274085",
-}
-
 
 class ParseQueryState(TypedDict):
     """参数解析状态"""
@@ -41,7 +43,7 @@ class ParseQueryState(TypedDict):
     error_messages: List[str]
 
 
-def parse_query_node(state: ParseQueryState) -> ParseQueryState:
+async def aparse_query_node(state: ParseQueryState) -> ParseQueryState:
     """解析用户查询中的城市和多地点信息，缺失时回退到定位结果"""
 
     print("--- [Agent] 进入 参数解析Agent ---")
@@ -63,12 +65,7 @@ def parse_query_node(state: ParseQueryState) -> ParseQueryState:
         state["location_count"] = 0
         return state
 
-    llm = ChatOpenAI(
-        api_key=ALIYUN_API_KEY,
-        base_url=ALIYUN_BASE_URL,
-        model=ALIYUN_MODEL,
-        temperature=0,
-    )
+    llm = get_llm("parse_query")
 
     messages = [
         {"role": "system", "content": PARSE_QUERY_SYSTEM_PROMPT},
@@ -77,9 +74,7 @@ def parse_query_node(state: ParseQueryState) -> ParseQueryState:
 
     try:
         print(f"  > 正在解析 query: {query}")
-        response = llm.invoke(messages)
-        response_text = response.content.strip()
-        result = json.loads(response_text)
+        result = await llm_output_cache.ainvoke("parse_query", llm, messages)
 
         city = result.get("city")
         raw_locations = result.get("locations", [])
@@ -96,7 +91,7 @@ def parse_query_node(state: ParseQueryState) -> ParseQueryState:
             state["reason"] = reason or "来自用户 query 的明确城市"
             state["location_source"] = "query"
         else:
-            detected_city, detected_location = _detect_current_city_and_location()
+            detected_city, detected_location = detect_current_city_and_location()
             if detected_city:
                 print(f"  < 未识别城市，使用定位结果: {detected_city}")
                 state["city"] = detected_city
@@ -118,42 +113,11 @@ def parse_query_node(state: ParseQueryState) -> ParseQueryState:
                 return state
 
         resolved_city = state.get("city", "")
-
-        # 对每个地点独立调用高德地理编码
-        resolved_locations = []
-        geocode_failures = 0
-        for loc in raw_locations:
-            name = loc.get("name", loc.get("location_text", ""))
-            loc_text = loc.get("location_text", "")
-            search_text = loc_text or name
-            lnglat = _geocode_location(search_text, resolved_city)
-
-            if lnglat:
-                resolved_locations.append({"name": name, "lnglat": lnglat})
-                print(f"  < 地点 '{name}': {lnglat}")
-            else:
-                resolved_locations.append({"name": name, "lnglat": None})
-                geocode_failures += 1
-                error_msg = f"地点 '{name}' 地理编码失败"
-                state["error_messages"].append(error_msg)
-                print(f"  < {error_msg}")
-
+        resolved_locations = await aresolve_locations(raw_locations, resolved_city, state["error_messages"])
         state["locations"] = resolved_locations
         state["location_count"] = len(resolved_locations)
-
         # 向后兼容：设置 location 和 location_text 为第一个有效地点
-        if resolved_locations:
-            first_valid = next((loc for loc in resolved_locations if loc["lnglat"]), resolved_locations[0])
-            state["location"] = first_valid.get("lnglat")
-            state["location_text"] = first_valid.get("name")
-            # 如果第一个地点 geocode 失败，尝试 fallback
-            if state["location"] is None:
-                fallback_lnglat = _fallback_location(resolved_city)
-                state["location"] = fallback_lnglat
-        else:
-            fallback_lnglat = _fallback_location(resolved_city)
-            state["location"] = fallback_lnglat
-            state["location_text"] = resolved_city
+        state["location"], state["location_text"] = primary_location(resolved_locations, resolved_city)
 
     except json.JSONDecodeError as exc:
         error_msg = f"JSON解析失败: {exc}"
@@ -167,52 +131,223 @@ def parse_query_node(state: ParseQueryState) -> ParseQueryState:
     return state
 
 
-def _geocode_location(location_text: Optional[str], city: Optional[str]) -> Optional[str]:
+def parse_query_node(state: ParseQueryState) -> ParseQueryState:
+    """aparse_query_node 的同步版本，在后台事件循环中执行"""
+    return run_coroutine(aparse_query_node(state))
+
+
+async def aresolve_locations(raw_locations: List[dict], city: Optional[str],
+                             error_messages: List[str]) -> List[dict]:
+    """
+    将 LLM 提取的地点解析为经纬度
+
+    先查询离线地标库，未收录的地点再合并为一次批量地理编码；地理编码精确到兴趣点/道路级别的地点写入地标库。
+
+    返回:
+        [{"name": ..., "lnglat": ...}]，与 raw_locations 一一对应，失败的地点 lnglat 为 None
+    """
+    search_texts = []
+    for loc in raw_locations:
+        name = loc.get("name", loc.get("location_text", ""))
+        search_texts.append(loc.get("location_text", "") or name)
+    lnglats = [_resolve_offline(text, city) for text in search_texts]
+    pending = [i for i, lnglat in enumerate(lnglats) if not lnglat]
+    if pending:
+        levels: Dict[str, str] = {}
+        geocoded = await _ageocode_locations([search_texts[i] for i in pending], city, levels)
+        for i, lnglat in zip(pending, geocoded):
+            lnglats[i] = lnglat
+            landmark_gazetteer.learn(search_texts[i], city, lnglat, levels.get(search_texts[i]))
+
+    resolved_locations = []
+    for loc, lnglat in zip(raw_locations, lnglats):
+        name = loc.get("name", loc.get("location_text", ""))
+
+        if lnglat:
+            resolved_locations.append({"name": name, "lnglat": lnglat})
+            print(f"  < 地点 '{name}': {lnglat}")
+        else:
+            resolved_locations.append({"name": name, "lnglat": None})
+            error_msg = f"地点 '{name}' 地理编码失败"
+            error_messages.append(error_msg)
+            print(f"  < {error_msg}")
+    return resolved_locations
+
+
+def primary_location(resolved_locations: List[dict], city: Optional[str]) -> (Optional[str], Optional[str]):
+    """返回第一个有效地点的 (经纬度, 名称)；均无效时回退到城市中心点"""
+    if not resolved_locations:
+        return _fallback_location(city), city
+    first_valid = next((loc for loc in resolved_locations if loc["lnglat"]), resolved_locations[0])
+    return first_valid.get("lnglat") or _fallback_location(city), first_valid.get("name")
+
+
+async def _arequest_geocode(params: dict) -> Optional[dict]:
+    """
+    调用高德地理编码接口（经 key 池与限流器）
+
+    返回:
+        status 为 "1" 的响应数据；高德业务错误时返回 None
+    """
+    params = dict(params)
+    while True:
+        with gaode_key_pool.lease(GAODE_GEOCODE_ENDPOINT) as key:
+            await gaode_rate_limiter.acquire_async(GAODE_GEOCODE_ENDPOINT, key)
+            params["key"] = key
+            response = await shared_async_client().get(GAODE_GEOCODE_URL, params=params, timeout=5)
+            response.raise_for_status()
+            data = response.json()
+        if data.get("status") == "1":
+            return data
+        info = data.get("info", "未知地理编码错误")
+        if gaode_key_pool.report_failure(key, GAODE_GEOCODE_ENDPOINT, data.get("infocode"), info):
+            continue
+        print(f"  < 地理编码失败: {info}")
+        return None
+
+
+def _extract_lnglat(geocode: dict) -> Optional[str]:
+    # 批量模式下解析失败的地址各字段为空列表
+    location = geocode.get("location")
+    return location if isinstance(location, str) and location else None
+
+
+def _record_level(levels: Optional[Dict[str, str]], text: str, geocode: dict) -> None:
+    """记录地理编码结果的匹配级别（省/市/区县/兴趣点……），供地标库判断是否学习"""
+    level = geocode.get("level")
+    if levels is not None and isinstance(level, str) and level:
+        levels[text] = level
+
+
+async def _ageocode_location(location_text: Optional[str], city: Optional[str],
+                             levels: Optional[Dict[str, str]] = None) -> Optional[str]:
+    """
+    单个地址地理编码
+
+    参数:
+        levels: 可选，网络请求成功时写入 {地址: 高德匹配级别}；缓存命中的结果没有级别信息
+    """
     if not location_text:
         return None
-    if not GAODE_API_KEY:
+    hit, cached_lnglat = gaode_geocode_cache.get(location_text, city)
+    if hit:
+        return cached_lnglat
+    if not gaode_key_pool.has_keys():
         return None
     params = {
-        "key": GAODE_API_KEY,
         "address": location_text,
     }
     if city:
         params["city"] = city
     try:
-        response = requests.get("https://restapi.amap.com/v3/geocode/geo", params=params, timeout=5)
-        response.raise_for_status()
-        data = response.json()
-        if data.get("status") != "1":
-            info = data.get("info", "未知地理编码错误")
-            print(f"  < 地理编码失败: {info}")
-            return None
-        geocodes = data.get("geocodes", [])
-        if not geocodes:
-            return None
-        return geocodes[0].get("location")
-    except requests.RequestException as exc:
+        data = await _arequest_geocode(params)
+        geocodes = data.get("geocodes", []) if data else []
+        lnglat = _extract_lnglat(geocodes[0]) if geocodes else None
+        if lnglat:
+            _record_level(levels, location_text, geocodes[0])
+        # 无结果、业务错误写入负缓存；网络错误与 key 不可用属于临时故障，不缓存
+        gaode_geocode_cache.set(location_text, city, lnglat)
+        return lnglat
+    except NoAvailableKeyError as exc:
+        print(f"  < 地理编码失败: {exc}")
+        return None
+    except httpx.HTTPError as exc:
         print(f"  < 地理编码请求失败: {exc}")
         return None
 
 
+async def _ageocode_locations(location_texts: List[str], city: Optional[str],
+                              levels: Optional[Dict[str, str]] = None) -> List[Optional[str]]:
+    """
+    批量地理编码：缓存未命中的地址合并为一次 batch=true 请求（每批最多 10 个）
+
+    参数:
+        levels: 可选，写入 {地址: 高德匹配级别}，见 _ageocode_location
+
+    返回:
+        与 location_texts 一一对应的经纬度列表，失败的地址为 None
+    """
+    results: List[Optional[str]] = [None] * len(location_texts)
+    missing: List[str] = []
+    for i, text in enumerate(location_texts):
+        if not text:
+            continue
+        hit, cached_lnglat = gaode_geocode_cache.get(text, city)
+        if hit:
+            results[i] = cached_lnglat
+        elif text not in missing:
+            missing.append(text)
+
+    if not missing or not gaode_key_pool.has_keys():
+        return results
+
+    resolved = {}
+    for start in range(0, len(missing), GAODE_GEOCODE_BATCH_SIZE):
+        chunk = missing[start:start + GAODE_GEOCODE_BATCH_SIZE]
+        if len(chunk) == 1:
+            resolved[chunk[0]] = await _ageocode_location(chunk[0], city, levels)
+            continue
+        params = {
+            "address": "|".join(text.replace("|", " ") for text in chunk),
+            "batch": "true",
+        }
+        if city:
+            params["city"] = city
+        try:
+            data = await _arequest_geocode(params)
+        except NoAvailableKeyError as exc:
+            print(f"  < 批量地理编码失败: {exc}")
+            continue
+        except httpx.HTTPError as exc:
+            print(f"  < 批量地理编码请求失败: {exc}")
+            continue
+
+        geocodes = data.get("geocodes", []) if data else []
+        if len(geocodes) != len(chunk):
+            # 整批失败或结果数量对不上时，逐个地址重试以定位失败项
+            for text in chunk:
+                resolved[text] = await _ageocode_location(text, city, levels)
+            continue
+        for text, geocode in zip(chunk, geocodes):
+            lnglat = _extract_lnglat(geocode)
+            if lnglat:
+                _record_level(levels, text, geocode)
+            gaode_geocode_cache.set(text, city, lnglat)
+            resolved[text] = lnglat
+
+    for i, text in enumerate(location_texts):
+        if text in resolved:
+            results[i] = resolved[text]
+    return results
+
+
+def _resolve_offline(location_text: Optional[str], city: Optional[str]) -> Optional[str]:
+    """地标库命中，或地点本身就是当前城市名时，无需地理编码即可得到坐标"""
+    lnglat = landmark_gazetteer.lookup(location_text, city)
+    if lnglat:
+        return lnglat
+    info = city_index.get(location_text)
+    if info is not None and info == city_index.get(city):
+        return info.lnglat
+    return None
+
+
 def _fallback_location(city: Optional[str]) -> Optional[str]:
-    if city and city in CITY_LOCATION_MAP:
-        return CITY_LOCATION_MAP[city]
-    return DEFAULT_LOCATION
+    return city_index.lnglat(city) or DEFAULT_LOCATION
 
 
-def _detect_current_city_and_location() -> (Optional[str], Optional[str]):
+def detect_current_city_and_location() -> (Optional[str], Optional[str]):
     city = os.getenv("DEFAULT_CITY") or DEFAULT_CITY
     location = os.getenv("DEFAULT_LOCATION")
     if not location:
-        location = CITY_LOCATION_MAP.get(city)
+        location = city_index.lnglat(city)
     if not location:
         location = DEFAULT_LOCATION
     return city, location
 
 
 parse_query_builder = StateGraph(ParseQueryState)
-parse_query_builder.add_node("parse_query", parse_query_node)
+parse_query_builder.add_node("parse_query", RunnableLambda(parse_query_node, afunc=aparse_query_node))
 parse_query_builder.set_entry_point("parse_query")
 parse_query_builder.add_edge("parse_query", END)
 parse_query_agent = parse_query_builder.compile()
@@ -2,6 +2,7 @@ from .scenario_classifier import (
     ScenarioClassifierState,
     scenario_classifier_node,
     scenario_classifier_agent,
+    match_scenario,
     TAXONOMY_MAP
 )
 
@@ -9,5 +10,6 @@ __all__ = [
     "ScenarioClassifierState",
     "scenario_classifier_node",
     "scenario_classifier_agent",
+    "match_scenario",
     "TAXONOMY_MAP"
 ]
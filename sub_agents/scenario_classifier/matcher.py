@@ -0,0 +1,189 @@
+"""
+本地场景匹配器
+
+以 restaurant_taxonomy.json 中的中类、小类名称及同义词表为模式串构建 Aho-Corasick 自动机，
+一次线性扫描即可找出 query 中出现的全部菜系/餐厅类型词，"想吃川菜"、"吃火锅" 等常见查询
+无需调用 LLM 即可得到 scenario 与 types。
+
+多个词同时命中时取最长的词，长度相同取最先出现的词。
+"""
+import re
+from collections import deque
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+
+# 本地匹配的置信度：命中的是明确的菜系/品类名称
+LOCAL_MATCH_CONFIDENCE = 0.9
+
+# 映射表名称拆分后过于宽泛的片段，不作为模式串
+_GENERIC_TERMS = {"餐饮相关场所", "餐饮相关", "特色", "地方风味", "综合风味"}
+
+# 同义词 -> 映射表键（中类-小类）
+SCENARIO_SYNONYMS: Dict[str, str] = {
+    "中餐": "中餐厅-中餐厅",
+    "酒楼": "中餐厅-综合酒楼",
+    "川菜": "中餐厅-四川菜(川菜)",
+    "粤菜": "中餐厅-广东菜(粤菜)",
+    "早茶": "中餐厅-广东菜(粤菜)",
+    "鲁菜": "中餐厅-山东菜(鲁菜)",
+    "苏菜": "中餐厅-江苏菜",
+    "淮扬菜": "中餐厅-江苏菜",
+    "浙菜": "中餐厅-浙江菜",
+    "杭帮菜": "中餐厅-浙江菜",
+    "本帮菜": "中餐厅-上海菜",
+    "湘菜": "中餐厅-湖南菜(湘菜)",
+    "徽菜": "中餐厅-安徽菜(徽菜)",
+    "闽菜": "中餐厅-福建菜",
+    "京菜": "中餐厅-北京菜",
+    "烤鸭": "中餐厅-北京菜",
+    "鄂菜": "中餐厅-湖北菜(鄂菜)",
+    "云南菜": "中餐厅-云贵菜",
+    "贵州菜": "中餐厅-云贵菜",
+    "新疆菜": "中餐厅-西北菜",
+    "火锅": "中餐厅-火锅店",
+    "涮肉": "中餐厅-火锅店",
+    "涮锅": "中餐厅-火锅店",
+    "串串": "中餐厅-火锅店",
+    "海鲜": "中餐厅-海鲜酒楼",
+    "素食": "中餐厅-中式素菜馆",
+    "素菜": "中餐厅-中式素菜馆",
+    "清真": "中餐厅-清真菜馆",
+    "潮汕菜": "中餐厅-潮州菜",
+    "西餐": "外国餐厅-西餐厅(综合风味)",
+    "日料": "外国餐厅-日本料理",
+    "日本菜": "外国餐厅-日本料理",
+    "寿司": "外国餐厅-日本料理",
+    "刺身": "外国餐厅-日本料理",
+    "韩料": "外国餐厅-韩国料理",
+    "韩国菜": "外国餐厅-韩国料理",
+    "韩式烤肉": "外国餐厅-韩国料理",
+    "法餐": "外国餐厅-法式菜品餐厅",
+    "法国菜": "外国餐厅-法式菜品餐厅",
+    "意大利菜": "外国餐厅-意式菜品餐厅",
+    "意餐": "外国餐厅-意式菜品餐厅",
+    "披萨": "外国餐厅-意式菜品餐厅",
+    "意面": "外国餐厅-意式菜品餐厅",
+    "泰国菜": "外国餐厅-泰国/越南菜品餐厅",
+    "泰餐": "外国餐厅-泰国/越南菜品餐厅",
+    "越南菜": "外国餐厅-泰国/越南菜品餐厅",
+    "越南粉": "外国餐厅-泰国/越南菜品餐厅",
+    "汉堡": "外国餐厅-美式风味",
+    "印度菜": "外国餐厅-印度风味",
+    "牛排": "外国餐厅-牛扒店(扒房)",
+    "俄餐": "外国餐厅-俄国菜",
+    "俄罗斯菜": "外国餐厅-俄国菜",
+    "葡萄牙菜": "外国餐厅-葡国菜",
+    "巴西烤肉": "外国餐厅-巴西菜",
+    "东南亚菜": "外国餐厅-其它亚洲菜",
+    "快餐": "快餐厅-快餐厅",
+    "kfc": "快餐厅-肯德基",
+    "星巴克": "咖啡厅-星巴克咖啡",
+    "咖啡": "咖啡厅-咖啡厅",
+    "茶馆": "茶艺馆-茶艺馆",
+    "喝茶": "茶艺馆-茶艺馆",
+    "冷饮": "冷饮店-冷饮店",
+    "奶茶": "冷饮店-冷饮店",
+    "蛋糕": "糕饼店-糕饼店",
+    "面包": "糕饼店-糕饼店",
+    "烘焙": "糕饼店-糕饼店",
+    "甜品": "甜品店-甜品店",
+    "甜点": "甜品店-甜品店",
+}
+
+
+class ScenarioMatch(NamedTuple):
+    """本地匹配结果"""
+
+    scenario: str  # 映射表键（中类-小类）
+    types: str  # 高德API type
+    term: str  # 命中的词
+    confidence: float
+
+
+class AhoCorasick:
+    """多模式串匹配自动机，payload 为模式串对应的值"""
+
+    def __init__(self, patterns: Dict[str, Any]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[str, Any]]] = [[]]
+
+        for pattern, payload in patterns.items():
+            state = 0
+            for ch in pattern:
+                next_state = self._goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][ch] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append((pattern, payload))
+
+        # 按 BFS 顺序构建失配指针，并把失配状态的输出合并进来
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(ch, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find_all(self, text: str) -> List[Tuple[int, str, Any]]:
+        """返回 [(起始位置, 模式串, payload), ...]"""
+        hits = []
+        state = 0
+        for index, ch in enumerate(text):
+            while state and ch not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(ch, 0)
+            for pattern, payload in self._output[state]:
+                hits.append((index - len(pattern) + 1, pattern, payload))
+        return hits
+
+
+def _taxonomy_terms(value: Dict[str, Any]) -> List[str]:
+    """映射表条目的匹配词，如 "中餐厅-四川菜(川菜)" -> 中餐厅、四川菜(川菜)、四川菜、川菜"""
+    terms = []
+    for name in (value.get("medium_category"), value.get("small_category")):
+        if not name:
+            continue
+        terms.append(name)
+        terms.extend(part.strip() for part in re.split(r"[()（）/]", name))
+    return [term.lower() for term in terms if len(term) >= 2 and term not in _GENERIC_TERMS]
+
+
+class ScenarioMatcher:
+    """
+    基于高德映射表与同义词表的场景匹配器
+
+    参数:
+        taxonomy_map: 高德POI映射表，格式同 TAXONOMY_MAP
+        synonyms: 同义词 -> 映射表键，映射表中不存在的键会被忽略
+    """
+
+    def __init__(self, taxonomy_map: Dict[str, Dict[str, Any]], synonyms: Optional[Dict[str, str]] = None):
+        self.taxonomy_map = taxonomy_map
+        patterns: Dict[str, str] = {}
+        # 中类名称（如 "中餐厅"）同时出现在多个条目中，取与之同名的小类条目
+        for key, value in taxonomy_map.items():
+            for term in _taxonomy_terms(value):
+                if term not in patterns or value.get("small_category") == value.get("medium_category"):
+                    patterns[term] = key
+        for term, key in (synonyms or {}).items():
+            if key in taxonomy_map:
+                patterns[term.lower()] = key
+        self.size = len(patterns)
+        self._automaton = AhoCorasick(patterns)
+
+    def match(self, query: str) -> Optional[ScenarioMatch]:
+        """在 query 中查找菜系/餐厅类型词，未命中返回 None"""
+        hits = self._automaton.find_all((query or "").lower())
+        if not hits:
+            return None
+        start, term, key = min(hits, key=lambda hit: (-len(hit[1]), hit[0]))
+        return ScenarioMatch(key, self.taxonomy_map[key].get("type"), term, LOCAL_MATCH_CONFIDENCE)
@@ -1,14 +1,17 @@
 import os
 import json
 from typing import TypedDict, Dict, Any, List, Optional
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, END
-from langchain_openai import ChatOpenAI
 
-from config import ALIYUN_API_KEY, ALIYUN_BASE_URL, ALIYUN_MODEL
+from common.aio import run_coroutine
+from llm import get_llm, llm_output_cache
 from prompt.scenario_classifier import (
     SCENARIO_CLASSIFIER_SYSTEM_PROMPT,
     SCENARIO_CLASSIFIER_USER_PROMPT_TEMPLATE,
 )
+from sub_agents.scenario_classifier.matcher import SCENARIO_SYNONYMS, ScenarioMatch, ScenarioMatcher
+from sub_agents.scenario_classifier.taxonomy_index import TaxonomyIndex
 
 
 # 加载高德POI映射表
@@ -38,6 +41,10 @@ def _load_taxonomy_map() -> Dict[str, Dict[str, Any]]:
 
 # 全局映射表
 TAXONOMY_MAP = _load_taxonomy_map()
+# 映射表索引：场景名称到高德 type 的查找
+taxonomy_index = TaxonomyIndex(TAXONOMY_MAP)
+# 基于映射表与同义词表的本地场景匹配器
+scenario_matcher = ScenarioMatcher(TAXONOMY_MAP, SCENARIO_SYNONYMS)
 
 
 class ScenarioClassifierState(TypedDict):
@@ -49,9 +56,9 @@ class ScenarioClassifierState(TypedDict):
     error_messages: List[str]  # 错误信息
 
 
-def scenario_classifier_node(state: ScenarioClassifierState) -> ScenarioClassifierState:
+async def ascenario_classifier_node(state: ScenarioClassifierState) -> ScenarioClassifierState:
     """
-    情景分类节点：使用LLM识别用户查询中的场景信息
+    情景分类节点：先用本地匹配器识别菜系/餐厅类型词，未命中时再使用LLM识别场景信息
     
     职责:
         1. 从用户查询中识别场景（如：聚餐、约会、商务等）
@@ -65,7 +72,7 @@ def scenario_classifier_node(state: ScenarioClassifierState) -> ScenarioClassifi
     输出:
         state: ScenarioClassifierState
             - scenario: 识别到的场景
-            - restaurant_type: 映射后的高德API type值
+            - types: 映射后的高德API type值
             - confidence: 置信度
             - error_messages: 错误信息（如果有）
     """
@@ -78,14 +85,18 @@ def scenario_classifier_node(state: ScenarioClassifierState) -> ScenarioClassifi
         print(f"  < {error_msg}")
         state['error_messages'].append(error_msg)
         return state
+
+    # 本地匹配：查询中直接出现菜系/餐厅类型词时无需调用LLM
+    match = match_scenario(query)
+    if match is not None:
+        print(f"  < 本地匹配到场景: {match.scenario} (命中词: {match.term})，高德API type: {match.types}")
+        state['scenario'] = match.scenario
+        state['types'] = match.types
+        state['confidence'] = match.confidence
+        return state
     
     # 初始化LLM
-    llm = ChatOpenAI(
-        api_key=ALIYUN_API_KEY,
-        base_url=ALIYUN_BASE_URL,
-        model=ALIYUN_MODEL,
-        temperature=0
-    )
+    llm = get_llm("scenario_classifier")
     
     # 构建提示词
     system_prompt = SCENARIO_CLASSIFIER_SYSTEM_PROMPT
@@ -99,11 +110,8 @@ def scenario_classifier_node(state: ScenarioClassifierState) -> ScenarioClassifi
             {"role": "user", "content": user_prompt}
         ]
         
-        response = llm.invoke(messages)
-        response_text = response.content.strip()
-        
-        # 解析JSON响应
-        result = json.loads(response_text)
+        # 调用LLM并解析JSON响应（相同输入命中输出缓存）
+        result = await llm_output_cache.ainvoke("scenario_classifier", llm, messages)
 
         scenario = result.get("scenario")
         confidence = result.get("confidence", 0.0)
@@ -139,6 +147,24 @@ def scenario_classifier_node(state: ScenarioClassifierState) -> ScenarioClassifi
     return state
 
 
+def scenario_classifier_node(state: ScenarioClassifierState) -> ScenarioClassifierState:
+    """ascenario_classifier_node 的同步版本，在后台事件循环中执行"""
+    return run_coroutine(ascenario_classifier_node(state))
+
+
+def match_scenario(query: str) -> Optional[ScenarioMatch]:
+    """
+    用本地匹配器在 query 中查找菜系/餐厅类型词
+
+    映射表被整体替换（重新加载或测试中 patch）时重建匹配器，与 _get_restaurant_type_from_scenario 保持一致。
+    """
+    global scenario_matcher
+
+    if scenario_matcher.taxonomy_map is not TAXONOMY_MAP:
+        scenario_matcher = ScenarioMatcher(TAXONOMY_MAP, SCENARIO_SYNONYMS)
+    return scenario_matcher.match(query)
+
+
 def _get_restaurant_type_from_scenario(scenario: str) -> Optional[str]:
     """
     根据识别的场景从映射表中查询对应的高德API type
@@ -149,52 +175,20 @@ def _get_restaurant_type_from_scenario(scenario: str) -> Optional[str]:
     返回:
         高德API的type值，如果未找到则返回None
     """
+    global taxonomy_index
+
     if not scenario or not TAXONOMY_MAP:
-        print(f"  [DEBUG] scenario 为空或 TAXONOMY_MAP 未加载")
         return None
 
-    scenario = scenario.strip()
-    print(f"  [DEBUG] 尝试匹配 scenario: '{scenario}'")
-    print(f"  [DEBUG] TAXONOMY_MAP 大小: {len(TAXONOMY_MAP)}")
-
-    # 方式1：精确匹配（中类-小类 格式）
-    if scenario in TAXONOMY_MAP:
-        result = TAXONOMY_MAP[scenario].get("type")
-        print(f"  [DEBUG] 方式1精确匹配成功: {result}")
-        return result
-
-    print(f"  [DEBUG] 方式1匹配失败，尝试方式2...")
-
-    # 方式2：精确匹配中类或小类
-    for key, value in TAXONOMY_MAP.items():
-        medium = value.get("medium_category", "")
-        small = value.get("small_category", "")
-
-        if scenario == medium or scenario == small:
-            result = value.get("type")
-            print(f"  [DEBUG] 方式2匹配成功 (key={key}): {result}")
-            return result
-
-    print(f"  [DEBUG] 方式2匹配失败，尝试方式3...")
-
-    # 方式3：模糊匹配（包含关系）- 处理部分匹配的情况
-    for key, value in TAXONOMY_MAP.items():
-        medium = value.get("medium_category", "")
-        small = value.get("small_category", "")
-
-        # 如果scenario包含在中类或小类中，或反过来
-        if scenario in medium or scenario in small or medium in scenario or small in scenario:
-            result = value.get("type")
-            print(f"  [DEBUG] 方式3模糊匹配成功 (key={key}): {result}")
-            return result
-
-    print(f"  [DEBUG] 所有方式均匹配失败")
-    return None
+    # 映射表被整体替换时重建索引
+    if taxonomy_index.taxonomy_map is not TAXONOMY_MAP:
+        taxonomy_index = TaxonomyIndex(TAXONOMY_MAP)
+    return taxonomy_index.lookup(scenario.strip())
 
 
 # 构建情景分类Agent
 scenario_classifier_builder = StateGraph(ScenarioClassifierState)
-scenario_classifier_builder.add_node("classifier", scenario_classifier_node)
+scenario_classifier_builder.add_node("classifier", RunnableLambda(scenario_classifier_node, afunc=ascenario_classifier_node))
 scenario_classifier_builder.set_entry_point("classifier")
 scenario_classifier_builder.add_edge("classifier", END)
 scenario_classifier_agent = scenario_classifier_builder.compile()
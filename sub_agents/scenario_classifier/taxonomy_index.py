@@ -0,0 +1,89 @@
+"""
+高德映射表索引
+
+加载映射表时一次性构建，查询时不再线性扫描 TAXONOMY_MAP：
+    - 精确匹配：映射表键、中类名称、小类名称三张哈希表
+    - 模糊匹配：名称的 bigram 倒排索引，先求候选条目，再校验包含关系（scenario 包含名称或名称包含 scenario）
+
+匹配优先级与原线性扫描一致：映射表键 > 中类/小类名称 > 包含关系。
+包含关系有多个候选时按"匹配的字数多 > 名称与 scenario 长度差小 > 映射表顺序"排序，结果确定。
+"""
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+def _ngrams(text: str) -> Set[str]:
+    """bigram 集合；单字文本返回其本身"""
+    if len(text) < 2:
+        return {text} if text else set()
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+class TaxonomyIndex:
+    """
+    映射表索引
+
+    参数:
+        taxonomy_map: 高德POI映射表，格式为 {key: {"medium_category": str, "small_category": str, "type": str}}
+        cache_size: 查询结果缓存条目数
+    """
+
+    def __init__(self, taxonomy_map: Dict[str, Dict[str, Any]], cache_size: int = 1024):
+        self.taxonomy_map = taxonomy_map
+        self._types: Dict[str, Optional[str]] = {}
+        self._names: Dict[str, Optional[str]] = {}
+        # (名称, 映射表顺序, type)
+        self._entries: List[Tuple[str, int, Optional[str]]] = []
+        self._postings: Dict[str, Set[int]] = {}
+        self._unigrams: Dict[str, Set[int]] = {}
+
+        for order, (key, value) in enumerate(taxonomy_map.items()):
+            amap_type = value.get("type")
+            self._types[key] = amap_type
+            for name in (value.get("medium_category"), value.get("small_category")):
+                if not name:
+                    continue
+                # 同名的中类/小类出现在多个条目中时，取映射表中最先出现的条目
+                self._names.setdefault(name, amap_type)
+                entry_id = len(self._entries)
+                self._entries.append((name, order, amap_type))
+                for gram in _ngrams(name):
+                    self._postings.setdefault(gram, set()).add(entry_id)
+                for ch in name:
+                    self._unigrams.setdefault(ch, set()).add(entry_id)
+
+        self.lookup = lru_cache(maxsize=cache_size)(self._lookup)
+
+    def _candidates(self, scenario: str) -> Set[int]:
+        """与 scenario 可能存在包含关系的条目"""
+        if len(scenario) == 1:
+            return set(self._unigrams.get(scenario, ()))
+        candidates: Set[int] = set()
+        for gram in _ngrams(scenario):
+            candidates |= self._postings.get(gram, set())
+        # 单字名称不在 bigram 倒排中，且可能被 scenario 包含
+        for ch in set(scenario):
+            candidates |= {entry_id for entry_id in self._unigrams.get(ch, ())
+                           if len(self._entries[entry_id][0]) == 1}
+        return candidates
+
+    def _lookup(self, scenario: str) -> Optional[str]:
+        if scenario in self._types:
+            return self._types[scenario]
+        if scenario in self._names:
+            return self._names[scenario]
+
+        best: Optional[Tuple[int, int, int]] = None
+        best_type: Optional[str] = None
+        for entry_id in self._candidates(scenario):
+            name, order, amap_type = self._entries[entry_id]
+            if scenario in name:
+                matched = len(scenario)
+            elif name in scenario:
+                matched = len(name)
+            else:
+                continue
+            rank = (-matched, abs(len(name) - len(scenario)), order)
+            if best is None or rank < best:
+                best, best_type = rank, amap_type
+        return best_type
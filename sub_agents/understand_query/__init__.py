@@ -0,0 +1 @@
+from .understand_query import understand_query_agent, UnderstandQueryState
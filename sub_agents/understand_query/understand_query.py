@@ -0,0 +1,140 @@
+"""
+查询理解 Agent
+
+一次 LLM 调用同时输出城市/地点、搜索意图、用餐场景和筛选条件，
+替代 parse_query、intent_classifier、scenario_classifier、filter_criteria 四次独立调用。
+地点解析、意图回退、场景到 type 的映射沿用各子 Agent 的规则，输出字段与之保持一致。
+"""
+import json
+from typing import Any, Dict, List, Optional, TypedDict
+
+from langchain_core.runnables import RunnableLambda
+from langgraph.graph import END, StateGraph
+
+from common.aio import run_coroutine
+from llm import get_llm, llm_output_cache
+from prompt.understand_query import (
+    UNDERSTAND_QUERY_SYSTEM_PROMPT,
+    UNDERSTAND_QUERY_USER_PROMPT_TEMPLATE,
+)
+from sub_agents.intent_classifier.intent_classifier import INTENT_MODE_MAP
+from sub_agents.parse_query.parse_query import (
+    aresolve_locations,
+    detect_current_city_and_location,
+    primary_location,
+)
+from sub_agents.scenario_classifier.scenario_classifier import _get_restaurant_type_from_scenario
+
+
+class UnderstandQueryState(TypedDict):
+    """查询理解状态"""
+
+    query: str
+    city: Optional[str]
+    location: Optional[str]
+    locations: List[dict]
+    location_count: int
+    intent: Optional[str]
+    search_mode: Optional[str]
+    scenario: Optional[str]
+    types: Optional[str]
+    filters: Optional[Dict[str, Any]]
+    confidence: Optional[float]
+    error_messages: List[str]
+
+
+async def aunderstand_query_node(state: UnderstandQueryState) -> UnderstandQueryState:
+    """一次 LLM 调用完成查询理解，再解析地点经纬度并映射高德 type"""
+
+    print("--- [Agent] 进入 查询理解Agent ---")
+
+    query = state.get("query", "").strip()
+    state.setdefault("error_messages", [])
+    state["locations"] = []
+    state["location_count"] = 0
+    state["intent"] = "single_location"
+    state["search_mode"] = "single"
+    state["types"] = "050000"
+    if not query:
+        error_msg = "输入错误：query 不能为空。"
+        print(f"  < {error_msg}")
+        state["error_messages"].append(error_msg)
+        return state
+
+    llm = get_llm("understand_query")
+
+    messages = [
+        {"role": "system", "content": UNDERSTAND_QUERY_SYSTEM_PROMPT},
+        {"role": "user", "content": UNDERSTAND_QUERY_USER_PROMPT_TEMPLATE.format(query=query)},
+    ]
+
+    try:
+        print(f"  > 正在理解 query: {query}")
+        result = await llm_output_cache.ainvoke("understand_query", llm, messages)
+    except json.JSONDecodeError as exc:
+        error_msg = f"JSON解析失败: {exc}"
+        print(f"  < {error_msg}")
+        state["error_messages"].append(error_msg)
+        return state
+    except Exception as exc:
+        error_msg = f"查询理解失败: {exc}"
+        print(f"  < {error_msg}")
+        state["error_messages"].append(error_msg)
+        return state
+
+    state["confidence"] = result.get("confidence")
+
+    # 城市：缺失时回退到定位结果
+    city = result.get("city")
+    if not city:
+        city, _ = detect_current_city_and_location()
+        print(f"  < 未识别城市，使用定位结果: {city}")
+    state["city"] = city
+
+    # 地点
+    raw_locations = result.get("locations") or [{"name": city or "当前位置", "location_text": city or "当前位置"}]
+    locations = await aresolve_locations(raw_locations, city, state["error_messages"])
+    state["locations"] = locations
+    state["location_count"] = len(locations)
+    state["location"], _ = primary_location(locations, city)
+
+    # 意图：低置信度回退为 single
+    intent = result.get("intent") or "single_location"
+    search_mode = result.get("search_mode") or INTENT_MODE_MAP.get(intent, "single")
+    try:
+        intent_confidence = float(result.get("intent_confidence", 0.5))
+    except (TypeError, ValueError):
+        # LLM 偶尔输出 null 或 "高" 之类的非数值，按默认置信度处理
+        intent_confidence = 0.5
+    if intent_confidence < 0.5:
+        state["error_messages"].append(f"意图分类置信度低 ({intent_confidence})，回退为 single 模式")
+        intent, search_mode = "single_location", "single"
+    state["intent"] = intent
+    state["search_mode"] = search_mode
+
+    # 场景
+    scenario = result.get("scenario")
+    if scenario and isinstance(scenario, str):
+        state["scenario"] = scenario.strip()
+        state["types"] = _get_restaurant_type_from_scenario(state["scenario"]) or "050000"
+    else:
+        state["scenario"] = None
+
+    # 筛选条件
+    state["filters"] = result.get("filters") or {}
+
+    print(f"  < 城市: {city}, 地点数: {len(locations)}, search_mode: {search_mode}, "
+          f"场景: {state['scenario']} ({state['types']}), 筛选条件: {state['filters']}")
+    return state
+
+
+def understand_query_node(state: UnderstandQueryState) -> UnderstandQueryState:
+    """aunderstand_query_node 的同步版本，在后台事件循环中执行"""
+    return run_coroutine(aunderstand_query_node(state))
+
+
+understand_query_builder = StateGraph(UnderstandQueryState)
+understand_query_builder.add_node("understand", RunnableLambda(understand_query_node, afunc=aunderstand_query_node))
+understand_query_builder.set_entry_point("understand")
+understand_query_builder.add_edge("understand", END)
+understand_query_agent = understand_query_builder.compile()
@@ -0,0 +1,15 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from llm.output_cache import llm_output_cache  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _disable_llm_output_cache(monkeypatch):
+    """各测试使用不同的 mock 响应，关闭进程级 LLM 输出缓存，避免测试之间互相命中"""
+    monkeypatch.setattr(llm_output_cache, "lru_size", 0)
@@ -0,0 +1,69 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from gaode.city_index import CityIndex, CityInfo, city_index  # noqa: E402
+from sub_agents.parse_query import parse_query  # noqa: E402
+
+
+def test_city_index_covers_prefecture_level_cities():
+    print("\n=== 测试1: 覆盖全国地级及以上城市 ===")
+
+    assert len(city_index) >= 330
+    wuhan = city_index.get("武汉")
+    assert wuhan is not None and wuhan.adcode == "420100"
+    # 全称、简称、别名、adcode 均指向同一城市
+    assert city_index.get("武汉市") == wuhan
+    assert city_index.get("江城") == wuhan
+    assert city_index.get("420100") == wuhan
+    assert city_index.get(" 延边朝鲜族自治州 ").short_name == "延边"
+    assert city_index.get("不存在的城市") is None
+
+    print("✓ 支持按全称 / 简称 / 别名 / adcode 查询")
+
+
+def test_alias_conflict_keeps_first_city():
+    print("\n=== 测试2: 别名冲突保留先登记的城市 ===")
+
+    index = CityIndex()
+    first = CityInfo("000001", "甲市", "甲", "100.0,30.0")
+    second = CityInfo("000002", "乙市", "乙", "110.0,35.0")
+    index.add(first, ["共用别名"])
+    index.add(second, ["共用别名"])
+
+    assert index.get("共用别名") == first
+    assert index.get("乙") == second
+
+    print("✓ 别名冲突时不覆盖已登记城市")
+
+
+def test_fallback_uses_city_centroid_instead_of_beijing():
+    print("\n=== 测试3: 回退坐标使用所在城市中心点 ===")
+
+    assert parse_query._fallback_location("成都") == city_index.lnglat("成都")
+    assert parse_query._fallback_location("西双版纳") == city_index.lnglat("西双版纳")
+    assert parse_query._fallback_location("不存在的城市") == parse_query.DEFAULT_LOCATION
+
+    print("✓ 非一线城市不再回退到北京坐标")
+
+
+def test_bare_city_location_skips_geocode():
+    print("\n=== 测试4: 只给出城市名时不调用地理编码 ===")
+
+    mock_response = SimpleNamespace(
+        content='{"city": "武汉", "confidence": 0.9, "reason": "用户提到了武汉"}'
+    )
+    with patch.object(parse_query, "get_llm") as mock_llm, \
+            patch.object(parse_query, "_ageocode_locations", new_callable=AsyncMock) as mock_geocode:
+        mock_llm.return_value.ainvoke = AsyncMock(return_value=mock_response)
+        result = parse_query.parse_query_node({"query": "武汉吃什么", "error_messages": []})
+
+    mock_geocode.assert_not_called()
+    assert result["location"] == city_index.lnglat("武汉")
+    assert result["error_messages"] == []
+
+    print("✓ 城市名直接解析为城市中心点")
@@ -0,0 +1,65 @@
+import math
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common.distance import distance_matrix, max_pairwise_distance, parse_lnglats  # noqa: E402
+from sub_agents.filter_criteria import apply_balance_filter, apply_filters  # noqa: E402
+from sub_agents.food_search.spatial_index import haversine  # noqa: E402
+
+
+TIANANMEN = "116.397128,39.916527"
+WANGJING = "116.481488,39.996562"
+GUOMAO = "116.460226,39.909190"
+
+
+def haversine_distance(lnglat1: str, lnglat2: str) -> float:
+    """逐对计算的参照实现"""
+    return haversine(*map(float, lnglat1.split(",")), *map(float, lnglat2.split(",")))
+
+
+def test_distance_matrix_matches_scalar_haversine():
+    print("\n=== 测试1: 向量化距离矩阵 ===")
+
+    pois = [GUOMAO, None, "bad", WANGJING]
+    matrix = distance_matrix(pois, [TIANANMEN, WANGJING])
+
+    assert matrix.shape == (4, 2)
+    for row, poi in enumerate(pois):
+        for col, ref in enumerate([TIANANMEN, WANGJING]):
+            if row in (1, 2):
+                assert math.isnan(matrix[row, col])
+            else:
+                assert abs(matrix[row, col] - haversine_distance(poi, ref)) < 1e-6
+    assert parse_lnglats([]).shape == (0, 2)
+
+    assert abs(max_pairwise_distance([TIANANMEN, WANGJING, GUOMAO])
+               - haversine_distance(TIANANMEN, WANGJING)) < 1e-6
+    assert max_pairwise_distance([TIANANMEN, None]) == 0.0
+
+    print("✓ 与逐对计算一致，无效坐标为 NaN")
+
+
+def test_filters_use_distances():
+    print("\n=== 测试2: 均衡度与距离筛选使用 distances ===")
+
+    results = [
+        {"name": "A", "rating": "4.5", "distances": [1000.0, 1200.0]},
+        {"name": "B", "rating": "4.8", "distances": [300.0, 6000.0]},
+        {"name": "C", "rating": "4.0", "distances": [-1, 800.0]},
+        {"name": "D", "rating": "3.9"},
+    ]
+
+    balanced = {r["name"]: r["_balance_score"] for r in apply_balance_filter(results, mode="soft")}
+    assert balanced == {"A": 100.0, "B": 2850.0, "C": 0.0, "D": 0.0}
+    assert [r["name"] for r in apply_balance_filter(results, mode="hard")] == ["A", "C", "D"]
+
+    # 到每个参考点都不超过 1500m；没有有效距离的结果保留
+    assert [r["name"] for r in apply_filters(results, {"distance_max": 1500})] == ["A", "C", "D"]
+    # 没有距离信息时沿用按高德排序截断的处理
+    plain = [{"name": str(i)} for i in range(5)]
+    assert len(apply_filters(plain, {"distance_max": 2000})) == 2
+
+    print("✓ 距离矩阵驱动均衡度评分与距离筛选")
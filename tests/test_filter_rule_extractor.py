@@ -0,0 +1,87 @@
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sub_agents.filter_criteria import filter_criteria  # noqa: E402
+from sub_agents.filter_criteria.apply_filters import apply_filters  # noqa: E402
+from sub_agents.filter_criteria.rule_extractor import extract_filters, parse_number  # noqa: E402
+
+
+def test_chinese_numerals():
+    print("\n=== 测试1: 中文数字解析 ===")
+
+    cases = {"4.5": 4.5, "四点五": 4.5, "十二": 12, "二十": 20, "一百五": 150, "两千五": 2500,
+             "三千零五": 3005, "一万": 10000, "半": 0.5}
+    for text, expected in cases.items():
+        assert parse_number(text) == expected, text
+
+    print("✓ 阿拉伯数字、中文数字与口语省略单位均可解析")
+
+
+def test_common_patterns():
+    print("\n=== 测试2: 价格、评分、距离、排序 ===")
+
+    cases = {
+        "100元以下": {"price_range": {"min": 0, "max": 100}},
+        "人均200左右": {"price_range": {"min": 160, "max": 240}},
+        "100-200块钱的火锅": {"price_range": {"min": 100, "max": 200}},
+        "人均500以上": {"price_range": {"min": 500, "max": None}},
+        "预算一百五": {"price_range": {"min": 0, "max": 150}},
+        "人均1k": {"price_range": {"min": 800, "max": 1200}},
+        "人均1千": {"price_range": {"min": 800, "max": 1200}},
+        "人均2万": {"price_range": {"min": 16000, "max": 24000}},
+        "人均1.5k以内": {"price_range": {"min": 0, "max": 1500}},
+        "3千米内": {"distance_max": 3000},
+        "预算200左右": {"price_range": {"min": 160, "max": 240}},
+        "4.5分以上": {"rating_min": 4.5},
+        "1公里内": {"distance_max": 1000},
+        "方圆500米": {"distance_max": 500},
+        "按评分排序": {"sort_by": "rating", "sort_order": "desc"},
+        "现在还开着的烧烤": {"open_now": True},
+        "国贸附近人均一百五以内的日料，评分四点五以上，按距离排序": {
+            "price_range": {"min": 0, "max": 150},
+            "rating_min": 4.5,
+            "sort_by": "distance",
+            "sort_order": "asc",
+        },
+    }
+    for query, expected in cases.items():
+        extraction = extract_filters(query)
+        assert extraction.filters == expected, query
+        assert extraction.confidence >= 0.9, query
+
+    # 输出可以直接交给 apply_filters
+    results = [{"name": "A", "cost": "120", "rating": "4.6"}, {"name": "B", "cost": "300", "rating": "4.8"}]
+    assert [r["name"] for r in apply_filters(results, extract_filters("人均150以内")[0])] == ["A"]
+
+    print("✓ 常见表述被规则完整识别，输出结构与 LLM 一致")
+
+
+def test_confidence_reflects_unhandled_cues():
+    print("\n=== 测试3: 置信度 ===")
+
+    # 没有任何筛选线索：确定没有条件
+    assert extract_filters("适合约会的西餐厅") == ({}, 0.9)
+    assert extract_filters("798艺术区附近3个人吃饭") == ({}, 0.9)
+    # 规则无法确定含义的线索
+    assert extract_filters("便宜点的火锅").confidence < 0.5
+    assert extract_filters("100块的火锅").confidence < 0.5
+    assert extract_filters("人均200左右，性价比高的").confidence < 0.5
+
+    print("✓ 仅在规则不确定时给出低置信度")
+
+
+def test_node_skips_llm_when_rules_are_confident():
+    print("\n=== 测试4: 规则置信度足够时不调用 LLM ===")
+
+    with patch.object(filter_criteria, "get_llm") as mock_llm:
+        result = filter_criteria.filter_criteria_node({"query": "评分4.5以上的火锅", "error_messages": []})
+
+    mock_llm.assert_not_called()
+    assert result["filters"] == {"rating_min": 4.5}
+    assert result["confidence"] >= 0.9
+
+    print("✓ 常见筛选条件无需 LLM 调用")
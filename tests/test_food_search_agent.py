@@ -1,7 +1,7 @@
 import os
 import sys
 import json
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from pathlib import Path
 
 # 添加项目根目录到路径
@@ -55,8 +55,8 @@ def test_gaode_poi_search_success():
         "error_messages": []
     }
     
-    # 模拟requests.get
-    with patch('sub_agents.food_search.food_search.requests.get') as mock_get:
+    # 模拟 httpx.AsyncClient.get
+    with patch('sub_agents.food_search.poi_fetcher.httpx.AsyncClient.get', new_callable=AsyncMock) as mock_get:
         mock_response_obj = MagicMock()
         mock_response_obj.json.return_value = mock_response
         mock_get.return_value = mock_response_obj
@@ -120,7 +120,7 @@ def test_gaode_poi_search_api_error():
         "error_messages": []
     }
     
-    with patch('sub_agents.food_search.food_search.requests.get') as mock_get:
+    with patch('sub_agents.food_search.poi_fetcher.httpx.AsyncClient.get', new_callable=AsyncMock) as mock_get:
         mock_response_obj = MagicMock()
         mock_response_obj.json.return_value = mock_response
         mock_get.return_value = mock_response_obj
@@ -140,7 +140,7 @@ def test_gaode_poi_search_network_timeout():
     """测试网络超时的情况"""
     print("\n=== 测试4: 网络超时 ===")
     
-    import requests
+    import httpx
     
     state: FoodSearchState = {
         "search_criteria": {
@@ -151,8 +151,8 @@ def test_gaode_poi_search_network_timeout():
         "error_messages": []
     }
     
-    with patch('sub_agents.food_search.food_search.requests.get') as mock_get:
-        mock_get.side_effect = requests.exceptions.Timeout("Connection timeout")
+    with patch('sub_agents.food_search.poi_fetcher.httpx.AsyncClient.get', new_callable=AsyncMock) as mock_get:
+        mock_get.side_effect = httpx.TimeoutException("Connection timeout")
         
         with patch.dict(os.environ, {"GAODE_API_KEY": "test_key"}):
             result = gaode_poi_search_node(state)
@@ -209,7 +209,7 @@ def test_gaode_poi_search_empty_results():
         "error_messages": []
     }
     
-    with patch('sub_agents.food_search.food_search.requests.get') as mock_get:
+    with patch('sub_agents.food_search.poi_fetcher.httpx.AsyncClient.get', new_callable=AsyncMock) as mock_get:
         mock_response_obj = MagicMock()
         mock_response_obj.json.return_value = mock_response
         mock_get.return_value = mock_response_obj
@@ -0,0 +1,113 @@
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from gaode.gazetteer import Gazetteer, _load_gazetteer, landmark_gazetteer  # noqa: E402
+from sub_agents.parse_query import parse_query  # noqa: E402
+
+
+def test_bundled_landmarks_and_aliases():
+    print("\n=== 测试1: 预置地标与别名查询 ===")
+
+    tiananmen = landmark_gazetteer.lookup("天安门", "北京")
+    assert tiananmen is not None
+    # 城市前缀、"市"后缀与空白都会被忽略
+    assert landmark_gazetteer.lookup("北京 天安门", "北京市") == tiananmen
+    # 泛化后缀 "附近" 视同地标本身
+    assert landmark_gazetteer.lookup("望京附近", "北京") == landmark_gazetteer.lookup("望京", "北京")
+    # 别名
+    assert landmark_gazetteer.lookup("国贸CBD", "北京") == landmark_gazetteer.lookup("国贸", "北京")
+    # 不同城市互不干扰
+    assert landmark_gazetteer.lookup("天安门", "上海") is None
+    assert landmark_gazetteer.lookup("不存在的地标", "北京") is None
+
+    print("✓ 预置地标、别名、城市前缀与泛化后缀均可命中")
+
+
+def test_learn_persists_across_reload(tmp_path):
+    print("\n=== 测试2: 自动学习并持久化 ===")
+
+    learned_path = str(tmp_path / "gazetteer_learned.jsonl")
+    gazetteer = Gazetteer(learned_path, max_learned=1)
+    # 行政区级别的结果（模糊地名回退到城市中心）与缺少级别的结果不学习，也不占用上限
+    gazetteer.learn("当前位置", "杭州", "120.155070,30.274085", "市")
+    gazetteer.learn("某某街道", "杭州", "120.200000,30.300000", "区县")
+    gazetteer.learn("缓存命中的地点", "杭州", "120.000000,30.000000")
+    gazetteer.learn("某某创意园", "杭州", "120.100000,30.200000", "兴趣点")
+    gazetteer.learn("另一个地点", "杭州", "120.300000,30.400000", "兴趣点")  # 超出上限，忽略
+    gazetteer.learn("无结果的地点", "杭州", None, "兴趣点")
+
+    assert gazetteer.lookup("某某创意园", "杭州市") == "120.100000,30.200000"
+    assert gazetteer.lookup("另一个地点", "杭州") is None
+    assert gazetteer.lookup("当前位置", "杭州") is None
+    assert gazetteer.lookup("缓存命中的地点", "杭州") is None
+    assert gazetteer.stats()["learned"] == 1
+
+    with patch("gaode.gazetteer.CACHE_DIR", str(tmp_path)):
+        reloaded = _load_gazetteer()
+    assert reloaded.lookup("某某创意园", "杭州") == "120.100000,30.200000"
+
+    print("✓ 学习到的地名写入文件，重新加载后依然可用")
+
+
+def test_prefix_query():
+    print("\n=== 测试3: 前缀范围查询 ===")
+
+    gazetteer = Gazetteer()
+    for name in ("中关村", "中关村软件园", "中国美术馆", "国贸"):
+        gazetteer._insert("北京", name, "116.0,39.0")
+
+    assert gazetteer.names_with_prefix("中关村", "北京") == ["中关村", "中关村软件园"]
+    assert gazetteer.names_with_prefix("中", "北京", limit=2) == ["中关村", "中关村软件园"]
+
+    print("✓ 有序数组支持前缀范围查询")
+
+
+def test_load_time_is_small():
+    print("\n=== 测试4: 地标库加载耗时 ===")
+
+    start = time.perf_counter()
+    gazetteer = _load_gazetteer()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    assert gazetteer.stats()["entries"] > 0
+    assert elapsed_ms < 50
+
+    print(f"✓ 加载 {gazetteer.stats()['entries']} 个地名耗时 {elapsed_ms:.1f} ms")
+
+
+def test_parse_query_skips_geocode_on_gazetteer_hit():
+    print("\n=== 测试5: 地标命中时不调用地理编码 ===")
+
+    mock_response = SimpleNamespace(
+        content='{"city": "北京", "confidence": 0.95, "reason": "用户提到了北京", '
+                '"locations": [{"name": "天安门", "location_text": "北京天安门"}, '
+                '{"name": "公司", "location_text": "北京某某科技园"}]}'
+    )
+    gazetteer = _load_gazetteer()
+    gazetteer.learned_path = None
+
+    async def geocode(texts, city, levels=None):
+        levels.update({text: "兴趣点" for text in texts})
+        return ["116.300000,40.000000"]
+
+    with patch.object(parse_query, "get_llm") as mock_llm, \
+            patch.object(parse_query, "landmark_gazetteer", gazetteer), \
+            patch.object(parse_query, "_ageocode_locations", new_callable=AsyncMock, side_effect=geocode) as mock_geocode:
+        mock_llm.return_value.ainvoke = AsyncMock(return_value=mock_response)
+        result = parse_query.parse_query_node({"query": "天安门和公司中间吃什么", "error_messages": []})
+
+    # 只有未收录的地点走地理编码
+    mock_geocode.assert_called_once()
+    assert mock_geocode.call_args.args[:2] == (["北京某某科技园"], "北京")
+    assert result["locations"][0] == {"name": "天安门", "lnglat": gazetteer.lookup("天安门", "北京")}
+    assert result["locations"][1] == {"name": "公司", "lnglat": "116.300000,40.000000"}
+    # 地理编码结果被学习，下次直接命中
+    assert gazetteer.lookup("北京某某科技园", "北京") == "116.300000,40.000000"
+
+    print("✓ 地标命中跳过网络请求，未命中的地点地理编码后被学习")
@@ -0,0 +1,151 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common.sqlite_cache import SqliteCache  # noqa: E402
+from gaode.geocode_cache import GeocodeCache  # noqa: E402
+from gaode.key_pool import GaodeKeyPool  # noqa: E402
+from gaode.rate_limiter import RateLimiter  # noqa: E402
+from sub_agents.parse_query import parse_query  # noqa: E402
+
+
+def _mock_geocode_response(payload: dict) -> MagicMock:
+    response = MagicMock()
+    response.json.return_value = payload
+    return response
+
+
+def _patch_get(**kwargs):
+    return patch.object(parse_query.httpx.AsyncClient, "get", new_callable=AsyncMock, **kwargs)
+
+
+def _patch_gaode(cache: GeocodeCache):
+    return patch.multiple(
+        parse_query,
+        gaode_geocode_cache=cache,
+        gaode_key_pool=GaodeKeyPool(["test_key"]),
+        gaode_rate_limiter=RateLimiter(1000),
+    )
+
+
+def test_geocode_cache_normalized_key_and_persistence(tmp_path):
+    print("\n=== 测试1: 归一化键与持久化 ===")
+
+    db = str(tmp_path / "cache.sqlite3")
+    cache = GeocodeCache(SqliteCache(db, table="geocode"), lru_size=2)
+    cache.set("北京 望京", "北京市", "116.480881,39.989410")
+
+    assert cache.get(" 北京  望京 ", "北京") == (True, "116.480881,39.989410")
+
+    # 新实例（模拟重启）从 SQLite 读取
+    restarted = GeocodeCache(SqliteCache(db, table="geocode"), lru_size=2)
+    assert restarted.get("北京 望京", "北京市") == (True, "116.480881,39.989410")
+    assert restarted.stats()["store_hits"] == 1
+
+    print("✓ 归一化后的 (location_text, city) 命中缓存，重启后依然有效")
+
+
+def test_negative_cache_expires():
+    print("\n=== 测试2: 负缓存短 TTL 过期 ===")
+
+    cache = GeocodeCache(None, lru_size=10, negative_ttl=0.05)
+    cache.set("不存在的地点", "北京", None)
+    assert cache.get("不存在的地点", "北京") == (True, None)
+
+    time.sleep(0.06)
+    assert cache.get("不存在的地点", "北京") == (False, None)
+
+    print("✓ 负缓存过期后重新允许地理编码")
+
+
+def test_geocode_location_hits_network_once():
+    print("\n=== 测试3: 重复地标只请求一次高德 ===")
+
+    cache = GeocodeCache(SqliteCache(":memory:", table="geocode"), lru_size=10)
+    ok = _mock_geocode_response({"status": "1", "geocodes": [{"location": "116.397128,39.916527"}]})
+
+    with _patch_gaode(cache), _patch_get(return_value=ok) as mock_get:
+        results = [asyncio.run(parse_query._ageocode_location("北京天安门", "北京")) for _ in range(3)]
+
+    assert results == ["116.397128,39.916527"] * 3
+    assert mock_get.call_count == 1
+
+    print("✓ 3 次解析仅 1 次网络请求")
+
+
+def test_geocode_failure_is_negatively_cached():
+    print("\n=== 测试4: 地理编码失败被负缓存 ===")
+
+    cache = GeocodeCache(SqliteCache(":memory:", table="geocode"), lru_size=10)
+    empty = _mock_geocode_response({"status": "1", "geocodes": []})
+
+    with _patch_gaode(cache), _patch_get(return_value=empty) as mock_get:
+        assert asyncio.run(parse_query._ageocode_location("火星基地", "北京")) is None
+        assert asyncio.run(parse_query._ageocode_location("火星基地", "北京")) is None
+
+    assert mock_get.call_count == 1
+    assert cache.stats()["negative_hits"] == 1
+
+    print("✓ 失败结果在负缓存有效期内不再重试")
+
+
+def test_batch_geocode_single_round_trip():
+    print("\n=== 测试5: 多地点批量地理编码一次往返 ===")
+
+    cache = GeocodeCache(SqliteCache(":memory:", table="geocode"), lru_size=10)
+    cache.set("北京国贸", "北京", "116.461841,39.909104")
+    batch = _mock_geocode_response({
+        "status": "1",
+        "count": "3",
+        "geocodes": [
+            {"location": "116.397128,39.916527", "level": "兴趣点"},
+            {"location": [], "level": []},
+            {"location": "116.480881,39.989410", "level": "热点商圈"},
+        ],
+    })
+
+    texts = ["北京天安门", "北京国贸", "不存在的地点", "北京望京", "北京天安门"]
+    levels = {}
+    with _patch_gaode(cache), _patch_get(return_value=batch) as mock_get:
+        results = asyncio.run(parse_query._ageocode_locations(texts, "北京", levels))
+
+    assert results == [
+        "116.397128,39.916527",
+        "116.461841,39.909104",
+        None,
+        "116.480881,39.989410",
+        "116.397128,39.916527",
+    ]
+    assert mock_get.call_count == 1
+    params = mock_get.call_args.kwargs["params"]
+    assert params["batch"] == "true"
+    assert params["address"] == "北京天安门|不存在的地点|北京望京"
+    assert cache.get("不存在的地点", "北京") == (True, None)
+    # 只有网络请求得到的结果带匹配级别，缓存命中与失败的地址没有
+    assert levels == {"北京天安门": "兴趣点", "北京望京": "热点商圈"}
+
+    print("✓ 未命中缓存的 3 个地址合并为一次请求，失败地址映射为 None")
+
+
+def test_batch_geocode_falls_back_on_batch_error():
+    print("\n=== 测试6: 整批失败时逐个重试 ===")
+
+    cache = GeocodeCache(SqliteCache(":memory:", table="geocode"), lru_size=10)
+    responses = [
+        _mock_geocode_response({"status": "0", "info": "ENGINE_RESPONSE_DATA_ERROR", "infocode": "30001"}),
+        _mock_geocode_response({"status": "1", "geocodes": [{"location": "116.397128,39.916527"}]}),
+        _mock_geocode_response({"status": "1", "geocodes": []}),
+    ]
+
+    with _patch_gaode(cache), _patch_get(side_effect=responses) as mock_get:
+        results = asyncio.run(parse_query._ageocode_locations(["北京天安门", "火星基地"], "北京"))
+
+    assert results == ["116.397128,39.916527", None]
+    assert mock_get.call_count == 3
+
+    print("✓ 整批失败后逐个地址定位失败项")
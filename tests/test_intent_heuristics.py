@@ -0,0 +1,82 @@
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sub_agents.intent_classifier import intent_classifier  # noqa: E402
+from sub_agents.intent_classifier.heuristics import IntentHeuristicStats, decide_intent  # noqa: E402
+
+
+def _mock_response(payload: dict) -> SimpleNamespace:
+    return SimpleNamespace(content=json.dumps(payload, ensure_ascii=False))
+
+
+def test_structural_and_lexical_decisions():
+    print("\n=== 测试1: 由地点数量与词汇线索判定意图 ===")
+
+    assert decide_intent("国贸附近的火锅", 1).search_mode == "single"
+    # 单地点时 "之间" 等会面线索没有意义
+    assert decide_intent("两个商场之间的火锅", 1).search_mode == "single"
+    assert decide_intent("回家路上吃点什么", 1).intent == "along_route"
+    assert decide_intent("天安门和望京中间的火锅", 2).search_mode == "intersection"
+    assert decide_intent("国贸和三里屯分别有什么好吃的", 2).search_mode == "union"
+    assert decide_intent("从国贸到望京沿途的咖啡", 2).search_mode == "along_route"
+
+    # 多地点但没有线索、或线索冲突：交给 LLM
+    assert decide_intent("国贸和望京的火锅", 2) is None
+    assert decide_intent("对比一下国贸和望京中间的餐厅", 2) is None
+
+    print("✓ 结构上确定的意图无需 LLM")
+
+
+def test_node_skips_llm_when_decided():
+    print("\n=== 测试2: 规则有把握时跳过 LLM ===")
+
+    stats = IntentHeuristicStats()
+    llm_response = _mock_response({"intent": "equidistant_meeting", "search_mode": "intersection", "confidence": 0.8})
+
+    with patch.object(intent_classifier, "intent_heuristic_stats", stats), \
+            patch.object(intent_classifier, "get_llm") as mock_llm:
+        mock_llm.return_value.ainvoke = AsyncMock(return_value=llm_response)
+        single = intent_classifier.intent_classifier_node({"query": "国贸附近的火锅", "location_count": 1})
+        ambiguous = intent_classifier.intent_classifier_node({"query": "国贸和望京的火锅", "location_count": 2})
+
+    assert single["search_mode"] == "single"
+    assert ambiguous["search_mode"] == "intersection"
+    mock_llm.return_value.ainvoke.assert_awaited_once()
+    assert stats.stats()["decided"] == 1
+    assert stats.stats()["deferred"] == 1
+
+    print("✓ 仅规则弃权时调用 LLM")
+
+
+def test_shadow_mode_records_agreement():
+    print("\n=== 测试3: shadow 模式统计与 LLM 的一致率 ===")
+
+    stats = IntentHeuristicStats()
+    responses = [
+        _mock_response({"intent": "single_location", "search_mode": "single", "confidence": 0.9}),
+        _mock_response({"intent": "compare_locations", "search_mode": "union", "confidence": 0.7}),
+    ]
+
+    with patch.object(intent_classifier, "INTENT_HEURISTIC_MODE", "shadow"), \
+            patch.object(intent_classifier, "intent_heuristic_stats", stats), \
+            patch.object(intent_classifier, "get_llm") as mock_llm:
+        mock_llm.return_value.ainvoke = AsyncMock(side_effect=responses)
+        first = intent_classifier.intent_classifier_node({"query": "国贸附近的火锅", "location_count": 1})
+        second = intent_classifier.intent_classifier_node({"query": "天安门和望京中间的火锅", "location_count": 2})
+
+    # shadow 模式下始终采用 LLM 的结果
+    assert mock_llm.return_value.ainvoke.await_count == 2
+    assert first["search_mode"] == "single"
+    assert second["search_mode"] == "union"
+    result = stats.stats()
+    assert result["shadow_compared"] == 2
+    assert result["shadow_agreement_rate"] == 0.5
+    assert result["disagreements"] == {"equidistant_meeting->compare_locations": 1}
+
+    print("✓ shadow 模式只记录对比，不影响输出")
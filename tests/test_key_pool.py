@@ -0,0 +1,76 @@
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from gaode.key_pool import GaodeKeyPool, NoAvailableKeyError  # noqa: E402
+
+
+def test_least_loaded_prefers_idle_key():
+    print("\n=== 测试1: least_loaded 选择在途请求最少的 key ===")
+
+    pool = GaodeKeyPool(["key_a", "key_b"])
+    first = pool.acquire("place/around")
+    second = pool.acquire("place/around")
+    assert {first, second} == {"key_a", "key_b"}
+
+    pool.release(first)
+    assert pool.acquire("place/around") == first
+
+    print("✓ 空闲 key 优先被选中")
+
+
+def test_round_robin_rotates_keys():
+    print("\n=== 测试2: round_robin 轮询 key ===")
+
+    pool = GaodeKeyPool(["key_a", "key_b", "key_c"], strategy="round_robin")
+    picked = []
+    for _ in range(6):
+        with pool.lease("geocode/geo") as key:
+            picked.append(key)
+
+    assert picked == ["key_a", "key_b", "key_c", "key_a", "key_b", "key_c"]
+
+    print(f"✓ 轮询顺序: {picked}")
+
+
+def test_daily_quota_and_ejection():
+    print("\n=== 测试3: 日配额用尽与配额错误剔除 ===")
+
+    pool = GaodeKeyPool(["key_a", "key_b"], daily_quota=2)
+    for _ in range(4):
+        with pool.lease("place/around"):
+            pass
+    try:
+        pool.acquire("place/around")
+        assert False, "两个 key 当日配额均已用尽，应抛出 NoAvailableKeyError"
+    except NoAvailableKeyError:
+        pass
+
+    # 其他接口的配额不受影响
+    assert pool.acquire("geocode/geo") in ("key_a", "key_b")
+
+    assert pool.report_failure("key_a", "geocode/geo", "10044", "USER_DAILY_QUERY_OVER_LIMIT") is True
+    assert pool.report_failure("key_b", "geocode/geo", "20000", "INVALID_PARAMS") is False
+    assert pool.acquire("geocode/geo") == "key_b"
+
+    print("✓ 配额耗尽的 key 被暂停使用，非配额错误不剔除")
+
+
+def test_ejection_resets_next_day():
+    print("\n=== 测试4: 跨天后恢复被剔除的 key ===")
+
+    pool = GaodeKeyPool(["key_a"])
+    pool.report_failure("key_a", "place/around", "10003", "DAILY_QUERY_OVER_LIMIT")
+    try:
+        pool.acquire("place/around")
+        assert False, "key_a 已被剔除"
+    except NoAvailableKeyError:
+        pass
+
+    with patch.object(GaodeKeyPool, "_quota_day", staticmethod(lambda: "2099-01-01")):
+        assert pool.acquire("place/around") == "key_a"
+
+    print("✓ 配额重置后 key 重新可用")
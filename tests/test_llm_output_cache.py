@@ -0,0 +1,106 @@
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common.sqlite_cache import SqliteCache  # noqa: E402
+from llm.output_cache import LLMOutputCache  # noqa: E402
+from sub_agents.filter_criteria import filter_criteria  # noqa: E402
+
+
+def _mock_llm(payload: dict, model: str = "qwen-plus") -> MagicMock:
+    llm = MagicMock()
+    llm.model_name = model
+    llm.ainvoke = AsyncMock(return_value=SimpleNamespace(content=json.dumps(payload, ensure_ascii=False)))
+    return llm
+
+
+def _messages(query: str, system: str = "提取筛选条件") -> list:
+    return [{"role": "system", "content": system}, {"role": "user", "content": query}]
+
+
+def test_normalized_inputs_hit_cache_per_node():
+    print("\n=== 测试1: 归一化输入命中缓存并按节点统计 ===")
+
+    cache = LLMOutputCache(None, lru_size=10)
+    llm = _mock_llm({"filters": {"rating_min": 4.5}, "confidence": 0.9})
+
+    first = asyncio.run(cache.ainvoke("filter_criteria", llm, _messages("评分4.5以上")))
+    second = asyncio.run(cache.ainvoke("filter_criteria", llm, _messages("  评分4.5以上 ")))
+    # 提示词版本或节点不同时不共享缓存
+    asyncio.run(cache.ainvoke("filter_criteria", llm, _messages("评分4.5以上", system="新版提示词")))
+    asyncio.run(cache.ainvoke("intent_classifier", llm, _messages("评分4.5以上")))
+
+    assert first == second == {"filters": {"rating_min": 4.5}, "confidence": 0.9}
+    assert llm.ainvoke.await_count == 3
+    nodes = cache.stats()["nodes"]
+    assert nodes["filter_criteria"] == {"hits": 1, "misses": 2, "hit_rate": 0.3333}
+    assert nodes["intent_classifier"] == {"hits": 0, "misses": 1, "hit_rate": 0.0}
+
+    print("✓ 相同输入只调用一次 LLM，提示词修改后自动失效")
+
+
+def test_unparseable_output_is_not_cached():
+    print("\n=== 测试2: 解析失败的输出不写入缓存 ===")
+
+    cache = LLMOutputCache(None, lru_size=10)
+    llm = MagicMock(model_name="qwen-plus")
+    llm.ainvoke = AsyncMock(return_value=SimpleNamespace(content="不是JSON"))
+
+    for _ in range(2):
+        try:
+            asyncio.run(cache.ainvoke("filter_criteria", llm, _messages("便宜点的")))
+        except json.JSONDecodeError:
+            pass
+
+    assert llm.ainvoke.await_count == 2
+    assert cache.stats()["lru_entries"] == 0
+
+    print("✓ 格式错误的响应每次都会重新请求")
+
+
+def test_ttl_lru_and_persistence(tmp_path):
+    print("\n=== 测试3: TTL、LRU 淘汰与持久化 ===")
+
+    db = str(tmp_path / "llm_cache.sqlite3")
+    cache = LLMOutputCache(SqliteCache(db, table="llm_outputs"), lru_size=1, ttl=0.2)
+    cache.set("a", '{"x": 1}')
+    cache.set("b", '{"x": 2}')
+    assert cache.stats()["lru_entries"] == 1
+
+    # 内存 LRU 已淘汰的条目从 SQLite 读取；新实例（模拟重启）同样可读
+    assert cache.get("a") == '{"x": 1}'
+    restarted = LLMOutputCache(SqliteCache(db, table="llm_outputs"), lru_size=10, ttl=0.2)
+    assert restarted.get("b") == '{"x": 2}'
+
+    time.sleep(0.25)
+    assert restarted.get("b") is None
+
+    print("✓ 超过容量按 LRU 淘汰，重启后可读，过期后失效")
+
+
+def test_node_uses_output_cache():
+    print("\n=== 测试4: 子 Agent 重复查询不再调用 LLM ===")
+
+    cache = LLMOutputCache(None, lru_size=10)
+    llm = _mock_llm({"filters": {"sort_by": "price", "sort_order": "asc"}, "confidence": 0.7})
+
+    with patch.object(filter_criteria, "get_llm", return_value=llm), \
+            patch.object(filter_criteria, "llm_output_cache", cache):
+        results = [
+            # 规则无法确定 "便宜点" 的含义，交给 LLM
+            filter_criteria.filter_criteria_node({"query": "便宜点的火锅", "error_messages": []})
+            for _ in range(3)
+        ]
+
+    assert all(r["filters"] == {"sort_by": "price", "sort_order": "asc"} for r in results)
+    assert llm.ainvoke.await_count == 1
+    assert cache.stats()["nodes"]["filter_criteria"]["hits"] == 2
+
+    print("✓ 3 次相同查询仅 1 次 LLM 调用")
@@ -0,0 +1,88 @@
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from llm.registry import LLMClientRegistry  # noqa: E402
+
+
+class _ChatCompletionHandler(BaseHTTPRequestHandler):
+    """最简 OpenAI 兼容接口，保持 HTTP/1.1 长连接"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length))
+        body = json.dumps({
+            "id": "chatcmpl-test",
+            "object": "chat.completion",
+            "created": 0,
+            "model": request["model"],
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": "ok"}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _start_server() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ChatCompletionHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_registry_reuses_clients_per_node():
+    print("\n=== 测试1: 按节点复用 LLM 客户端 ===")
+
+    registry = LLMClientRegistry("sk-test", "http://127.0.0.1:1/v1", "qwen-plus",
+                                 node_models={"planner": "qwen-max"})
+
+    planner = registry.get("planner")
+    assert registry.get("planner") is planner
+    assert planner.model_name == "qwen-max"
+    assert registry.get("parse_query").model_name == "qwen-plus"
+
+    stats = registry.stats()
+    assert stats["clients_created"] == 2
+    assert stats["node_calls"] == {"planner": 2, "parse_query": 1}
+
+    print("✓ 同一节点复用实例，按节点覆盖模型")
+
+
+def test_registry_reuses_http_connections():
+    print("\n=== 测试2: 所有节点共享 keep-alive 连接 ===")
+
+    server = _start_server()
+    try:
+        registry = LLMClientRegistry(
+            "sk-test",
+            f"http://127.0.0.1:{server.server_port}/v1",
+            "qwen-plus",
+            limits=httpx.Limits(max_connections=4, max_keepalive_connections=4),
+        )
+        for node in ("planner", "parse_query", "intent_classifier", "planner"):
+            assert registry.get(node).invoke("你好").content == "ok"
+
+        http = registry.stats()["http"]
+        assert http["requests"] == 4
+        assert http["connections_opened"] == 1
+        assert http["reused_connections"] == 3
+    finally:
+        registry.http_client().close()
+        server.shutdown()
+
+    print(f"✓ 4 次调用仅建立 1 个连接，复用率 {http['reuse_rate']:.0%}")
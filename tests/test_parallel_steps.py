@@ -0,0 +1,161 @@
+import asyncio
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from plann_and_execute import node  # noqa: E402
+from plann_and_execute.agent import graph  # noqa: E402
+from plann_and_execute.scheduler import step_dependencies  # noqa: E402
+from plann_and_execute.state import Plan, PlanStep  # noqa: E402
+
+
+MULTI_LOCATION_PLAN = {
+    "steps": [
+        {"step_id": 1, "subgraph_name": "parse_query", "description": "解析地点", "input_mapping": None},
+        {"step_id": 2, "subgraph_name": "intent_classifier", "description": "识别意图",
+         "input_mapping": {"query": "step_1.query", "location_count": "step_1.location_count"}},
+        {"step_id": 3, "subgraph_name": "scenario_classifier", "description": "识别场景",
+         "input_mapping": {"query": "step_1.query"}},
+        {"step_id": 4, "subgraph_name": "filter_criteria", "description": "提取筛选条件",
+         "input_mapping": {"query": "step_1.query"}},
+        {"step_id": 5, "subgraph_name": "food_search", "description": "搜索美食",
+         "input_mapping": {"keywords": "step_3.scenario", "types": "step_3.types", "city": "step_1.city",
+                           "location": "step_1.location", "locations": "step_1.locations",
+                           "search_mode": "step_2.search_mode"}},
+    ]
+}
+
+STEP_DELAY = 0.2
+
+
+def _fake_executors(calls: list):
+    outputs = {
+        "parse_query": {"city": "北京", "location": "116.4,39.9", "locations": [], "location_count": 2},
+        "intent_classifier": {"intent": "equidistant_meeting", "search_mode": "intersection", "confidence": 0.9},
+        "scenario_classifier": {"scenario": "火锅", "types": "050117"},
+        "filter_criteria": {"filters": None, "confidence": 0.8},
+        "food_search": {"search_results": [], "fallback": None},
+    }
+
+    def make(name):
+        def run(step_input):
+            calls.append((name, threading.current_thread().name, time.perf_counter()))
+            time.sleep(STEP_DELAY)
+            return {**outputs[name], "error_messages": []}
+        return run
+
+    return {name: make(name) for name in outputs}
+
+
+def test_step_dependencies_ignore_query_passthrough():
+    print("\n=== 测试1: query 透传不构成依赖 ===")
+
+    plan = Plan(steps=[PlanStep(**step) for step in MULTI_LOCATION_PLAN["steps"]])
+    deps = {step.step_id: step_dependencies(step, plan, node._SUBGRAPH_OUTPUTS) for step in plan.steps}
+
+    assert deps == {1: set(), 2: {1}, 3: set(), 4: set(), 5: {1, 2, 3}}
+
+    print("✓ 仅真实的输出字段引用构成依赖")
+
+
+def test_independent_steps_run_concurrently():
+    print("\n=== 测试2: 独立步骤并行执行 ===")
+
+    calls = []
+    # 关闭本地计划编译，使用 LLM 返回的计划
+    with patch.object(node, "get_llm") as mock_llm, \
+            patch.object(node, "PLAN_COMPILER_ENABLED", False), \
+            patch.dict(node._SUBGRAPH_EXECUTORS, _fake_executors(calls)):
+        mock_llm.return_value.ainvoke = AsyncMock(return_value=SimpleNamespace(content=json.dumps(MULTI_LOCATION_PLAN)))
+        start = time.perf_counter()
+        final_state = graph.invoke({"query": "天安门和望京中间的火锅", "replan_count": 0,
+                                    "error_info": None, "past_plans": []})
+        elapsed = time.perf_counter() - start
+
+    assert sorted(final_state["step_results"].keys()) == [1, 2, 3, 4, 5]
+    assert json.loads(final_state["final_result"])["search_mode"] == "intersection"
+
+    # parse_query、scenario_classifier、filter_criteria 同批启动
+    started = {name: ts for name, _, ts in calls}
+    assert abs(started["scenario_classifier"] - started["parse_query"]) < STEP_DELAY / 2
+    assert abs(started["filter_criteria"] - started["parse_query"]) < STEP_DELAY / 2
+    assert started["intent_classifier"] >= started["parse_query"] + STEP_DELAY
+    # 三批次（[1,3,4] -> [2] -> [5]），而非 5 步串行
+    assert elapsed < STEP_DELAY * 4
+
+    print(f"✓ 5 个步骤分 3 批执行，耗时 {elapsed:.2f}s（串行约 {STEP_DELAY * 5:.1f}s）")
+
+
+def test_failed_step_in_batch_keeps_successful_results():
+    print("\n=== 测试3: 批次中某步骤失败 ===")
+
+    plan = Plan(steps=[PlanStep(**step) for step in MULTI_LOCATION_PLAN["steps"][:4]])
+    calls = []
+    executors = _fake_executors(calls)
+
+    def failing(step_input):
+        raise RuntimeError("模型超时")
+
+    executors["filter_criteria"] = failing
+    state = {"query": "火锅", "plan": plan, "current_step": 0, "step_results": {}}
+    with patch.dict(node._SUBGRAPH_EXECUTORS, executors):
+        state = node.subgraph_node(node.executor_node(state))
+
+    assert state["current_batch"] == [1, 2, 3, 4]
+    # 第 4 步失败后不再启动新步骤，已启动的第 1、3 步结果保留
+    assert sorted(state["step_results"].keys()) == [1, 3]
+    assert "intent_classifier" not in [name for name, _, _ in calls]
+    assert state["error_info"]["step"] == 4
+    assert state["error_info"]["subgraph_name"] == "filter_criteria"
+
+    print("✓ 成功步骤的结果被保留，错误信息指向失败步骤")
+
+
+def test_concurrent_requests_share_one_event_loop():
+    print("\n=== 测试4: graph.ainvoke 并发请求互不阻塞 ===")
+
+    outputs = {name: {**result, "error_messages": []} for name, result in {
+        "parse_query": {"city": "北京", "location": "116.4,39.9", "locations": [], "location_count": 2},
+        "intent_classifier": {"intent": "equidistant_meeting", "search_mode": "intersection", "confidence": 0.9},
+        "scenario_classifier": {"scenario": "火锅", "types": "050117"},
+        "filter_criteria": {"filters": None, "confidence": 0.8},
+        "food_search": {"search_results": [], "fallback": None},
+    }.items()}
+    threads = set()
+
+    def make(name):
+        async def run(step_input):
+            threads.add(threading.current_thread().name)
+            await asyncio.sleep(STEP_DELAY)
+            return dict(outputs[name])
+        return run
+
+    async def serve(count: int):
+        return await asyncio.gather(*(
+            graph.ainvoke({"query": f"请求{i}", "replan_count": 0, "error_info": None, "past_plans": []})
+            for i in range(count)
+        ))
+
+    requests = 8
+    with patch.object(node, "get_llm") as mock_llm, \
+            patch.object(node, "PLAN_COMPILER_ENABLED", False), \
+            patch.dict(node._SUBGRAPH_EXECUTORS, {name: make(name) for name in outputs}):
+        mock_llm.return_value.ainvoke = AsyncMock(return_value=SimpleNamespace(content=json.dumps(MULTI_LOCATION_PLAN)))
+        start = time.perf_counter()
+        final_states = asyncio.run(serve(requests))
+        elapsed = time.perf_counter() - start
+
+    assert all(sorted(state["step_results"].keys()) == [1, 2, 3, 4, 5] for state in final_states)
+    # 所有子图协程都在同一个事件循环线程中运行
+    assert threads == {threading.current_thread().name}
+    # 8 个请求并发，总耗时仍约为单个请求的 3 批次
+    assert elapsed < STEP_DELAY * 4
+
+    print(f"✓ {requests} 个请求在单个事件循环中并发完成，耗时 {elapsed:.2f}s")
@@ -2,7 +2,7 @@ import os
 import sys
 from pathlib import Path
 from types import SimpleNamespace
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 # 添加项目根目录到路径
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -32,9 +32,9 @@ def test_parse_query_with_city_in_query():
     )
 
     with patch(
-        "sub_agents.parse_query.parse_query.ChatOpenAI"
+        "sub_agents.parse_query.parse_query.get_llm"
     ) as mock_llm:
-        mock_llm.return_value.invoke.return_value = mock_response
+        mock_llm.return_value.ainvoke = AsyncMock(return_value=mock_response)
 
         state = _build_state("我在上海，想吃火锅")
         result = parse_query_node(state)
@@ -55,11 +55,11 @@ def test_parse_query_fallback_to_device_location():
     )
 
     with patch(
-        "sub_agents.parse_query.parse_query.ChatOpenAI"
+        "sub_agents.parse_query.parse_query.get_llm"
     ) as mock_llm, patch.dict(
         os.environ, {"DEFAULT_CITY": "深圳"}, clear=False
     ):
-        mock_llm.return_value.invoke.return_value = mock_response
+        mock_llm.return_value.ainvoke = AsyncMock(return_value=mock_response)
 
         state = _build_state("帮我推荐附近的美食")
         result = parse_query_node(state)
@@ -75,7 +75,7 @@ def test_parse_query_missing_query():
     print("\n=== 测试3: 缺少 query ===")
 
     with patch(
-        "sub_agents.parse_query.parse_query.ChatOpenAI"
+        "sub_agents.parse_query.parse_query.get_llm"
     ) as mock_llm:
         state = _build_state("")
         result = parse_query_node(state)
@@ -0,0 +1,140 @@
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from plann_and_execute import node  # noqa: E402
+from plann_and_execute.agent import graph  # noqa: E402
+from plann_and_execute.state import Plan, PlanStep  # noqa: E402
+
+
+FOOD_SEARCH_MAPPING = {"keywords": "step_2.scenario", "types": "step_2.types", "city": "step_1.city",
+                       "location": "step_1.location"}
+
+INITIAL_PLAN = {"steps": [
+    {"step_id": 1, "subgraph_name": "parse_query", "description": "解析地点", "input_mapping": None},
+    {"step_id": 2, "subgraph_name": "scenario_classifier", "description": "识别场景",
+     "input_mapping": {"query": "step_1.query"}},
+    {"step_id": 3, "subgraph_name": "food_search", "description": "搜索美食", "input_mapping": FOOD_SEARCH_MAPPING},
+]}
+
+# 重规划后插入筛选步骤，场景识别与美食搜索的序号随之改变
+REPLAN = {"steps": [
+    {"step_id": 1, "subgraph_name": "parse_query", "description": "解析地点", "input_mapping": None},
+    {"step_id": 2, "subgraph_name": "filter_criteria", "description": "提取筛选条件",
+     "input_mapping": {"query": "step_1.query"}},
+    {"step_id": 3, "subgraph_name": "scenario_classifier", "description": "识别场景",
+     "input_mapping": {"query": "step_1.query"}},
+    {"step_id": 4, "subgraph_name": "food_search", "description": "搜索美食",
+     "input_mapping": {**FOOD_SEARCH_MAPPING, "keywords": "step_3.scenario", "types": "step_3.types"}},
+]}
+
+
+def _plan(plan_dict: dict) -> Plan:
+    return Plan(steps=[PlanStep(**step) for step in plan_dict["steps"]])
+
+
+def test_carry_over_keeps_valid_prefix():
+    print("\n=== 测试1: 重规划保留有效前缀 ===")
+
+    results = {1: {"city": "北京"}, 2: {"scenario": "火锅", "types": "050117"}}
+    error_info = {"error_type": "EXECUTION_ERROR", "step": 3}
+
+    # 计划不变：失败步骤之前的结果全部保留
+    kept = node._carry_over_step_results(_plan(INITIAL_PLAN), _plan(INITIAL_PLAN), results, error_info)
+    assert kept == results
+
+    # 步骤序号改变的不保留（交给记忆化复用），依赖未保留步骤的下游也不保留
+    kept = node._carry_over_step_results(_plan(INITIAL_PLAN), _plan(REPLAN), results, error_info)
+    assert kept == {1: {"city": "北京"}}
+
+    changed = json.loads(json.dumps(INITIAL_PLAN))
+    changed["steps"][0]["subgraph_name"] = "understand_query"
+    # 第 1 步被替换后不再保留；第 2 步只透传 query，不依赖第 1 步的输出，仍然保留
+    kept = node._carry_over_step_results(_plan(INITIAL_PLAN), _plan(changed), results, error_info)
+    assert kept == {2: {"scenario": "火锅", "types": "050117"}}
+
+    print("✓ 只保留与新计划一致、未受失败影响的步骤")
+
+
+def test_replan_reuses_memoized_steps():
+    print("\n=== 测试2: 重规划后只重新执行失败步骤及其下游 ===")
+
+    calls = []
+    outputs = {
+        "parse_query": {"city": "北京", "location": "116.4,39.9", "locations": [], "location_count": 1},
+        "scenario_classifier": {"scenario": "火锅", "types": "050117"},
+        "filter_criteria": {"filters": None, "confidence": 0.0},
+        "food_search": {"search_results": [], "fallback": None},
+    }
+
+    def make(name):
+        def run(step_input):
+            calls.append(name)
+            if name == "food_search" and calls.count(name) == 1:
+                raise RuntimeError("高德接口超时")
+            return {**outputs[name], "error_messages": []}
+        return run
+
+    responses = [SimpleNamespace(content=json.dumps(INITIAL_PLAN)), SimpleNamespace(content=json.dumps(REPLAN))]
+    with patch.object(node, "get_llm") as mock_llm, \
+            patch.object(node, "PLAN_COMPILER_ENABLED", False), \
+            patch.dict(node._SUBGRAPH_EXECUTORS, {name: make(name) for name in outputs}):
+        mock_llm.return_value.ainvoke = AsyncMock(side_effect=responses)
+        final_state = graph.invoke({"query": "国贸附近的火锅", "replan_count": 0, "error_info": None,
+                                    "past_plans": []})
+
+    assert final_state["replan_count"] == 1
+    assert sorted(final_state["step_results"].keys()) == [1, 2, 3, 4]
+    # parse_query 结果沿用，scenario_classifier 命中记忆化；只有新增步骤与失败步骤重新执行
+    assert sorted(calls) == ["filter_criteria", "food_search", "food_search", "parse_query", "scenario_classifier"]
+
+    print(f"✓ 子图调用序列: {calls}")
+
+
+def test_in_band_errors_are_not_reused():
+    print("\n=== 测试3: error_messages 非空的步骤结果不沿用、不记忆 ===")
+
+    calls = []
+    outputs = {
+        "parse_query": {"city": "北京", "location": "116.4,39.9", "locations": [], "location_count": 1},
+        "scenario_classifier": {"scenario": "火锅", "types": "050117"},
+        "food_search": {"search_results": [], "fallback": None},
+    }
+
+    def make(name):
+        def run(step_input):
+            calls.append(name)
+            # 第一次地理编码遇到网络错误：不抛出，写入 error_messages
+            if name == "parse_query" and calls.count(name) == 1:
+                return {"city": "北京", "location": None, "locations": [], "location_count": 0,
+                        "error_messages": ["地理编码网络错误: timeout"]}
+            if name == "food_search" and calls.count(name) == 1:
+                raise RuntimeError("location 为空")
+            return {**outputs[name], "error_messages": []}
+        return run
+
+    results = {1: {"city": "北京", "error_messages": ["地理编码网络错误: timeout"]},
+               2: {"scenario": "火锅", "types": "050117", "error_messages": []}}
+    kept = node._carry_over_step_results(_plan(INITIAL_PLAN), _plan(INITIAL_PLAN), results,
+                                         {"error_type": "EXECUTION_ERROR", "step": 3})
+    assert kept == {2: results[2]}
+
+    responses = [SimpleNamespace(content=json.dumps(INITIAL_PLAN))] * 2
+    with patch.object(node, "get_llm") as mock_llm, \
+            patch.object(node, "PLAN_COMPILER_ENABLED", False), \
+            patch.dict(node._SUBGRAPH_EXECUTORS, {name: make(name) for name in outputs}):
+        mock_llm.return_value.ainvoke = AsyncMock(side_effect=responses)
+        final_state = graph.invoke({"query": "国贸附近的火锅", "replan_count": 0, "error_info": None,
+                                    "past_plans": []})
+
+    assert final_state["replan_count"] == 1
+    assert final_state["step_results"][1]["location"] == "116.4,39.9"
+    # 出错的 parse_query 重新执行，成功的 scenario_classifier 沿用
+    assert sorted(calls) == ["food_search", "food_search", "parse_query", "parse_query", "scenario_classifier"]
+
+    print(f"✓ 子图调用序列: {calls}")
@@ -0,0 +1,157 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from plann_and_execute import node  # noqa: E402
+from plann_and_execute.agent import graph  # noqa: E402
+from plann_and_execute.plan_compiler import PlanCompilerStats, compile_plan  # noqa: E402
+from plann_and_execute.scheduler import PlanDAG  # noqa: E402
+from sub_agents.scenario_classifier import scenario_classifier  # noqa: E402
+
+
+def _subgraphs(plan):
+    return [step.subgraph_name for step in plan.steps]
+
+
+def test_query_features_select_canonical_shapes():
+    print("\n=== 测试1: 按 query 特征选择规范计划 ===")
+
+    cases = {
+        "北京望京附近吃什么": ("direct", ["parse_query", "intent_classifier", "food_search"]),
+        "我在北京想吃川菜": ("scenario", ["parse_query", "intent_classifier", "scenario_classifier", "food_search"]),
+        "评分4.5以上的餐厅": ("filter", ["parse_query", "intent_classifier", "filter_criteria", "food_search"]),
+        "国贸附近人均100以内的日料": (
+            "scenario_filter",
+            ["parse_query", "intent_classifier", "scenario_classifier", "filter_criteria", "food_search"]),
+        "天安门和望京中间的火锅": (
+            "multi_location",
+            ["parse_query", "intent_classifier", "scenario_classifier", "filter_criteria", "food_search"]),
+    }
+    for query, (expected_shape, expected_subgraphs) in cases.items():
+        shape, plan = compile_plan(query)
+        assert shape == expected_shape, query
+        assert _subgraphs(plan) == expected_subgraphs, query
+
+    # 沿途、对比等非常规查询交给 LLM
+    assert compile_plan("下班路上顺便吃点什么") == (None, None)
+    assert compile_plan("分别推荐国贸和望京附近的餐厅") == (None, None)
+
+    print("✓ 常规查询编译为规范计划，非常规查询返回 None")
+
+
+def test_compiled_plans_wire_food_search_inputs():
+    print("\n=== 测试2: 编译计划的数据流 ===")
+
+    _, plan = compile_plan("天安门和望京中间的火锅")
+    food_search = plan.steps[-1]
+    assert food_search.input_mapping["search_mode"] == "step_2.search_mode"
+    assert food_search.input_mapping["types"] == "step_3.types"
+    assert food_search.input_mapping["locations"] == "step_1.locations"
+    assert PlanDAG(plan, node._SUBGRAPH_OUTPUTS).levels() == [[1, 3, 4], [2], [5]]
+
+    # 无场景时使用字面默认值，不把整句 query 当作搜索关键词；search_mode 仍取自 intent_classifier
+    _, plan = compile_plan("北京望京附近吃什么")
+    assert plan.steps[-1].input_mapping["keywords"] == "美食"
+    assert plan.steps[-1].input_mapping["types"] == "050000"
+    assert plan.steps[-1].input_mapping["search_mode"] == "step_2.search_mode"
+
+    print("✓ food_search 的输入映射与 planner 提示词中的示例一致")
+
+
+def test_compiled_plans_keep_locations_and_food_terms():
+    print("\n=== 测试3: 没有会面关键词的多地点查询与未知食物词 ===")
+
+    # 没有"中间"等关键词的多地点查询：search_mode 由 intent_classifier 按地点数量判定，不会被写死为 single
+    for query in ("我在国贸，朋友在望京，一起吃火锅", "我在天安门他在望京找个吃饭的地方"):
+        _, plan = compile_plan(query)
+        assert _subgraphs(plan)[:2] == ["parse_query", "intent_classifier"], query
+        assert plan.steps[1].input_mapping == {"query": "step_1.query", "location_count": "step_1.location_count"}
+        assert plan.steps[-1].input_mapping["search_mode"] == "step_2.search_mode", query
+
+    # 本地匹配器不认识的食物词交给 scenario_classifier，不退化为 "美食"
+    shape, plan = compile_plan("想吃麻辣烫")
+    assert shape == "scenario"
+    assert plan.steps[-1].input_mapping["keywords"] == "step_3.scenario"
+
+    # 单字 "串" 不再算作场景词
+    for query in ("一串糖葫芦", "周末去朋友家串门"):
+        assert compile_plan(query)[0] == "direct", query
+
+    print("✓ 多地点查询保留意图判定，具体食物词进入场景识别")
+
+
+def test_planner_node_fast_path_skips_llm():
+    print("\n=== 测试4: 快速路径不调用 planner LLM ===")
+
+    llm_plan = {"steps": [{"step_id": 1, "subgraph_name": "parse_query", "description": "解析",
+                           "input_mapping": None}]}
+    stats = PlanCompilerStats()
+    with patch.object(node, "get_llm") as mock_llm, patch.object(node, "plan_compiler_stats", stats):
+        mock_llm.return_value.ainvoke = AsyncMock(return_value=SimpleNamespace(content=json.dumps(llm_plan)))
+
+        fast = node.planner_node({"query": "我在北京想吃川菜", "replan_count": 0, "past_plans": []})
+        assert fast["plan_source"] == "compiler"
+        mock_llm.assert_not_called()
+
+        slow = node.planner_node({"query": "下班路上顺便吃点什么", "replan_count": 0, "past_plans": []})
+        assert slow["plan_source"] == "llm"
+
+        # 重规划始终调用 LLM
+        replan = node.planner_node({"query": "我在北京想吃川菜", "replan_count": 1, "past_plans": [],
+                                    "error_info": {"error_type": "EXECUTION_ERROR"}})
+        assert replan["plan_source"] == "llm"
+
+    assert mock_llm.return_value.ainvoke.await_count == 2
+    assert stats.stats() == {"compiled": 1, "llm_planned": 1, "fast_path_rate": 0.5, "shapes": {"scenario": 1}}
+
+    print("✓ 命中快速路径时省去一次串行 LLM 调用")
+
+
+def test_failing_plan_stops_after_replan_limit():
+    print("\n=== 测试5: 持续失败时重规划次数达到上限后终止 ===")
+
+    llm_plan = {"steps": [
+        {"step_id": 1, "subgraph_name": "parse_query", "description": "解析", "input_mapping": None},
+        {"step_id": 2, "subgraph_name": "food_search", "description": "搜索",
+         "input_mapping": {"location": "step_1.location"}},
+    ]}
+
+    def failing(step_input):
+        raise RuntimeError("高德接口不可用")
+
+    executors = {name: (lambda step_input: {"city": "北京", "location": "116.4,39.9"}) for name in node._SUBGRAPH_EXECUTORS}
+    executors["food_search"] = failing
+    with patch.object(node, "get_llm") as mock_llm, patch.dict(node._SUBGRAPH_EXECUTORS, executors):
+        mock_llm.return_value.ainvoke = AsyncMock(return_value=SimpleNamespace(content=json.dumps(llm_plan)))
+        final_state = graph.invoke({"query": "北京望京附近吃什么", "replan_count": 0,
+                                    "error_info": None, "past_plans": []})
+
+    # 首次计划由编译器生成，之后 3 次重规划均调用 LLM
+    assert final_state["replan_count"] == 3
+    assert mock_llm.return_value.ainvoke.await_count == 3
+    assert final_state["error_info"]["subgraph_name"] == "food_search"
+
+    print("✓ 重规划计数在 planner 中累加，不会无限循环")
+
+
+def test_scenario_classifier_types_reach_food_search():
+    print("\n=== 测试6: 本地匹配的 type 传入 food_search ===")
+
+    _, plan = compile_plan("我在北京想吃川菜")
+    with patch.object(scenario_classifier, "get_llm") as mock_llm:
+        scenario_output = asyncio.run(node._run_scenario_classifier({"query": "想吃川菜"}))
+    mock_llm.assert_not_called()
+
+    expected_types = scenario_classifier.TAXONOMY_MAP["中餐厅-四川菜(川菜)"]["type"]
+    assert scenario_output["types"] == expected_types
+    food_search_input = node._prepare_step_input(plan.steps[-1], {3: scenario_output}, "我在北京想吃川菜")
+    assert food_search_input["types"] == expected_types
+    assert food_search_input["keywords"] == "中餐厅-四川菜(川菜)"
+
+    print("✓ food_search 使用识别出的菜系 type，而不是默认的 050000")
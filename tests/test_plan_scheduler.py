@@ -0,0 +1,108 @@
+import sys
+import time
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from plann_and_execute.node import _SUBGRAPH_OUTPUTS  # noqa: E402
+from plann_and_execute.scheduler import PlanDAG, SchedulerStats, run_plan  # noqa: E402
+from plann_and_execute.state import Plan, PlanStep  # noqa: E402
+
+
+def _plan(*steps) -> Plan:
+    return Plan(steps=[
+        PlanStep(step_id=step_id, subgraph_name=name, description=name, input_mapping=mapping)
+        for step_id, name, mapping in steps
+    ])
+
+
+MULTI_LOCATION_PLAN = _plan(
+    (1, "parse_query", None),
+    (2, "intent_classifier", {"query": "step_1.query", "location_count": "step_1.location_count"}),
+    (3, "scenario_classifier", {"query": "step_1.query"}),
+    (4, "filter_criteria", {"query": "step_1.query"}),
+    (5, "food_search", {"types": "step_3.types", "location": "step_1.location",
+                        "search_mode": "step_2.search_mode"}),
+)
+
+
+def test_levels_and_critical_path():
+    print("\n=== 测试1: 依赖分层与关键路径 ===")
+
+    dag = PlanDAG(MULTI_LOCATION_PLAN, _SUBGRAPH_OUTPUTS)
+
+    assert dag.levels() == [[1, 3, 4], [2], [5]]
+    assert dag.critical_path() == [1, 2, 5]
+    # 按实际耗时加权时，关键路径可能改走更慢的分支
+    assert dag.critical_path({1: 0.1, 2: 0.1, 3: 1.0, 4: 0.1, 5: 0.1}) == [3, 5]
+
+    print("✓ 关键路径长度 3（parse_query -> intent_classifier -> food_search）")
+
+
+def test_cyclic_mapping_falls_back_to_plan_order():
+    print("\n=== 测试2: 依赖成环时按计划顺序执行 ===")
+
+    plan = _plan(
+        (1, "scenario_classifier", {"keywords": "step_2.filters"}),
+        (2, "filter_criteria", {"types": "step_1.types"}),
+    )
+    dag = PlanDAG(plan, _SUBGRAPH_OUTPUTS)
+    order = []
+    report = run_plan(dag, [1, 2], {}, lambda step, results: {},
+                      lambda step, step_input: order.append(step.step_id) or {})
+
+    assert dag.levels() == [[1], [2]]
+    assert order == [1, 2]
+    assert report["failed_step"] is None
+
+    print("✓ 成环的步骤不会死锁")
+
+
+def test_successor_starts_as_soon_as_its_dependency_finishes():
+    print("\n=== 测试3: 后继步骤不等待无关的慢步骤 ===")
+
+    # 1 慢、2 快、3 只依赖 2：3 应在 2 完成后立即启动，而不是等 1 所在的批次结束
+    plan = _plan(
+        (1, "filter_criteria", None),
+        (2, "scenario_classifier", None),
+        (3, "food_search", {"types": "step_2.types"}),
+    )
+    delays = {1: 0.4, 2: 0.1, 3: 0.1}
+    started = {}
+    begin = time.perf_counter()
+
+    def execute(step, step_input):
+        started[step.step_id] = time.perf_counter() - begin
+        time.sleep(delays[step.step_id])
+        return {"types": "050000"}
+
+    step_results = {}
+    report = run_plan(PlanDAG(plan, _SUBGRAPH_OUTPUTS), [1, 2, 3], step_results,
+                      lambda step, results: {}, execute)
+
+    assert sorted(step_results) == [1, 2, 3]
+    assert started[3] < delays[1]
+    assert report["wall_seconds"] < sum(delays.values())
+    assert report["max_parallelism"] == 2
+    assert report["critical_path"] == [2, 3]
+
+    print(f"✓ 第 3 步在 {started[3]:.2f}s 启动，总耗时 {report['wall_seconds']:.2f}s")
+
+
+def test_scheduler_stats_aggregate_reports():
+    print("\n=== 测试4: 调度统计 ===")
+
+    stats = SchedulerStats()
+    stats.record({"durations": {1: 1.0, 2: 1.0}, "failed_step": None, "critical_path_length": 2,
+                  "wall_seconds": 1.0, "serial_seconds": 2.0, "max_parallelism": 2})
+    stats.record({"durations": {1: 1.0}, "failed_step": 1, "critical_path_length": 1,
+                  "wall_seconds": 1.0, "serial_seconds": 1.0, "max_parallelism": 1})
+
+    result = stats.stats()
+    assert result["plans"] == 2
+    assert result["failed_plans"] == 1
+    assert result["avg_critical_path_length"] == 1.5
+    assert result["parallel_speedup"] == 1.5
+
+    print("✓ 汇总关键路径长度与并行加速比")
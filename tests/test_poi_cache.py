@@ -0,0 +1,99 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common.geohash import decode, encode, snap_lnglat  # noqa: E402
+from common.sqlite_cache import SqliteCache  # noqa: E402
+from gaode.key_pool import GaodeKeyPool  # noqa: E402
+from gaode.poi_cache import PoiCache  # noqa: E402
+from gaode.rate_limiter import RateLimiter  # noqa: E402
+from sub_agents.food_search import poi_fetcher  # noqa: E402
+
+
+def test_geohash_roundtrip_and_snapping():
+    print("\n=== 测试1: geohash 编解码与网格吸附 ===")
+
+    assert encode(39.916527, 116.397128, 5) == "wx4g0"
+    lat, lng = decode(encode(39.916527, 116.397128, 9))
+    assert abs(lat - 39.916527) < 1e-4 and abs(lng - 116.397128) < 1e-4
+
+    # 天安门附近相距几十米的两个中心点落在同一网格
+    cell_a, snapped_a = snap_lnglat("116.397128,39.916527", 7)
+    cell_b, snapped_b = snap_lnglat("116.397300,39.916600", 7)
+    assert cell_a == cell_b and snapped_a == snapped_b
+
+    print(f"✓ 相邻中心点共享网格 {cell_a} -> {snapped_a}")
+
+
+def test_cache_key_normalization():
+    print("\n=== 测试2: 缓存键归一化 ===")
+
+    cache = PoiCache(SqliteCache(":memory:", table="poi_pages"))
+    a = cache.prepare({"keywords": " 火锅 ", "types": "050100|050000", "city": "北京市",
+                       "location": "116.397128,39.916527", "offset": "20"})
+    b = cache.prepare({"keywords": "火锅", "types": "050000|050100", "city": "北京",
+                       "location": "116.397300,39.916600", "offset": "20"})
+    assert cache.make_key(a, 1) == cache.make_key(b, 1)
+    assert cache.make_key(a, 1) != cache.make_key(a, 2)
+
+    print("✓ 关键词空白、类型顺序、城市后缀不影响缓存键")
+
+
+def test_sqlite_cache_ttl_eviction_and_persistence(tmp_path):
+    print("\n=== 测试3: TTL、LRU 淘汰与重启后持久化 ===")
+
+    db = str(tmp_path / "cache.sqlite3")
+    cache = SqliteCache(db, table="t", max_entries=3, default_ttl=60)
+    cache.set("expired", [1], ttl=-1)
+    assert cache.get("expired") is None
+
+    for i in range(3):
+        cache.set(f"k{i}", [i])
+        time.sleep(0.01)
+    assert cache.get("k0") == [0]  # k0 变为最近访问
+    cache.set("k3", [3])
+    assert cache.get("k1") is None, "k1 最久未访问，应被淘汰"
+
+    stats = cache.stats()
+    assert stats["entries"] == 3 and stats["evictions"] == 1
+
+    reopened = SqliteCache(db, table="t", max_entries=3)
+    assert reopened.get("k3") == [3]
+
+    print(f"✓ 统计: {stats}")
+
+
+def test_fetcher_serves_repeated_search_from_cache():
+    print("\n=== 测试4: 重复搜索命中缓存，不再请求高德 ===")
+
+    requested = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(request.url.params["location"])
+        return httpx.Response(200, json={"status": "1", "info": "OK", "pois": [{"name": "四季民福"}]})
+
+    cache = PoiCache(SqliteCache(":memory:", table="poi_pages"))
+    with patch.multiple(
+        poi_fetcher,
+        gaode_rate_limiter=RateLimiter(1000),
+        gaode_key_pool=GaodeKeyPool(["test_key"]),
+        gaode_poi_cache=cache,
+    ):
+        for location in ("116.397128,39.916527", "116.397300,39.916600"):
+            client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            pages = asyncio.run(poi_fetcher.afetch_poi_pages(
+                {"keywords": "烤鸭", "location": location, "offset": "20"}, pages=1, offset=20, client=client
+            ))
+            assert pages == [[{"name": "四季民福"}]]
+
+    assert len(requested) == 1
+    assert cache.stats()["hits"] == 1
+
+    print(f"✓ 仅请求一次高德（网格中心 {requested[0]}），第二次命中缓存")
@@ -0,0 +1,126 @@
+import asyncio
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from gaode.key_pool import GaodeKeyPool  # noqa: E402
+from gaode.poi_cache import PoiCache  # noqa: E402
+from gaode.rate_limiter import RateLimiter  # noqa: E402
+from sub_agents.food_search import poi_fetcher  # noqa: E402
+from sub_agents.food_search.poi_fetcher import afetch_poi_pages  # noqa: E402
+
+
+def _make_client(page_sizes: dict, requested: list, delay: float = 0.0) -> httpx.AsyncClient:
+    """构造模拟高德接口的客户端：page_sizes 指定每页返回的 POI 数量"""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        requested.append(page)
+        if delay:
+            await asyncio.sleep(delay)
+        pois = [{"name": f"餐厅{page}-{i}"} for i in range(page_sizes.get(page, 0))]
+        return httpx.Response(200, json={"status": "1", "info": "OK", "pois": pois})
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def _patch_gaode(limiter: RateLimiter, keys=("test_key",), cache: PoiCache = None):
+    """替换限流器、key 池与 POI 缓存，避免依赖真实配置和本地缓存文件"""
+    return patch.multiple(
+        poi_fetcher,
+        gaode_rate_limiter=limiter,
+        gaode_key_pool=GaodeKeyPool(list(keys)),
+        gaode_poi_cache=cache or PoiCache(None),
+    )
+
+
+def test_fetch_pages_concurrently_in_order():
+    print("\n=== 测试1: 多页并发抓取并按页码排序 ===")
+
+    requested = []
+    client = _make_client({1: 2, 2: 2, 3: 2}, requested, delay=0.05)
+    with _patch_gaode(RateLimiter(1000)):
+        pages = asyncio.run(afetch_poi_pages({"keywords": "火锅"}, pages=3, offset=2, client=client))
+
+    assert [len(p) for p in pages] == [2, 2, 2]
+    assert pages[0][0]["name"] == "餐厅1-0"
+    assert sorted(requested) == [1, 2, 3]
+
+    print("✓ 三页并发抓取成功，结果按页码排列")
+
+
+def test_short_page_stops_later_pages():
+    print("\n=== 测试2: 不足 offset 的页面之后不再请求 ===")
+
+    requested = []
+    client = _make_client({1: 20, 2: 5}, requested)
+    with _patch_gaode(RateLimiter(20, burst=1)):
+        pages = asyncio.run(afetch_poi_pages({"keywords": "火锅"}, pages=5, offset=20, client=client))
+
+    assert [len(p) for p in pages] == [20, 5]
+    assert max(requested) < 5, f"第 2 页已是最后一页，不应继续请求到第 5 页: {requested}"
+
+    print(f"✓ 第 2 页不足 offset 后停止，实际请求页: {sorted(requested)}")
+
+
+def test_business_error_raises():
+    print("\n=== 测试3: 高德业务错误向上抛出 ===")
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"status": "0", "info": "INVALID_PARAMS", "infocode": "20000"})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    with _patch_gaode(RateLimiter(1000)):
+        try:
+            asyncio.run(afetch_poi_pages({"keywords": "火锅"}, pages=3, offset=20, client=client))
+            assert False, "应该抛出 ValueError"
+        except ValueError as e:
+            assert "INVALID_PARAMS" in str(e)
+
+    print("✓ 业务错误正确抛出")
+
+
+def test_exhausted_key_fails_over():
+    print("\n=== 测试4: key 日配额耗尽后自动切换 key ===")
+
+    used_keys = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        key = request.url.params["key"]
+        used_keys.append(key)
+        if key == "key_a":
+            return httpx.Response(200, json={"status": "0", "info": "DAILY_QUERY_OVER_LIMIT", "infocode": "10003"})
+        return httpx.Response(200, json={"status": "1", "info": "OK", "pois": [{"name": "海底捞"}]})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    with _patch_gaode(RateLimiter(1000), keys=("key_a", "key_b")):
+        pages = asyncio.run(afetch_poi_pages({"keywords": "火锅"}, pages=1, offset=20, client=client))
+        stats = poi_fetcher.gaode_key_pool.stats()
+
+    assert pages == [[{"name": "海底捞"}]]
+    assert used_keys == ["key_a", "key_b"]
+    assert stats["keys"]["***ey_a"]["ejected"] == {"place/around": "DAILY_QUERY_OVER_LIMIT"}
+
+    print("✓ key_a 被剔除，请求由 key_b 完成")
+
+
+def test_unneeded_pages_do_not_use_quota():
+    print("\n=== 测试5: 未发出的页面请求不计入 key 日用量 ===")
+
+    requested = []
+    client = _make_client({1: 5}, requested)
+    # 令牌桶每 0.1s 放行一次：第 1 页返回不足 offset 时，其余页面仍在等待令牌
+    with _patch_gaode(RateLimiter(10, burst=1)):
+        pages = asyncio.run(afetch_poi_pages({"keywords": "火锅"}, pages=5, offset=20, client=client))
+        usage = poi_fetcher.gaode_key_pool.stats()["keys"]["***_key"]["usage"]
+
+    assert [len(p) for p in pages] == [5]
+    assert requested == [1]
+    assert usage == {"place/around": 1}, f"只有实际发出的请求计入用量: {usage}"
+
+    print("✓ 被取消或不再需要的页面撤销了 key 用量")
@@ -0,0 +1,48 @@
+import asyncio
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sub_agents.food_search import food_search  # noqa: E402
+from sub_agents.food_search.food_search import _intersect_poi_sets  # noqa: E402
+
+
+def test_fetch_keeps_id_and_dedups_pages():
+    print("\n=== 测试1: 保留高德 POI id 并跨页去重 ===")
+
+    pages = [
+        [{"id": "B000A1", "name": "海底捞", "location": "116.40,39.90", "biz_ext": {"rating": "4.8"}},
+         {"name": "无id小馆", "location": "116.41,39.91"}],
+        [{"id": "B000A1", "name": "海底捞", "location": "116.40,39.90", "biz_ext": {"rating": "4.8"}},
+         {"id": "B000A2", "name": "大董", "location": "116.42,39.92"},
+         {"name": "无id小馆", "location": "116.41,39.91"}],
+    ]
+    with patch.object(food_search, "afetch_poi_pages", new=AsyncMock(return_value=pages)):
+        results = asyncio.run(food_search._afetch_pois_from_gaode("美食", "116.40,39.90", "050000", "北京"))
+
+    assert [(r["id"], r["name"]) for r in results] == [("B000A1", "海底捞"), (None, "无id小馆"), ("B000A2", "大董")]
+
+    print("✓ 翻页重叠的 POI 只保留一次")
+
+
+def test_intersection_joins_by_id_first():
+    print("\n=== 测试2: 交集优先按 id 连接 ===")
+
+    # 同一家店在两次搜索中名称差异较大、坐标偏差约 60m，模糊匹配无法识别，但 id 相同
+    a = [{"id": "B1", "name": "海底捞火锅(国贸店)", "location": "116.4000,39.9000"},
+         {"id": "B2", "name": "大董烤鸭", "location": "116.4100,39.9100"},
+         {"id": None, "name": "老北京涮肉", "location": "116.4200,39.9200"}]
+    b = [{"id": "B1", "name": "海底捞·国贸商城店", "location": "116.4007,39.9000"},
+         # id 不同即不是同一家，即便名称与坐标相近
+         {"id": "B9", "name": "大董烤鸭", "location": "116.4100,39.9100"},
+         {"id": "B7", "name": "老北京涮肉", "location": "116.4200,39.9200"}]
+
+    assert [p["name"] for p in _intersect_poi_sets([a, b])] == ["海底捞火锅(国贸店)", "老北京涮肉"]
+    # 候选缺少 id 时回退到模糊匹配
+    b_without_ids = [{**p, "id": None} for p in b]
+    assert [p["name"] for p in _intersect_poi_sets([a, b_without_ids])] == ["大董烤鸭", "老北京涮肉"]
+
+    print("✓ 有 id 时哈希连接，缺少 id 时才模糊匹配")
@@ -0,0 +1,96 @@
+import json
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from plann_and_execute.node import _strip_internal_fields  # noqa: E402
+from sub_agents.filter_criteria import apply_balance_filter, apply_filters  # noqa: E402
+from sub_agents.food_search.food_search import _intersect_poi_sets  # noqa: E402
+from sub_agents.food_search.poi import Poi  # noqa: E402
+
+
+RAW_POIS = [
+    {"id": "B1", "name": "海底捞", "address": "建国门外大街1号", "location": "116.4000,39.9000",
+     "tel": "010-1234", "type": "餐饮服务;中餐厅;火锅店", "biz_ext": {"rating": "4.8", "cost": "120.00"}},
+    {"id": "B2", "name": "大董烤鸭", "address": "东四十条", "location": "116.4300,39.9300",
+     "tel": [], "type": "餐饮服务;中餐厅;北京菜", "biz_ext": {"rating": "4.5", "cost": "300"}},
+    # 高德缺失字段返回 []
+    {"id": "B3", "name": "无评分小馆", "address": [], "location": "116.4100,39.9100",
+     "tel": [], "type": "餐饮服务;中餐厅;火锅店", "biz_ext": {"rating": [], "cost": []}},
+]
+
+
+def _as_dict(raw):
+    """原先在抓取时构建的 dict 结构"""
+    biz_ext = raw.get("biz_ext", {})
+    return {
+        "id": raw.get("id") or None,
+        "name": raw.get("name"),
+        "address": raw.get("address"),
+        "location": raw.get("location"),
+        "telephone": raw.get("tel"),
+        "type": raw.get("type"),
+        "rating": biz_ext.get("rating"),
+        "cost": biz_ext.get("cost"),
+    }
+
+
+def test_poi_parses_once_and_serialises_to_original_shape():
+    print("\n=== 测试1: Poi 预解析字段并序列化为原有结构 ===")
+
+    pois = [Poi.from_gaode(raw) for raw in RAW_POIS]
+    hotpot, duck, unrated = pois
+
+    assert (hotpot.lng, hotpot.lat, hotpot.rating_value, hotpot.cost_value) == (116.4, 39.9, 4.8, 120.0)
+    assert unrated.rating_value is None and unrated.cost_value is None
+    # 同类 type 字符串驻留为同一对象
+    assert hotpot.type is unrated.type
+    assert not hasattr(hotpot, "__dict__")
+
+    # 追加字段与修改字段后，序列化结果与原 dict 一致，预解析值同步更新
+    for poi, raw in zip(pois, RAW_POIS):
+        poi["distances"] = [12.5]
+        assert poi == {**_as_dict(raw), "distances": [12.5]}
+    duck["rating"] = "4.9"
+    assert duck.rating_value == 4.9
+    hotpot["_fallback"] = True
+    payload = json.loads(json.dumps(_strip_internal_fields(pois), ensure_ascii=False))
+    assert payload[0] == {**_as_dict(RAW_POIS[0]), "distances": [12.5]}
+    assert list(payload[0]) == ["id", "name", "address", "location", "telephone", "type", "rating", "cost",
+                                "distances"]
+
+    print("✓ 数值只在构建时解析一次，输出 JSON 结构不变")
+
+
+def test_filters_agree_on_poi_and_dict_inputs():
+    print("\n=== 测试2: 筛选、排序与均衡度在 Poi 与 dict 上结果一致 ===")
+
+    def build(kind):
+        results = []
+        for raw, distances in zip(RAW_POIS, ([800.0, 1200.0], [500.0, 4000.0], [900.0, 1000.0])):
+            poi = Poi.from_gaode(raw) if kind == "poi" else _as_dict(raw)
+            poi["distances"] = distances
+            results.append(poi)
+        return results
+
+    filter_sets = [
+        {"price_range": {"min": 100, "max": 200}},
+        {"rating_min": 4.6},
+        {"sort_by": "rating", "sort_order": "desc"},
+        {"sort_by": "price", "sort_order": "asc"},
+    ]
+    for filters in filter_sets:
+        expected = [r["name"] for r in apply_filters(build("dict"), filters)]
+        assert [r["name"] for r in apply_filters(build("poi"), filters)] == expected
+
+    for mode in ("hard", "soft"):
+        expected = apply_balance_filter(build("dict"), mode=mode)
+        assert apply_balance_filter(build("poi"), mode=mode) == expected
+
+    # 交集同样使用预解析坐标
+    other = [Poi.from_gaode({**raw, "id": None}) for raw in RAW_POIS[1:]]
+    assert [p["name"] for p in _intersect_poi_sets([build("poi"), other])] == ["大董烤鸭", "无评分小馆"]
+
+    print("✓ 行为与原 dict 实现一致")
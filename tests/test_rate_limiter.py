@@ -0,0 +1,73 @@
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from gaode.rate_limiter import RateLimiter, TokenBucket  # noqa: E402
+
+
+def test_token_bucket_burst_then_rate():
+    print("\n=== 测试1: 令牌桶先放行突发请求，再按速率排队 ===")
+
+    bucket = TokenBucket(rate=10, capacity=3)
+    waits = [bucket.reserve() for _ in range(5)]
+
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert 0.09 <= waits[3] <= 0.11
+    assert 0.19 <= waits[4] <= 0.21
+
+    print(f"✓ 各请求等待时间: {[round(w, 3) for w in waits]}")
+
+
+def test_sync_acquire_across_threads():
+    print("\n=== 测试2: 多线程共享限流器 ===")
+
+    limiter = RateLimiter(qps=20, burst=1)
+    start = time.monotonic()
+    threads = [threading.Thread(target=limiter.acquire, args=("geocode/geo", "key1")) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.monotonic() - start
+
+    stats = limiter.stats()["geocode/geo@***key1"]
+    assert elapsed >= 0.18, f"5 次请求在 20 QPS 下至少需要约 0.2s，实际 {elapsed:.3f}s"
+    assert stats["acquired"] == 5
+    assert stats["queue_depth"] == 0
+    assert stats["max_wait_seconds"] > 0
+
+    print(f"✓ 5 个线程耗时 {elapsed:.3f}s，统计: {stats}")
+
+
+def test_async_acquire_reports_queue_depth():
+    print("\n=== 测试3: 异步调用期间可观测排队深度 ===")
+
+    limiter = RateLimiter(qps=20, burst=1)
+
+    async def run():
+        tasks = [asyncio.create_task(limiter.acquire_async("place/around", "key1")) for _ in range(4)]
+        await asyncio.sleep(0.01)
+        depth = limiter.stats()["place/around@***key1"]["queue_depth"]
+        await asyncio.gather(*tasks)
+        return depth
+
+    depth = asyncio.run(run())
+    assert depth == 3, f"首个请求直接放行，其余 3 个应在排队，实际 {depth}"
+
+    print(f"✓ 排队深度: {depth}")
+
+
+def test_keys_have_independent_buckets():
+    print("\n=== 测试4: 不同 key 的令牌桶相互独立 ===")
+
+    limiter = RateLimiter(qps=1, burst=1)
+    assert limiter.acquire("place/around", "key1") == 0.0
+    assert limiter.acquire("place/around", "key2") == 0.0
+    assert limiter.acquire("geocode/geo", "key1") == 0.0
+
+    print("✓ 不同 key、不同接口互不排队")
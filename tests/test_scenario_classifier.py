@@ -1,7 +1,7 @@
 import sys
 from pathlib import Path
 from types import SimpleNamespace
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 # 添加项目根目录到路径
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -30,18 +30,20 @@ def test_scenario_classifier_success_with_mapping():
     )
 
     with patch(
-        "sub_agents.scenario_classifier.scenario_classifier.ChatOpenAI"
+        "sub_agents.scenario_classifier.scenario_classifier.get_llm"
     ) as mock_llm, patch(
         "sub_agents.scenario_classifier.scenario_classifier.TAXONOMY_MAP",
         {"火锅": {"medium_category": "火锅", "small_category": None, "type": "050400"}},
     ):
-        mock_llm.return_value.invoke.return_value = mock_response
+        mock_llm.return_value.ainvoke = AsyncMock(return_value=mock_response)
 
-        state = _build_state("想吃火锅")
+        # query 中没有菜系/品类词，本地匹配器未命中，走 LLM 识别分支
+        state = _build_state("天冷了想吃点热乎的")
         result = scenario_classifier_node(state)
 
+    mock_llm.return_value.ainvoke.assert_awaited_once()
     assert result["scenario"] == "火锅"
-    assert result["restaurant_type"] == "050400"
+    assert result["types"] == "050400"
     assert result["confidence"] == 0.92
     assert result["error_messages"] == []
 
@@ -56,12 +58,12 @@ def test_scenario_classifier_mapping_not_found():
     )
 
     with patch(
-        "sub_agents.scenario_classifier.scenario_classifier.ChatOpenAI"
+        "sub_agents.scenario_classifier.scenario_classifier.get_llm"
     ) as mock_llm, patch(
         "sub_agents.scenario_classifier.scenario_classifier.TAXONOMY_MAP",
         {},
     ):
-        mock_llm.return_value.invoke.return_value = mock_response
+        mock_llm.return_value.ainvoke = AsyncMock(return_value=mock_response)
 
         state = _build_state("我想吃一种未在映射表中的菜")
         result = scenario_classifier_node(state)
@@ -77,7 +79,7 @@ def test_scenario_classifier_missing_query():
     print("\n=== 测试3: 缺少 query 输入 ===")
 
     with patch(
-        "sub_agents.scenario_classifier.scenario_classifier.ChatOpenAI"
+        "sub_agents.scenario_classifier.scenario_classifier.get_llm"
     ) as mock_llm:
         state = _build_state("")
         result = scenario_classifier_node(state)
@@ -0,0 +1,78 @@
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sub_agents.scenario_classifier import scenario_classifier  # noqa: E402
+from sub_agents.scenario_classifier.matcher import SCENARIO_SYNONYMS, AhoCorasick, ScenarioMatcher  # noqa: E402
+
+
+def test_aho_corasick_finds_overlapping_patterns():
+    print("\n=== 测试1: Aho-Corasick 多模式匹配 ===")
+
+    automaton = AhoCorasick({"he": 1, "she": 2, "his": 3, "hers": 4})
+    hits = automaton.find_all("ushers")
+
+    assert sorted(hits) == [(1, "she", 2), (2, "he", 1), (2, "hers", 4)]
+    assert automaton.find_all("xyz") == []
+
+    print("✓ 一次扫描找出全部（含重叠的）模式串")
+
+
+def test_matcher_maps_queries_to_taxonomy():
+    print("\n=== 测试2: 菜系/品类词映射到映射表 ===")
+
+    matcher = ScenarioMatcher(scenario_classifier.TAXONOMY_MAP, SCENARIO_SYNONYMS)
+    cases = {
+        "想吃川菜": "中餐厅-四川菜(川菜)",
+        "吃火锅": "中餐厅-火锅店",
+        "国贸附近的日本料理": "外国餐厅-日本料理",
+        "有特色的西餐": "外国餐厅-西餐厅(综合风味)",
+        "三里屯的星巴克": "咖啡厅-星巴克咖啡",
+        "KFC": "快餐厅-肯德基",
+        "想吃中餐": "中餐厅-中餐厅",
+    }
+    for query, scenario in cases.items():
+        match = matcher.match(query)
+        assert match is not None and match.scenario == scenario, query
+        assert match.types == scenario_classifier.TAXONOMY_MAP[scenario]["type"]
+
+    # 最长词优先："四川菜" 优先于 "川菜"
+    assert matcher.match("四川菜").term == "四川菜"
+    assert matcher.match("附近好吃的") is None
+    assert matcher.match("适合约会的地方") is None
+    # 同义词指向映射表中不存在的键时被忽略
+    assert ScenarioMatcher({}, {"火锅": "中餐厅-火锅店"}).match("火锅") is None
+
+    print("✓ 常见查询直接映射为 scenario 与 types")
+
+
+def test_node_calls_llm_only_without_local_match():
+    print("\n=== 测试3: 本地未命中时才调用 LLM ===")
+
+    with patch.object(scenario_classifier, "get_llm") as mock_llm:
+        result = scenario_classifier.scenario_classifier_node({"query": "想吃川菜", "error_messages": []})
+
+    mock_llm.assert_not_called()
+    assert result["scenario"] == "中餐厅-四川菜(川菜)"
+    assert result["types"] == scenario_classifier.TAXONOMY_MAP["中餐厅-四川菜(川菜)"]["type"]
+    assert result["confidence"] == 0.9
+
+    print("✓ 明确的菜系查询无需 LLM 调用")
+
+
+def test_matcher_follows_replaced_taxonomy():
+    print("\n=== 测试4: 映射表被替换后匹配器随之重建 ===")
+
+    taxonomy = {"面馆": {"medium_category": "面馆", "small_category": "兰州拉面", "type": "050199"}}
+    with patch.object(scenario_classifier, "TAXONOMY_MAP", taxonomy):
+        match = scenario_classifier.match_scenario("来碗兰州拉面")
+        assert match is not None and (match.scenario, match.types) == ("面馆", "050199")
+        # 新映射表中没有火锅
+        assert scenario_classifier.match_scenario("吃火锅") is None
+
+    assert scenario_classifier.match_scenario("吃火锅").scenario == "中餐厅-火锅店"
+
+    print("✓ 匹配器与当前映射表一致")
@@ -0,0 +1,104 @@
+import random
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sub_agents.food_search.food_search import (  # noqa: E402
+    POI_MATCH_RADIUS,
+    _bounded_edit_distance,
+    _intersect_poi_sets,
+    _match_name,
+)
+from sub_agents.food_search.spatial_index import PoiGridIndex, haversine, parse_lnglat  # noqa: E402
+
+
+def _haversine_distance(lnglat1: str, lnglat2: str) -> float:
+    """参照实现：逐对解析 "lng,lat" 字符串后计算距离"""
+    return haversine(*parse_lnglat(lnglat1), *parse_lnglat(lnglat2))
+
+
+def _match_poi(poi_a, poi_b) -> bool:
+    """参照实现：逐对比较坐标 < 100m 且名称匹配"""
+    if not poi_a.get("name") or not poi_b.get("name") or not poi_a.get("location") or not poi_b.get("location"):
+        return False
+    return (_haversine_distance(poi_a["location"], poi_b["location"]) < POI_MATCH_RADIUS
+            and _match_name(poi_a["name"], poi_b["name"]))
+
+
+def _random_pois(rng: random.Random, count: int, prefix: str):
+    return [
+        {"name": f"{prefix}{i}", "location": f"{116.40 + rng.uniform(-0.01, 0.01):.6f},"
+                                             f"{39.90 + rng.uniform(-0.01, 0.01):.6f}"}
+        for i in range(count)
+    ]
+
+
+def test_grid_index_matches_brute_force():
+    print("\n=== 测试1: 网格索引与逐个比较结果一致 ===")
+
+    rng = random.Random(1)
+    pois = _random_pois(rng, 400, "p") + [{"name": "无坐标", "location": None}, {"name": "坏坐标", "location": "abc"}]
+    index = PoiGridIndex(pois, radius=100)
+    assert index.size == 400
+
+    for query in _random_pois(rng, 200, "q"):
+        expected = {p["name"] for p in pois[:400] if _haversine_distance(query["location"], p["location"]) < 100}
+        assert {p["name"] for p, _ in index.nearby(query["location"])} == expected
+    assert index.nearby(None) == []
+
+    print("✓ 只检查相邻网格即可找到全部 100m 内的 POI")
+
+
+def test_intersection_same_as_all_pairs():
+    print("\n=== 测试2: 网格索引交集与逐对匹配一致 ===")
+
+    rng = random.Random(2)
+    shared = _random_pois(rng, 20, "共享餐厅")
+    poi_sets = []
+    for loc in range(4):
+        pois = _random_pois(rng, 60, f"地点{loc}餐厅")
+        for poi in shared:
+            lng, lat = map(float, poi["location"].split(","))
+            name = poi["name"] + rng.choice(["", "(分店)", "店"])
+            pois.append({"name": name, "location": f"{lng + rng.uniform(-0.0002, 0.0002):.6f},{lat:.6f}"})
+        rng.shuffle(pois)
+        poi_sets.append(pois)
+
+    expected = list(poi_sets[0])
+    for poi_set in poi_sets[1:]:
+        expected = [p for p in expected if any(_match_poi(p, c) for c in poi_set)]
+
+    result = _intersect_poi_sets(poi_sets)
+    assert result == expected
+    assert len(result) > 0
+    assert _intersect_poi_sets([]) == []
+
+    print(f"✓ 交集 {len(result)} 家，与逐对匹配结果相同")
+
+
+def test_bounded_edit_distance():
+    print("\n=== 测试3: 带上限的编辑距离 ===")
+
+    def full(s1: str, s2: str) -> int:
+        prev = list(range(len(s2) + 1))
+        for i, c1 in enumerate(s1):
+            curr = [i + 1]
+            for j, c2 in enumerate(s2):
+                curr.append(min(prev[j + 1] + 1, curr[j] + 1, prev[j] + (c1 != c2)))
+            prev = curr
+        return prev[-1]
+
+    rng = random.Random(3)
+    for _ in range(2000):
+        a = "".join(rng.choice("火锅店烤鸭") for _ in range(rng.randint(0, 7)))
+        b = "".join(rng.choice("火锅店烤鸭") for _ in range(rng.randint(0, 7)))
+        limit = rng.randint(0, 3)
+        expected = full(a, b)
+        assert _bounded_edit_distance(a, b, limit) == (expected if expected <= limit else limit + 1), (a, b, limit)
+
+    assert _match_name("海底捞火锅(国贸店)", "海底捞火锅(国贸)")
+    assert not _match_name("海底捞火锅(国贸店)", "大董烤鸭店(团结湖店)")
+
+    print("✓ 距离不超过上限时精确，超过上限时返回 limit + 1")
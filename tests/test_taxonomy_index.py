@@ -0,0 +1,64 @@
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sub_agents.scenario_classifier import scenario_classifier  # noqa: E402
+from sub_agents.scenario_classifier.scenario_classifier import _get_restaurant_type_from_scenario  # noqa: E402
+from sub_agents.scenario_classifier.taxonomy_index import TaxonomyIndex  # noqa: E402
+
+
+TAXONOMY = {
+    "中餐厅-中餐厅": {"medium_category": "中餐厅", "small_category": "中餐厅", "type": "050100"},
+    "中餐厅-四川菜(川菜)": {"medium_category": "中餐厅", "small_category": "四川菜(川菜)", "type": "050102"},
+    "中餐厅-火锅店": {"medium_category": "中餐厅", "small_category": "火锅店", "type": "050117"},
+    "外国餐厅-日本料理": {"medium_category": "外国餐厅", "small_category": "日本料理", "type": "050202"},
+}
+
+
+def test_exact_and_category_lookups():
+    print("\n=== 测试1: 映射表键与中类/小类精确匹配 ===")
+
+    index = TaxonomyIndex(TAXONOMY)
+
+    assert index.lookup("中餐厅-火锅店") == "050117"
+    assert index.lookup("日本料理") == "050202"
+    # 中类名称对应多个条目时取映射表中最先出现的条目
+    assert index.lookup("中餐厅") == "050100"
+    assert index.lookup("外国餐厅") == "050202"
+
+    print("✓ 精确匹配走哈希表")
+
+
+def test_fuzzy_lookup_ranking():
+    print("\n=== 测试2: 包含关系匹配与排序 ===")
+
+    index = TaxonomyIndex(TAXONOMY)
+
+    # scenario 被名称包含
+    assert index.lookup("火锅") == "050117"
+    assert index.lookup("川菜") == "050102"
+    assert index.lookup("日本") == "050202"
+    # 名称被 scenario 包含：匹配字数多的优先（"日本料理" 优于 "中餐厅"）
+    assert index.lookup("中餐厅里的日本料理") == "050202"
+    # 匹配字数相同时取长度更接近的名称，再按映射表顺序
+    assert index.lookup("中餐厅-老火锅") == "050100"
+    assert index.lookup("不存在的类型") is None
+
+    print("✓ 模糊匹配结果确定")
+
+
+def test_module_lookup_uses_current_taxonomy(monkeypatch, capsys):
+    print("\n=== 测试3: 模块级查找 ===")
+
+    assert _get_restaurant_type_from_scenario("中餐厅-火锅店") == scenario_classifier.TAXONOMY_MAP["中餐厅-火锅店"]["type"]
+    assert _get_restaurant_type_from_scenario("") is None
+    # 不再输出调试信息
+    assert "[DEBUG]" not in capsys.readouterr().out
+
+    # 映射表被替换时索引随之重建
+    monkeypatch.setattr(scenario_classifier, "TAXONOMY_MAP", TAXONOMY)
+    assert _get_restaurant_type_from_scenario("中餐厅-火锅店") == "050117"
+
+    print("✓ 查找不再打印调试信息，且跟随当前映射表")
@@ -0,0 +1,119 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from gaode.gazetteer import landmark_gazetteer  # noqa: E402
+from plann_and_execute import node  # noqa: E402
+from sub_agents.parse_query import parse_query  # noqa: E402
+from sub_agents.scenario_classifier.scenario_classifier import _get_restaurant_type_from_scenario  # noqa: E402
+from sub_agents.understand_query import understand_query  # noqa: E402
+
+
+def _mock_response(payload: dict) -> SimpleNamespace:
+    return SimpleNamespace(content=json.dumps(payload, ensure_ascii=False))
+
+
+def test_single_call_fills_all_fields():
+    print("\n=== 测试1: 一次 LLM 调用输出全部查询理解字段 ===")
+
+    response = _mock_response({
+        "city": "北京",
+        "locations": [
+            {"name": "天安门", "location_text": "北京天安门"},
+            {"name": "望京", "location_text": "北京望京"},
+        ],
+        "intent": "equidistant_meeting",
+        "search_mode": "intersection",
+        "intent_confidence": 0.9,
+        "scenario": "中餐厅-火锅店",
+        "filters": {"price_range": {"min": 0, "max": 150}},
+        "confidence": 0.85,
+    })
+
+    with patch.object(understand_query, "get_llm") as mock_llm, \
+            patch.object(parse_query, "_ageocode_locations", new_callable=AsyncMock) as mock_geocode:
+        mock_llm.return_value.ainvoke = AsyncMock(return_value=response)
+        result = asyncio.run(node._run_understand_query({"query": "天安门和望京中间人均150以内的火锅"}))
+
+    mock_llm.return_value.ainvoke.assert_awaited_once()
+    # 两个地标均在离线地标库中，无需地理编码
+    mock_geocode.assert_not_called()
+    assert result["city"] == "北京"
+    assert result["location_count"] == 2
+    assert result["locations"][0] == {"name": "天安门", "lnglat": landmark_gazetteer.lookup("天安门", "北京")}
+    assert result["location"] == result["locations"][0]["lnglat"]
+    assert result["search_mode"] == "intersection"
+    assert result["scenario"] == "中餐厅-火锅店"
+    assert result["types"] == _get_restaurant_type_from_scenario("中餐厅-火锅店")
+    assert result["filters"] == {"price_range": {"min": 0, "max": 150}}
+    assert set(result) - {"error_messages"} == node._SUBGRAPH_OUTPUTS["understand_query"]
+
+    print("✓ 地点、意图、场景、筛选条件由一次调用得到")
+
+
+def test_low_confidence_and_unsupported_modes_fall_back_to_single():
+    print("\n=== 测试2: 低置信度与未实现模式回退为 single ===")
+
+    low_confidence = _mock_response({
+        "city": "北京", "locations": [], "intent": "equidistant_meeting",
+        "search_mode": "intersection", "intent_confidence": 0.3, "scenario": None, "filters": {},
+    })
+    along_route = _mock_response({
+        "city": "北京", "locations": [], "intent": "along_route",
+        "search_mode": "along_route", "intent_confidence": 0.9, "scenario": None, "filters": {},
+    })
+
+    with patch.object(understand_query, "get_llm") as mock_llm:
+        mock_llm.return_value.ainvoke = AsyncMock(side_effect=[low_confidence, along_route])
+        first = asyncio.run(node._run_understand_query({"query": "北京吃什么"}))
+        second = asyncio.run(node._run_understand_query({"query": "北京下班路上吃什么"}))
+
+    assert first["search_mode"] == "single"
+    assert first["types"] == "050000"
+    # 只提到城市时以城市中心点作为地点
+    assert first["location_count"] == 1
+    assert first["location"] is not None
+    assert second["search_mode"] == "single"
+    assert any("along_route" in msg for msg in second["error_messages"])
+
+    print("✓ 回退规则与 intent_classifier 子图一致")
+
+
+def test_non_numeric_intent_confidence_uses_default():
+    print("\n=== 测试3: 意图置信度为 null 或非数值时按默认值处理 ===")
+
+    responses = [
+        _mock_response({
+            "city": "北京", "locations": [{"name": "国贸", "location_text": "北京国贸"}],
+            "intent": "single_location", "search_mode": "single", "intent_confidence": confidence,
+            "scenario": "中餐厅-火锅店", "filters": {},
+        })
+        for confidence in (None, "高")
+    ]
+
+    with patch.object(understand_query, "get_llm") as mock_llm:
+        mock_llm.return_value.ainvoke = AsyncMock(side_effect=responses)
+        results = [asyncio.run(node._run_understand_query({"query": query}))
+                   for query in ("国贸附近的火锅", "国贸周边的火锅")]
+
+    for result in results:
+        assert result["search_mode"] == "single"
+        assert result["scenario"] == "中餐厅-火锅店"
+        assert not any("置信度" in msg for msg in result["error_messages"])
+
+    print("✓ 置信度字段异常不会导致步骤失败")
+
+
+def test_registered_for_planner():
+    print("\n=== 测试4: 注册为可规划的子图 ===")
+
+    assert "understand_query" in node._SUBGRAPH_EXECUTORS
+    assert "understand_query" in node._format_subgraph_catalog()
+
+    print("✓ planner 可选择 understand_query")
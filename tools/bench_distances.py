@@ -0,0 +1,80 @@
+"""Benchmark POI x reference-point distance computation.
+
+Usage:
+    python tools/bench_distances.py --pois 100 --locations 5 --repeat 50
+
+Compares the previous per-pair loop (haversine_distance re-parsing both
+"lng,lat" strings for every POI and location) with the vectorized NumPy
+distance_matrix, and checks that both produce the same rounded distances.
+"""
+
+import argparse
+import random
+import sys
+import timeit
+from pathlib import Path
+
+import numpy as np
+
+# Make the project root importable
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common.distance import distance_matrix  # noqa: E402
+from sub_agents.food_search.spatial_index import haversine  # noqa: E402
+
+
+def haversine_distance(lnglat1: str, lnglat2: str) -> float:
+    """The previous per-pair helper: parse both strings, then compute."""
+    lng1, lat1 = map(float, lnglat1.split(","))
+    lng2, lat2 = map(float, lnglat2.split(","))
+    return haversine(lng1, lat1, lng2, lat2)
+
+
+def loop_distances(pois, lnglats):
+    """The previous implementation."""
+    rows = []
+    for poi in pois:
+        row = []
+        for lnglat in lnglats:
+            try:
+                row.append(round(haversine_distance(poi, lnglat), 1))
+            except (ValueError, KeyError):
+                row.append(-1)
+        rows.append(row)
+    return rows
+
+
+def vectorized_distances(pois, lnglats):
+    matrix = distance_matrix(pois, lnglats)
+    return np.where(np.isnan(matrix), -1, np.round(matrix, 1)).tolist()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pois", type=int, default=100)
+    parser.add_argument("--locations", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+
+    def point():
+        return f"{116.4 + rng.uniform(-0.05, 0.05):.6f},{39.9 + rng.uniform(-0.05, 0.05):.6f}"
+
+    pois = [point() for _ in range(args.pois)]
+    lnglats = [point() for _ in range(args.locations)]
+
+    expected, actual = loop_distances(pois, lnglats), vectorized_distances(pois, lnglats)
+    if not np.allclose(expected, actual, atol=0.11):
+        print("! results differ")
+        sys.exit(1)
+
+    loop_ms = timeit.timeit(lambda: loop_distances(pois, lnglats), number=args.repeat) / args.repeat * 1000
+    vec_ms = timeit.timeit(lambda: vectorized_distances(pois, lnglats), number=args.repeat) / args.repeat * 1000
+    print(f"{args.pois} POIs x {args.locations} locations, repeat {args.repeat}")
+    print(f"  per-pair loop : {loop_ms:7.3f} ms")
+    print(f"  numpy matrix  : {vec_ms:7.3f} ms  ({loop_ms / vec_ms:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
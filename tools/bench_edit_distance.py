@@ -0,0 +1,93 @@
+"""Microbenchmark for POI name matching edit distance.
+
+Usage:
+    python tools/bench_edit_distance.py --repeat 20
+
+Runs the "edit distance < 3" check used by POI matching on every pair of a
+list of real restaurant names (chains with branch suffixes, similar names and
+unrelated names). It compares the previous full Levenshtein matrix with the
+banded, early-exit _bounded_edit_distance, with and without its memo table,
+and checks that both agree on every pair.
+"""
+
+import argparse
+import itertools
+import sys
+import time
+from pathlib import Path
+
+# Make the project root importable
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sub_agents.food_search.food_search import _bounded_edit_distance  # noqa: E402
+
+NAMES = [
+    "海底捞火锅(国贸店)", "海底捞火锅(三里屯店)", "海底捞火锅(望京店)", "海底捞·国贸商城店",
+    "大董烤鸭店(团结湖店)", "大董(工体店)", "四季民福烤鸭店(故宫店)", "四季民福烤鸭店(灯市口店)",
+    "全聚德(前门店)", "全聚德烤鸭店(王府井店)", "便宜坊烤鸭店(鲜鱼口店)", "南京大牌档(王府井店)",
+    "西贝莜面村(朝阳大悦城店)", "西贝莜面村(国贸店)", "外婆家(望京店)", "绿茶餐厅(三里屯店)",
+    "太二酸菜鱼(来福士店)", "太二酸菜鱼(朝阳大悦城店)", "巴奴毛肚火锅(国贸店)", "呷哺呷哺(望京店)",
+    "湊湊火锅·茶憩(三里屯店)", "鼎泰丰(国贸店)", "喜茶(国贸店)", "星巴克(国贸大酒店店)",
+    "麦当劳(国贸店)", "肯德基(国贸店)", "必胜客(国贸店)", "云海肴云南菜(国贸店)",
+    "眉州东坡酒楼(国贸店)", "小吊梨汤(国贸店)", "那家小馆(国贸店)", "胡大饭馆(簋街总店)",
+    "东来顺饭庄(王府井店)", "聚宝源(牛街店)", "局气(西单店)", "姥姥家春饼",
+    "新疆饭店", "花家怡园(簋街店)", "金鼎轩(地坛店)", "庆丰包子铺(鼓楼店)",
+]
+
+
+def full_edit_distance(s1: str, s2: str) -> int:
+    """The previous implementation: full Levenshtein matrix."""
+    if len(s1) < len(s2):
+        return full_edit_distance(s2, s1)
+    if len(s2) == 0:
+        return len(s1)
+    prev_row = list(range(len(s2) + 1))
+    for i, c1 in enumerate(s1):
+        curr_row = [i + 1]
+        for j, c2 in enumerate(s2):
+            insert = prev_row[j + 1] + 1
+            delete = curr_row[j] + 1
+            replace = prev_row[j] + (c1 != c2)
+            curr_row.append(min(insert, delete, replace))
+        prev_row = curr_row
+    return prev_row[-1]
+
+
+def timed(fn, pairs, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for a, b in pairs:
+            fn(a, b)
+    return (time.perf_counter() - start) / (repeat * len(pairs)) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    pairs = list(itertools.permutations(NAMES, 2))
+    for a, b in pairs:
+        if (full_edit_distance(a, b) < 3) != (_bounded_edit_distance(a, b, 2) <= 2):
+            print(f"! mismatch: {a} / {b}")
+            sys.exit(1)
+
+    def bounded_uncached(a, b):
+        return _bounded_edit_distance.__wrapped__(a, b, 2) <= 2
+
+    def bounded_cached(a, b):
+        return _bounded_edit_distance(a, b, 2) <= 2
+
+    full_us = timed(lambda a, b: full_edit_distance(a, b) < 3, pairs, args.repeat)
+    banded_us = timed(bounded_uncached, pairs, args.repeat)
+    _bounded_edit_distance.cache_clear()
+    cached_us = timed(bounded_cached, pairs, args.repeat)
+
+    print(f"{len(pairs)} name pairs, repeat {args.repeat}, per pair:")
+    print(f"  full matrix       : {full_us:7.2f} us")
+    print(f"  banded early-exit : {banded_us:7.2f} us  ({full_us / banded_us:.1f}x)")
+    print(f"  banded + memo     : {cached_us:7.2f} us  ({full_us / cached_us:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
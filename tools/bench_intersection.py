@@ -0,0 +1,117 @@
+"""Benchmark the multi-location POI intersection.
+
+Usage:
+    python tools/bench_intersection.py --locations 5 --pois 100 --repeat 5
+
+Generates synthetic Gaode-style POI lists (one per participant location) that
+share a number of restaurants with small coordinate jitter and name variants,
+then compares the previous all-pairs intersection (_match_poi on every pair)
+with _intersect_poi_sets. Without POI ids (fuzzy grid-index path) both must
+return the same POIs; with Gaode ids the id hash join finds every shared
+restaurant, including those whose names differ too much for fuzzy matching.
+"""
+
+import argparse
+import math
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Make the project root importable
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sub_agents.food_search.food_search import POI_MATCH_RADIUS, _intersect_poi_sets, _match_name  # noqa: E402
+from sub_agents.food_search.spatial_index import haversine  # noqa: E402
+
+
+def _match_poi(poi_a: Dict[str, Any], poi_b: Dict[str, Any]) -> bool:
+    """The previous pairwise predicate: name match and haversine < 100m on raw strings."""
+    name_a, name_b = poi_a.get("name", ""), poi_b.get("name", "")
+    loc_a, loc_b = poi_a.get("location", ""), poi_b.get("location", "")
+    if not name_a or not name_b or not loc_a or not loc_b:
+        return False
+    lng1, lat1 = map(float, loc_a.split(","))
+    lng2, lat2 = map(float, loc_b.split(","))
+    return haversine(lng1, lat1, lng2, lat2) < POI_MATCH_RADIUS and _match_name(name_a, name_b)
+
+CENTER = (116.4074, 39.9042)
+SUFFIXES = ["", "(国贸店)", "·总店", "餐厅"]
+
+
+def make_poi_sets(locations: int, pois: int, shared: int, seed: int) -> List[List[Dict[str, Any]]]:
+    rng = random.Random(seed)
+
+    def jitter(lng: float, lat: float, meters: float):
+        angle = rng.uniform(0, 2 * math.pi)
+        dist = rng.uniform(0, meters)
+        return (lng + dist * math.cos(angle) / (111195 * math.cos(math.radians(lat))),
+                lat + dist * math.sin(angle) / 111195)
+
+    common = []
+    for i in range(shared):
+        lng, lat = jitter(*CENTER, 3000)
+        common.append((f"B0FFS{i:05d}", f"共享餐厅{i:03d}", lng, lat))
+
+    poi_sets = []
+    for loc in range(locations):
+        pois_here = []
+        for poi_id, name, lng, lat in common:
+            j_lng, j_lat = jitter(lng, lat, 30)
+            pois_here.append({"id": poi_id, "name": name + rng.choice(SUFFIXES),
+                              "location": f"{j_lng:.6f},{j_lat:.6f}"})
+        for i in range(pois - shared):
+            lng, lat = jitter(*CENTER, 3000)
+            pois_here.append({"id": f"B0FFL{loc}{i:04d}", "name": f"地点{loc}餐厅{i:03d}",
+                              "location": f"{lng:.6f},{lat:.6f}"})
+        rng.shuffle(pois_here)
+        poi_sets.append(pois_here)
+    return poi_sets
+
+
+def all_pairs_intersection(poi_sets: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """The previous implementation: compare every POI with every candidate."""
+    intersection = list(poi_sets[0])
+    for poi_set in poi_sets[1:]:
+        intersection = [p for p in intersection if any(_match_poi(p, c) for c in poi_set)]
+    return intersection
+
+
+def best_of(fn, poi_sets, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(poi_sets)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--locations", type=int, default=5)
+    parser.add_argument("--pois", type=int, default=100)
+    parser.add_argument("--shared", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    poi_sets = make_poi_sets(args.locations, args.pois, args.shared, args.seed)
+    without_ids = [[{k: v for k, v in poi.items() if k != "id"} for poi in pois] for pois in poi_sets]
+    naive_s, naive = best_of(all_pairs_intersection, without_ids, args.repeat)
+    indexed_s, indexed = best_of(_intersect_poi_sets, without_ids, args.repeat)
+    id_join_s, id_join = best_of(_intersect_poi_sets, poi_sets, args.repeat)
+
+    print(f"{args.locations} locations x {args.pois} POIs ({args.shared} shared), best of {args.repeat}")
+    print(f"  all pairs          : {naive_s * 1000:8.2f} ms  -> {len(naive)} POIs")
+    print(f"  grid index (no id) : {indexed_s * 1000:8.2f} ms  -> {len(indexed)} POIs"
+          f"  ({naive_s / indexed_s:.1f}x)")
+    print(f"  id hash join       : {id_join_s * 1000:8.2f} ms  -> {len(id_join)} POIs"
+          f"  ({naive_s / id_join_s:.1f}x)")
+    if [p["name"] for p in naive] != [p["name"] for p in indexed] or len(id_join) != args.shared:
+        print("  ! results differ")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Microbenchmark for the compact POI record.
+
+Usage:
+    python tools/bench_poi_record.py --pois 2000 --repeat 50
+
+Builds the same synthetic Gaode results as plain dicts of strings (the previous
+shape) and as Poi records, then compares retained memory (tracemalloc) and the
+per-call time of the filters that used to re-parse rating/cost with float():
+price and rating filters, rating/price sorts and the balance filter.
+"""
+
+import argparse
+import random
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+# Make the project root importable
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sub_agents.filter_criteria import apply_balance_filter, apply_filters  # noqa: E402
+from sub_agents.food_search.poi import Poi  # noqa: E402
+
+TYPES = ["餐饮服务;中餐厅;火锅店", "餐饮服务;中餐厅;北京菜", "餐饮服务;外国餐厅;日本料理", "餐饮服务;快餐厅;快餐厅"]
+
+FILTERS = {
+    "price+rating": {"price_range": {"min": 50, "max": 200}, "rating_min": 4.0},
+    "sort rating": {"sort_by": "rating", "sort_order": "desc"},
+    "sort price": {"sort_by": "price", "sort_order": "asc"},
+}
+
+
+def make_raw_pois(n: int, seed: int = 7) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    return [
+        {
+            "id": f"B{i:09d}",
+            "name": f"餐厅{i}",
+            "address": f"某某路{i}号",
+            "location": f"{116.3 + rng.random() * 0.2:.6f},{39.85 + rng.random() * 0.15:.6f}",
+            "tel": "010-12345678",
+            # 每条记录各自的字符串对象，模拟 JSON 解码后的结果
+            "type": "".join(list(rng.choice(TYPES))),
+            "biz_ext": {"rating": f"{rng.uniform(3, 5):.1f}", "cost": f"{rng.randint(30, 400)}.00"},
+        }
+        for i in range(n)
+    ]
+
+
+def as_dict(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """The previous ingestion shape."""
+    biz_ext = raw.get("biz_ext", {})
+    return {
+        "id": raw.get("id") or None,
+        "name": raw.get("name"),
+        "address": raw.get("address"),
+        "location": raw.get("location"),
+        "telephone": raw.get("tel"),
+        "type": raw.get("type"),
+        "rating": biz_ext.get("rating"),
+        "cost": biz_ext.get("cost"),
+    }
+
+
+def retained_bytes(build: Callable[[], List[Any]]) -> int:
+    tracemalloc.start()
+    records = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return size
+
+
+def per_call_ms(fn, repeat: int) -> float:
+    return timeit.timeit(fn, number=repeat) / repeat * 1e3
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pois", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    raw_pois = make_raw_pois(args.pois)
+    dict_bytes = retained_bytes(lambda: [as_dict(raw) for raw in raw_pois])
+    poi_bytes = retained_bytes(lambda: [Poi.from_gaode(raw) for raw in raw_pois])
+    print(f"pois: {args.pois}, repeat: {args.repeat}\n")
+    print(f"retained memory: dict {dict_bytes / 1024:.1f} KiB, Poi {poi_bytes / 1024:.1f} KiB "
+          f"({poi_bytes / dict_bytes:.2f}x, includes parsed floats)\n")
+
+    dicts = [as_dict(raw) for raw in raw_pois]
+    pois = [Poi.from_gaode(raw) for raw in raw_pois]
+    rng = random.Random(11)
+    for d, p in zip(dicts, pois):
+        d["distances"] = p["distances"] = [rng.uniform(100, 5000), rng.uniform(100, 5000)]
+
+    # 筛选函数会打印进度，计时时静默
+    stdout, sys.stdout = sys.stdout, open("/dev/null", "w")
+    try:
+        rows = []
+        for case, filters in FILTERS.items():
+            rows.append((case, per_call_ms(lambda: apply_filters(dicts, filters), args.repeat),
+                         per_call_ms(lambda: apply_filters(pois, filters), args.repeat)))
+        for mode in ("hard", "soft"):
+            rows.append((f"balance {mode}", per_call_ms(lambda: apply_balance_filter(dicts, mode=mode), args.repeat),
+                         per_call_ms(lambda: apply_balance_filter(pois, mode=mode), args.repeat)))
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+    print(f"{'case':<16}{'dict ms':>10}{'Poi ms':>10}")
+    for case, dict_ms, poi_ms in rows:
+        print(f"{case:<16}{dict_ms:>10.3f}{poi_ms:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Microbenchmark for scenario -> Gaode type lookups.
+
+Usage:
+    python tools/bench_taxonomy_lookup.py --repeat 20000
+
+Compares the prebuilt TaxonomyIndex (hash maps + bigram index) against the
+previous linear scan over TAXONOMY_MAP, for exact keys, category names and
+fuzzy (substring) scenarios. Lookups are timed with the result cache disabled
+and enabled, and the taxonomy is also inflated to show that indexed exact
+lookups stay flat as the table grows while the linear scan does not.
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Make the project root importable
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sub_agents.scenario_classifier import TAXONOMY_MAP  # noqa: E402
+from sub_agents.scenario_classifier.taxonomy_index import TaxonomyIndex  # noqa: E402
+
+SCENARIOS = {
+    "exact key": "中餐厅-火锅店",
+    "category name": "日本料理",
+    "fuzzy": "火锅",
+    "miss": "不存在的类型",
+}
+
+
+def linear_lookup(taxonomy_map: Dict[str, Dict[str, Any]], scenario: str) -> Optional[str]:
+    """The previous implementation: exact key, then two full scans."""
+    if scenario in taxonomy_map:
+        return taxonomy_map[scenario].get("type")
+    for value in taxonomy_map.values():
+        if scenario == value.get("medium_category", "") or scenario == value.get("small_category", ""):
+            return value.get("type")
+    for value in taxonomy_map.values():
+        medium = value.get("medium_category", "")
+        small = value.get("small_category", "")
+        if scenario in medium or scenario in small or medium in scenario or small in scenario:
+            return value.get("type")
+    return None
+
+
+def inflate(taxonomy_map: Dict[str, Dict[str, Any]], factor: int) -> Dict[str, Dict[str, Any]]:
+    """Copy the taxonomy `factor` times with distinct synthetic names, originals last."""
+    inflated: Dict[str, Dict[str, Any]] = {}
+    for i in range(factor - 1):
+        for key, value in taxonomy_map.items():
+            inflated[f"{key}#{i}"] = {
+                "medium_category": f"{value['medium_category']}#{i}",
+                "small_category": f"{value['small_category']}#{i}",
+                "type": value["type"],
+            }
+    inflated.update(taxonomy_map)
+    return inflated
+
+
+def per_call_us(fn, repeat: int) -> float:
+    return timeit.timeit(fn, number=repeat) / repeat * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"taxonomy entries: {len(TAXONOMY_MAP)}, repeat: {args.repeat}\n")
+    index = TaxonomyIndex(TAXONOMY_MAP, cache_size=0)
+    cached = TaxonomyIndex(TAXONOMY_MAP)
+    print(f"{'case':<16}{'linear us':>12}{'index us':>12}{'cached us':>12}  result")
+    for case, scenario in SCENARIOS.items():
+        expected = linear_lookup(TAXONOMY_MAP, scenario)
+        result = index.lookup(scenario)
+        linear = per_call_us(lambda: linear_lookup(TAXONOMY_MAP, scenario), args.repeat)
+        indexed = per_call_us(lambda: index.lookup(scenario), args.repeat)
+        hit = per_call_us(lambda: cached.lookup(scenario), args.repeat)
+        print(f"{case:<16}{linear:>12.2f}{indexed:>12.2f}{hit:>12.2f}  {result}"
+              f"{'' if result == expected else f' (linear: {expected})'}")
+
+    print(f"\n{'entries':<16}{'linear us':>12}{'index us':>12}   (category name: {SCENARIOS['category name']})")
+    for factor in (1, 10, 100):
+        taxonomy_map = inflate(TAXONOMY_MAP, factor)
+        index = TaxonomyIndex(taxonomy_map, cache_size=0)
+        scenario = SCENARIOS["category name"]
+        linear = per_call_us(lambda: linear_lookup(taxonomy_map, scenario), max(1, args.repeat // factor))
+        indexed = per_call_us(lambda: index.lookup(scenario), args.repeat)
+        print(f"{len(taxonomy_map):<16}{linear:>12.2f}{indexed:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
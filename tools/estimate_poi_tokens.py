@@ -13,10 +13,17 @@ character/4 heuristic.
 import argparse
 import json
 import os
+import sys
+from pathlib import Path
 from typing import List, Dict, Any
 
 import requests
 
+# Make the project root importable so the script shares the service's Gaode rate limiter
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from gaode.rate_limiter import gaode_rate_limiter  # noqa: E402
+
 try:
     import tiktoken  # type: ignore
 except ImportError:  # pragma: no cover
@@ -59,6 +66,7 @@ def fetch_pois(api_key: str, query: str, location: str, city: str, pages: int, o
             "page": str(page),
             "extensions": "all",
         }
+        gaode_rate_limiter.acquire("place/around", api_key)
         response = requests.get(base_url, params=params, timeout=10)
         response.raise_for_status()
         payload = response.json()